@@ -1,6 +1,8 @@
-from flask import Flask, send_from_directory, request, jsonify
+from flask import Flask, Response, send_from_directory, request, jsonify, stream_with_context
 from flask_cors import CORS
 from pathlib import Path
+import json
+import math
 import sys
 import traceback
 import logging
@@ -20,7 +22,9 @@ BASE = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE))
 
 # ✅ services 폴더에서 임포트
+from backend.config import Config
 from backend.services.gemini_service import GeminiService
+from backend.services.job_queue import JobQueue
 from backend.services.route_optimizer import RouteOptimizer
 
 FRONT = BASE / "frontend"
@@ -62,10 +66,73 @@ def theme():
 def itinerary():
     return send_from_directory(PAGES, "itinerary.html")
 
+# --- 일정 생성 파이프라인 (동기 API / 비동기 작업 공용) ---
+REQUIRED_FIELDS = ['start', 'end', 'days', 'purpose', 'emotions', 'themes']
+
+def missing_fields(data):
+    return [field for field in REQUIRED_FIELDS if field not in (data or {})]
+
+def plan_trip(data, report=None):
+    """
+    Gemini 일정 생성 → 일차별 경로 최적화. report(stage, message, data=None)로 진행 단계 보고.
+    report가 있으면(비동기 작업) 응답을 스트리밍으로 받아, 완성된 일차부터 최적화해 "day" 이벤트로 보낸다.
+    """
+    logger.info(f"   - 기간: {data['start']} ~ {data['end']} ({data['days']}일)")
+    logger.info(f"   - 목적: {data['purpose']}")
+    logger.info(f"   - 감정: {data['emotions']}")
+    logger.info(f"   - 테마: {data['themes']}")
+
+    # 같은 장소 목록은 한 번만 최적화 (스트리밍 중 최적화한 일차를 최종 결과에서 재사용)
+    optimized_days = {}
+
+    def optimize_day(places):
+        key = json.dumps(places, sort_keys=True, ensure_ascii=False)
+        if key not in optimized_days:
+            # 시간 + 동선 최적화 → 이동 시간 계산
+            optimized = route_optimizer.optimize_route_with_time(places)
+            optimized_days[key] = route_optimizer.add_travel_times(optimized)
+        return optimized_days[key]
+
+    def stream_day(day_no, day_plan):
+        places = optimize_day(day_plan['places'])
+        report("day", f"{day_no}일차 일정이 준비됐어요.", {"day": day_no, "plan": {**day_plan, "places": places}})
+
+    # Gemini로 일정 생성
+    logger.info("Gemini 일정 생성 시작...")
+    result = gemini_service.generate_itinerary(
+        data,
+        progress=report,
+        on_day=stream_day if report else None,
+    )
+
+    if not result:
+        logger.error("일정 생성 실패 (result is None)")
+        return None
+
+    logger.info("Gemini 일정 생성 완료")
+
+    # 각 일차별로 경로 최적화
+    logger.info("경로 최적화 시작...")
+    if report:
+        report("routing", "이동 동선을 최적화하고 있어요.")
+    for i, day_plan in enumerate(result['itinerary'], 1):
+        logger.info(f"   - {i}일차 최적화 중...")
+        optimized = optimize_day(day_plan['places'])
+        day_plan['places'] = optimized
+        logger.info(f"   - {i}일차 완료: {len(optimized)}개 장소")
+
+    logger.info("="*60)
+    logger.info(f"최종 일정 생성 완료: {len(result['itinerary'])}일")
+    logger.info("="*60)
+    return result
+
+# 요청 스레드를 붙잡지 않도록 파이프라인은 작업 큐의 워커 스레드에서 실행
+job_queue = JobQueue(plan_trip, workers=Config.JOB_WORKERS, ttl=Config.JOB_TTL)
+
 # --- API 엔드포인트 ---
 @app.post("/api/generate-itinerary")
 def generate_itinerary():
-    """일정 생성 API"""
+    """일정 생성 API (동기, 기존 클라이언트 호환용)"""
     logger.info("="*60)
     logger.info("🚀 일정 생성 API 호출됨")
     logger.info("="*60)
@@ -75,48 +142,18 @@ def generate_itinerary():
         logger.info(f"📥 받은 데이터: {data}")
         
         # 입력 검증
-        required_fields = ['start', 'end', 'days', 'purpose', 'emotions', 'themes']
-        missing = [field for field in required_fields if field not in data]
+        missing = missing_fields(data)
         
         if missing:
             logger.error(f"필수 필드 누락: {missing}")
             return jsonify({"error": f"필수 필드 누락: {', '.join(missing)}"}), 400
         
         logger.info(f"입력 검증 완료")
-        logger.info(f"   - 기간: {data['start']} ~ {data['end']} ({data['days']}일)")
-        logger.info(f"   - 목적: {data['purpose']}")
-        logger.info(f"   - 감정: {data['emotions']}")
-        logger.info(f"   - 테마: {data['themes']}")
-        
-        # Gemini로 일정 생성
-        logger.info("Gemini 일정 생성 시작...")
-        result = gemini_service.generate_itinerary(data)
+        result = plan_trip(data)
         
         if not result:
-            logger.error("일정 생성 실패 (result is None)")
             return jsonify({"error": "일정 생성 실패"}), 500
         
-        logger.info("Gemini 일정 생성 완료")
-        
-        # 각 일차별로 경로 최적화
-        logger.info("경로 최적화 시작...")
-        for i, day_plan in enumerate(result['itinerary'], 1):
-            logger.info(f"   - {i}일차 최적화 중...")
-            places = day_plan['places']
-            
-            # 시간 + 동선 최적화
-            optimized = route_optimizer.optimize_route_with_time(places)
-            
-            # 이동 시간 계산
-            optimized = route_optimizer.add_travel_times(optimized)
-            
-            day_plan['places'] = optimized
-            logger.info(f"   - {i}일차 완료: {len(optimized)}개 장소")
-        
-        logger.info("="*60)
-        logger.info(f"최종 일정 생성 완료: {len(result['itinerary'])}일")
-        logger.info("="*60)
-        
         return jsonify(result)
     
     except Exception as e:
@@ -129,6 +166,92 @@ def generate_itinerary():
         logger.error("="*60)
         return jsonify({"error": str(e)}), 500
 
+@app.post("/api/jobs")
+def create_job():
+    """일정 생성 작업 등록 → 즉시 202 + 작업 id (진행은 폴링 또는 SSE로 확인)"""
+    data = request.get_json(silent=True)
+    missing = missing_fields(data)
+    if missing:
+        logger.error(f"필수 필드 누락: {missing}")
+        return jsonify({"error": f"필수 필드 누락: {', '.join(missing)}"}), 400
+
+    job = job_queue.submit(data)
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "events_url": f"/api/jobs/{job.id}/events",
+    }), 202
+
+@app.get("/api/jobs/<job_id>")
+def job_status(job_id):
+    """작업 상태 폴링 (완료 시 result 포함)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    return jsonify(job.to_dict())
+
+@app.get("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    """작업 진행 SSE 스트림 (Last-Event-ID로 재연결 시 이어받기)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    try:
+        after = int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        after = 0
+    after = min(max(after, 0), len(job.events))
+    return Response(
+        stream_with_context(job_queue.stream(job, after=after)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/places/nearby")
+def nearby_places():
+    """주변 장소 검색 API (?lat=&lng=&radius=km&k=&category=)"""
+    try:
+        lat = float(request.args["lat"])
+        lng = float(request.args["lng"])
+        radius = float(request.args.get("radius", 1.0))
+        k = int(request.args.get("k", 10))
+        # float()는 nan/inf도 받으므로 유한값·범위를 따로 확인
+        if not all(math.isfinite(v) for v in (lat, lng, radius)) or radius <= 0 or k < 1:
+            raise ValueError
+    except (KeyError, ValueError):
+        return jsonify({"error": "lat, lng(필수), radius, k는 숫자여야 합니다."}), 400
+
+    category = request.args.get("category")
+    snapshot = gemini_service.catalog.snapshot()
+    rows, dists = snapshot.index("spatial").within_radius(lat, lng, radius)
+    if category:
+        mask = snapshot.df["category"].to_numpy()[rows] == category
+        rows, dists = rows[mask], dists[mask]
+
+    places = snapshot.df.iloc[rows[:k]][
+        ["name", "address", "latitude", "longitude", "category", "gu"]
+    ].to_dict("records")
+    for place, dist in zip(places, dists[:k].tolist()):
+        place["distance_km"] = round(dist, 2)
+
+    return jsonify({"places": places})
+
+@app.get("/api/stats")
+def service_stats():
+    """캐시 / 모델 레지스트리 / HTTP 연결 재사용 / 쿼터 대기 / 토큰 비율 / 컨텍스트 캐시 통계"""
+    return jsonify({
+        "http": gemini_service.http.stats(),
+        "response_cache": gemini_service.response_cache.stats(),
+        "models": gemini_service.model_registry.stats(),
+        "latency": gemini_service.latency.stats(),
+        "hedges": gemini_service.hedges,
+        "tokens": gemini_service.token_estimator.stats(),
+        "context_cache": gemini_service.context_cache.stats() if gemini_service.context_cache else None,
+        "rate_limit": gemini_service.rate_limiter.stats(),
+        "jobs": {"pending": job_queue.pending()},
+    })
+
 @app.errorhandler(404)
 def not_found(e):
     logger.warning(f"404 Not Found: {request.url}")
@@ -12,3 +12,73 @@ class Config:
 
     # CSV 경로를 환경변수로도 주입 가능 (fallback은 기존 프로젝트 내부 경로)
     DATA_CSV_PATH = os.getenv('DATA_CSV_PATH', str(BASE_DIR / 'backend' / 'data' / 'busan_data.csv'))
+
+    # 장소 카탈로그 변경 감지 주기(초). 0이면 자동 리로드 비활성화
+    CATALOG_RELOAD_INTERVAL = float(os.getenv('CATALOG_RELOAD_INTERVAL', '5'))
+
+    # 검증 통과한 LLM 응답 디스크 캐시 (SQLite, 워커 프로세스 간 공유). TTL 0이면 비활성화
+    RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', str(BASE_DIR / 'backend' / 'data' / 'cache' / 'responses.sqlite3'))
+    RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', str(7 * 24 * 3600)))
+    RESPONSE_CACHE_MAX_MB = float(os.getenv('RESPONSE_CACHE_MAX_MB', '64'))
+
+    # 동등한 여행 프로필(감정/테마/목적/일수) 일정 재사용 캐시. 날짜는 새 시작일로 재배치. TTL 0이면 비활성화
+    PROFILE_CACHE_PATH = os.getenv('PROFILE_CACHE_PATH', str(BASE_DIR / 'backend' / 'data' / 'cache' / 'profiles.sqlite3'))
+    PROFILE_CACHE_TTL = float(os.getenv('PROFILE_CACHE_TTL', str(3 * 24 * 3600)))
+
+    # Gemini 모델 목록 캐시 + (모델, 페이로드) 건강 기록 (SQLite, 워커 간 공유)
+    MODEL_REGISTRY_PATH = os.getenv('MODEL_REGISTRY_PATH', str(BASE_DIR / 'backend' / 'data' / 'cache' / 'models.sqlite3'))
+    MODEL_DISCOVERY_TTL = float(os.getenv('MODEL_DISCOVERY_TTL', '3600'))
+    # 404 모델 / 반복 400 조합을 건너뛸 시간(초)
+    MODEL_COOLDOWN = float(os.getenv('MODEL_COOLDOWN', '600'))
+
+    # Gemini REST 연결 풀 (호스트당 keep-alive 연결 수) / 연결·응답 대기 타임아웃(초)
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+
+    # Gemini 쿼터 (분당 요청/토큰). 워커 간 공유 토큰 버킷으로 429 전에 속도 조절. RPM 0이면 비활성화
+    GEMINI_RPM = float(os.getenv('GEMINI_RPM', '15'))
+    GEMINI_TPM = float(os.getenv('GEMINI_TPM', '1000000'))
+    RATE_LIMIT_PATH = os.getenv('RATE_LIMIT_PATH', str(BASE_DIR / 'backend' / 'data' / 'cache' / 'ratelimit.sqlite3'))
+    # 요청 하나가 쿼터/백오프로 기다릴 최대 시간(초). 넘으면 대기 대신 폴백 일정
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '20'))
+
+    # 비동기 일정 생성 작업: 파이프라인 워커 스레드 수 / 완료 작업 보관 시간(초)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+    JOB_TTL = float(os.getenv('JOB_TTL', '600'))
+
+    # 비동기 작업에서 Gemini 응답을 스트리밍으로 받아 완성된 일차부터 전달 (false면 전체 응답 후 한 번에)
+    GEMINI_STREAM = os.getenv('GEMINI_STREAM', 'true').lower() in ('1', 'true', 'yes')
+
+    # 여러 날 일정 생성 방식: parallel(일차별 지리 군집 → 하루씩 동시 요청) / single(전체 일정 한 번에)
+    PLANNER_MODE = os.getenv('PLANNER_MODE', 'parallel').lower()
+    PARALLEL_DAY_CONCURRENCY = int(os.getenv('PARALLEL_DAY_CONCURRENCY', '4'))
+    PARALLEL_DAY_RETRIES = int(os.getenv('PARALLEL_DAY_RETRIES', '1'))
+
+    # 스트리밍 작업에서 Gemini 응답 전에 로컬 플래너 초안을 일차별로 먼저 전달 (Gemini 일차가 오면 교체)
+    LOCAL_DRAFT = os.getenv('LOCAL_DRAFT', 'true').lower() in ('1', 'true', 'yes')
+
+    # 프롬프트 후보 표기: compact(짧은 id 표, 응답은 id/시간/이유만 → 서버가 이름·주소·좌표 채움) / verbose(전체 필드)
+    PROMPT_MODE = os.getenv('PROMPT_MODE', 'compact').lower()
+
+    # 프롬프트 정적 접두부(규칙/스키마)를 Gemini cachedContents로 올려 재사용 (TTL초). 생성 실패 모델은 MODEL_COOLDOWN 동안 전체 전송.
+    # 현재 접두부는 모델별 최소 캐시 크기보다 작아 만들기를 건너뛰므로 기본은 꺼 둔다 (접두부가 커지면 켤 것)
+    CONTEXT_CACHE = os.getenv('CONTEXT_CACHE', 'false').lower() in ('1', 'true', 'yes')
+    CONTEXT_CACHE_TTL = int(os.getenv('CONTEXT_CACHE_TTL', '3600'))
+
+    # 헤지 요청: 1순위 모델 응답이 지연 분위(HEDGE_PERCENTILE)를 넘기면 다른 모델에 한 번 더 요청해 먼저 온 응답 사용
+    HEDGE_ENABLED = os.getenv('HEDGE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '0.9'))
+    # 모델별 관측이 HEDGE_MIN_SAMPLES개 미만이면 HEDGE_DEFAULT_DELAY초 후 헤지
+    HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '5'))
+    HEDGE_DEFAULT_DELAY = float(os.getenv('HEDGE_DEFAULT_DELAY', '8'))
+    HEDGE_MAX_WORKERS = int(os.getenv('HEDGE_MAX_WORKERS', '8'))
+
+    # 요청 1건의 입력 토큰 예산: 후보 수/키워드 길이를 이 안에 맞춤 (모델별은 'models/이름=토큰,...')
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+    PROMPT_TOKEN_BUDGETS = {
+        name.strip(): int(tokens)
+        for name, tokens in (
+            item.split('=', 1) for item in os.getenv('PROMPT_TOKEN_BUDGETS', '').split(',') if '=' in item
+        )
+    }
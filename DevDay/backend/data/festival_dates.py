@@ -0,0 +1,119 @@
+"""
+축제 운영기간 자유 텍스트 → 구조화된 날짜 구간
+
+    '2025. 7. 5.(토) ~ 7. 13.(일)'          → 2025-07-05 ~ 2025-07-13
+    '2024년 12월 14일 ~ 2025년 2월 2일'      → 2024-12-14 ~ 2025-02-02
+    '2024년 5월~10월 중 예정'                → 2024-05-01 ~ 2024-10-31
+    '매년 12월~2월'                          → (매년) 12-01 ~ 02-29
+
+연도가 없는 '매년 …' 구간은 기준 연도(ANNUAL_YEAR, 윤년)에 놓고 period_annual=True로 표시한다.
+연도도 '매년'도 없는 날짜('6. 11.(수)')는 시기를 특정할 수 없으므로 파싱 실패로 둔다.
+"""
+import calendar
+import datetime
+import re
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 매년 반복 구간을 놓는 기준 연도 (2/29 포함을 위해 윤년)
+ANNUAL_YEAR = 2000
+
+_DATE_RE = re.compile(
+    r"(?:(?P<y>(?:19|20)\d{2})\s*(?:년|\.|-|/)\s*)?"
+    r"(?P<m>\d{1,2})\s*(?:월|\.|-|/)\s*"
+    r"(?:(?P<d>\d{1,2})(?!\d)\s*(?:일|\.)?)?"
+)
+_RANGE_SEP_RE = re.compile(r"^[\s(),.\w]{0,8}?[~∼〜\-–]")
+_ANNUAL_RE = re.compile(r"매년")
+
+Period = Tuple[Union[datetime.date, None], Union[datetime.date, None], bool]
+_UNKNOWN: Period = (None, None, False)
+
+
+def _date_parts(text: str):
+    """(year|None, month, day|None, start, end) 목록 — 월/일 범위를 벗어난 숫자 조합은 버린다"""
+    parts = []
+    for m in _DATE_RE.finditer(text):
+        month = int(m.group("m"))
+        day = int(m.group("d")) if m.group("d") else None
+        if not 1 <= month <= 12 or (day is not None and not 1 <= day <= 31):
+            continue
+        year = int(m.group("y")) if m.group("y") else None
+        parts.append((year, month, day, m.start(), m.end()))
+    return parts
+
+
+def _make_date(year: int, month: int, day: Union[int, None], last: bool) -> datetime.date:
+    days_in_month = calendar.monthrange(year, month)[1]
+    if day is None:
+        day = days_in_month if last else 1
+    return datetime.date(year, month, min(day, days_in_month))
+
+
+def parse_period_text(text: str) -> Period:
+    """텍스트 한 칸 파싱 → (start, end, annual). 첫 날짜가 시작, 바로 뒤 '~'로 이어진 날짜가 종료"""
+    if not isinstance(text, str) or not text.strip():
+        return _UNKNOWN
+    annual = bool(_ANNUAL_RE.search(text))
+    parts = _date_parts(text)
+    if not parts:
+        return _UNKNOWN
+
+    y1, m1, d1, _, end1 = parts[0]
+    y2, m2, d2 = y1, m1, d1
+    if len(parts) > 1 and _RANGE_SEP_RE.match(text[end1:parts[1][3]]):
+        y2, m2, d2 = parts[1][0], parts[1][1], parts[1][2]
+
+    if y1 is None:
+        if not annual:
+            return _UNKNOWN
+        y1 = ANNUAL_YEAR
+    if y2 is None:
+        y2 = y1
+    start = _make_date(y1, m1, d1, last=False)
+    end = _make_date(y2, m2, d2, last=True)
+    if end < start:
+        end = _make_date(y2 + 1, m2, d2, last=True)
+    return start, end, annual
+
+
+def parse_period(texts: Iterable[str]) -> Period:
+    """
+    여러 칸(운영기간, 이용요일 및 시간 …)을 합쳐 하나의 구간으로.
+    연도가 명시된 구간을 우선 사용하고, 어느 칸에든 '매년'이 있으면 매년 반복으로 표시한다.
+    """
+    texts = [t for t in texts if isinstance(t, str) and t.strip()]
+    annual = any(_ANNUAL_RE.search(t) for t in texts)
+    fallback = _UNKNOWN
+    for t in texts:
+        start, end, _ = parse_period_text(t)
+        if start is None:
+            continue
+        if start.year != ANNUAL_YEAR:
+            return start, end, annual
+        if fallback[0] is None:
+            fallback = (start, end, True)
+    return fallback
+
+
+def add_period_columns(df: pd.DataFrame, text_columns, rows=None) -> pd.DataFrame:
+    """
+    df에 period_start / period_end (datetime64) / period_annual 컬럼 추가 (고유 텍스트 조합당 1회 파싱).
+    rows(불리언 마스크)를 주면 해당 행만 파싱하고 나머지는 기간 없음으로 둔다.
+    """
+    cols = [c for c in text_columns if c in df.columns]
+    idx = np.arange(len(df)) if rows is None else np.flatnonzero(np.asarray(rows, dtype=bool))
+    starts = np.full(len(df), None, dtype=object)
+    ends = np.full(len(df), None, dtype=object)
+    annual = np.zeros(len(df), dtype=bool)
+    if cols and len(idx):
+        keys = list(zip(*(df[c].iloc[idx].where(df[c].iloc[idx].notna(), None).tolist() for c in cols)))
+        parsed = {k: parse_period(k) for k in set(keys)}
+        for i, k in zip(idx.tolist(), keys):
+            starts[i], ends[i], annual[i] = parsed[k]
+    df["period_start"] = pd.to_datetime(starts)
+    df["period_end"] = pd.to_datetime(ends)
+    df["period_annual"] = annual
+    return df
@@ -0,0 +1,260 @@
+"""
+오프라인 도로명 주소 지오코더 (네트워크 호출 없음)
+
+좌표가 있는 장소(명소/축제/BICOLOR)의 주소로 참조 테이블을 만들고, 좌표 없는 주소(숙박업 등)를
+아래 순서로 근사한다. 결과에는 신뢰도(0~1)와 사용한 단계(method)를 함께 남긴다.
+
+    exact   도로명 + 건물번호 일치                     0.95
+    segment 같은 도로(…번길 포함)에서 건물번호가 가장 가까운 참조점 0.80
+    road    기본 도로(…번길 제거, 예: 해운대로) 중심      0.60
+    dong    법정동/읍면 중심                            0.45
+    gu      구군 중심                                   0.25
+"""
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CONFIDENCE = {
+    "source": 1.0,
+    "exact": 0.95,
+    "segment": 0.80,
+    "road": 0.60,
+    "dong": 0.45,
+    "gu": 0.25,
+}
+
+_CITY_RE = re.compile(r"^부산(?:광역)?시\s*")
+_PAREN_RE = re.compile(r"\(([^)]*)\)")
+_GU_RE = re.compile(r"^(\S+?[구군])(?:\s|$)")
+_ROAD_RE = re.compile(r"(\S+?(?:로|길))(\d+번?길)?\s*(\d+)(?:-(\d+))?")
+_BARE_ROAD_RE = re.compile(r"(\S+?(?:로|길))(\d+번?길)?(?:\s|$)")
+_DONG_RE = re.compile(r"(\S+?(?:동|읍|면|가))(?:\s|,|$)")
+
+
+class ParsedAddress:
+    """주소에서 뽑은 지오코딩 키"""
+
+    __slots__ = ("gu", "dong", "road", "base_road", "number", "sub_number")
+
+    def __init__(self, gu=None, dong=None, road=None, base_road=None, number=None, sub_number=None):
+        self.gu = gu
+        self.dong = dong
+        self.road = road
+        self.base_road = base_road
+        self.number = number
+        self.sub_number = sub_number
+
+
+def normalize_address(address: str) -> str:
+    """첫 줄만, 공백 1칸, '부산광역시' 접두어 통일"""
+    line = (address or "").strip().splitlines()[0] if (address or "").strip() else ""
+    line = re.sub(r"\s+", " ", line).strip()
+    # '청사포 부산광역시 해운대구 …'처럼 앞에 장소명이 붙은 경우 시 이름부터 자른다
+    pos = line.find("부산")
+    if pos > 0:
+        line = line[pos:]
+    return _CITY_RE.sub("부산광역시 ", line)
+
+
+def parse_address(address: str) -> ParsedAddress:
+    text = normalize_address(address)
+    parts = ParsedAddress()
+    if not text:
+        return parts
+
+    dong_in_paren = None
+    for inner in _PAREN_RE.findall(text):
+        head = inner.split(",")[0].strip()
+        if head:
+            dong_in_paren = head
+    body = _CITY_RE.sub("", _PAREN_RE.sub(" ", text)).split(",")[0].strip()
+
+    m = _GU_RE.match(body)
+    if m:
+        parts.gu = m.group(1)
+        body = body[m.end():].strip()
+
+    m = _ROAD_RE.search(body)
+    if m:
+        parts.base_road = m.group(1)
+        parts.road = m.group(1) + (m.group(2) or "")
+        parts.number = int(m.group(3))
+        parts.sub_number = int(m.group(4)) if m.group(4) else 0
+        before = body[:m.start()]
+    else:
+        m = _BARE_ROAD_RE.search(body)
+        if m and not body[:m.start(1)].strip().endswith(("동", "가")):
+            parts.base_road = m.group(1)
+            parts.road = m.group(1) + (m.group(2) or "")
+            before = body[:m.start()]
+        else:
+            before = body
+
+    if dong_in_paren:
+        parts.dong = dong_in_paren
+    else:
+        dm = _DONG_RE.search(before if parts.road else body)
+        if dm:
+            parts.dong = dm.group(1)
+    return parts
+
+
+def _centroids(groups: Dict[tuple, List[Tuple[float, float]]]) -> Dict[tuple, Tuple[float, float]]:
+    return {k: tuple(np.asarray(v).mean(axis=0)) for k, v in groups.items()}
+
+
+class LocalGeocoder:
+    """
+    좌표 있는 참조 주소 → (도로명/건물번호/동/구군) 룩업 테이블.
+    참조 집합의 지문(fingerprint)을 캐시에 함께 저장해, 참조가 바뀌면 캐시를 다시 계산한다.
+    """
+
+    def __init__(self, addresses, lats, lngs, gus=None):
+        exact: Dict[tuple, List[Tuple[float, float]]] = defaultdict(list)
+        segment: Dict[tuple, List[Tuple[int, float, float]]] = defaultdict(list)
+        road: Dict[tuple, List[Tuple[float, float]]] = defaultdict(list)
+        dong: Dict[tuple, List[Tuple[float, float]]] = defaultdict(list)
+        gu_pts: Dict[tuple, List[Tuple[float, float]]] = defaultdict(list)
+
+        gus = gus if gus is not None else [None] * len(addresses)
+        fp = hashlib.sha256()
+        for addr, lat, lng, gu in zip(addresses, lats, lngs, gus):
+            if lat is None or lng is None or pd.isna(lat) or pd.isna(lng):
+                continue
+            p = parse_address(addr if isinstance(addr, str) else "")
+            g = p.gu or (gu if isinstance(gu, str) and gu else None)
+            if not g:
+                continue
+            pt = (float(lat), float(lng))
+            fp.update(f"{addr}|{lat:.6f}|{lng:.6f}\n".encode("utf-8"))
+            gu_pts[(g,)].append(pt)
+            if p.dong:
+                dong[(g, p.dong)].append(pt)
+            if p.road:
+                road[(g, p.base_road)].append(pt)
+                if p.number is not None:
+                    exact[(g, p.road, p.number, p.sub_number)].append(pt)
+                    segment[(g, p.road)].append((p.number, *pt))
+
+        self.exact = _centroids(exact)
+        self.segment = {k: sorted(v) for k, v in segment.items()}
+        self.road = _centroids(road)
+        self.dong = _centroids(dong)
+        self.gu = _centroids(gu_pts)
+        self.fingerprint = fp.hexdigest()[:16]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "LocalGeocoder":
+        ref = df[df["latitude"].notna() & df["longitude"].notna()]
+        return cls(ref["address"].tolist(), ref["latitude"].tolist(), ref["longitude"].tolist(), ref["gu"].tolist())
+
+    def geocode(self, address: str, gu: Union[str, None] = None) -> Tuple[float, float, float, str]:
+        """주소 → (lat, lng, confidence, method). 실패 시 (nan, nan, 0.0, 'none')"""
+        p = parse_address(address)
+        g = p.gu or gu
+        if g:
+            if p.road and p.number is not None:
+                hit = self.exact.get((g, p.road, p.number, p.sub_number))
+                if hit:
+                    return hit[0], hit[1], CONFIDENCE["exact"], "exact"
+                seg = self.segment.get((g, p.road))
+                if seg:
+                    _, lat, lng = min(seg, key=lambda s: abs(s[0] - p.number))
+                    return lat, lng, CONFIDENCE["segment"], "segment"
+            if p.road:
+                hit = self.road.get((g, p.base_road))
+                if hit:
+                    return hit[0], hit[1], CONFIDENCE["road"], "road"
+            if p.dong:
+                hit = self.dong.get((g, p.dong))
+                if hit:
+                    return hit[0], hit[1], CONFIDENCE["dong"], "dong"
+            hit = self.gu.get((g,))
+            if hit:
+                return hit[0], hit[1], CONFIDENCE["gu"], "gu"
+        return float("nan"), float("nan"), 0.0, "none"
+
+
+class GeocodeCache:
+    """정규화 주소 → 지오코딩 결과 (Parquet 영속화). 참조 지문이 다르면 전체 무효화"""
+
+    COLUMNS = ["address", "latitude", "longitude", "confidence", "method"]
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.fingerprint = None
+        self.entries: Dict[str, Tuple[float, float, float, str]] = {}
+        self.dirty = False
+        if self.path.exists():
+            df = pd.read_parquet(self.path)
+            self.fingerprint = str(df["fingerprint"].iloc[0]) if len(df) else None
+            for row in df[self.COLUMNS].itertuples(index=False):
+                self.entries[row.address] = (row.latitude, row.longitude, row.confidence, row.method)
+
+    def bind(self, fingerprint: str) -> None:
+        if self.fingerprint != fingerprint:
+            if self.entries:
+                logger.info("   ♻️ 지오코딩 참조가 바뀌어 캐시를 다시 계산합니다")
+            self.entries.clear()
+            self.fingerprint = fingerprint
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        rows = [(a, *v) for a, v in self.entries.items()]
+        df = pd.DataFrame(rows, columns=self.COLUMNS)
+        df["fingerprint"] = self.fingerprint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        tmp.replace(self.path)
+        self.dirty = False
+
+
+def fill_coordinates(df: pd.DataFrame, cache: Union[GeocodeCache, None] = None) -> pd.DataFrame:
+    """
+    좌표 없는 행을 로컬 지오코딩으로 채우고 geo_confidence / geo_method 컬럼을 붙인다.
+    원천 좌표가 있는 행은 confidence 1.0 / 'source'.
+    """
+    df = df.copy()
+    has_xy = df["latitude"].notna() & df["longitude"].notna()
+    df["geo_confidence"] = np.where(has_xy, CONFIDENCE["source"], 0.0)
+    df["geo_method"] = np.where(has_xy, "source", "none").astype(object)
+
+    missing = df.index[~has_xy & df["address"].notna()]
+    if not len(missing):
+        return df
+
+    geocoder = LocalGeocoder.from_frame(df)
+    if cache is not None:
+        cache.bind(geocoder.fingerprint)
+
+    results = []
+    for addr, gu in zip(df.loc[missing, "address"].tolist(), df.loc[missing, "gu"].astype(object).tolist()):
+        key = normalize_address(addr) + "|" + (gu if isinstance(gu, str) else "")
+        hit = cache.entries.get(key) if cache is not None else None
+        if hit is None:
+            hit = geocoder.geocode(addr, gu if isinstance(gu, str) else None)
+            if cache is not None:
+                cache.entries[key] = hit
+                cache.dirty = True
+        results.append(hit)
+
+    res = pd.DataFrame(results, index=missing, columns=["latitude", "longitude", "geo_confidence", "geo_method"])
+    for c in res.columns:
+        df.loc[missing, c] = res[c]
+
+    if cache is not None:
+        cache.save()
+    counts = res["geo_method"].value_counts().to_dict()
+    logger.info(f"   📍 로컬 지오코딩 {len(missing)}건: {counts}")
+    return df
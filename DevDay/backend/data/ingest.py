@@ -0,0 +1,354 @@
+"""
+부울경 원천 CSV → 정규화된 단일 Parquet 장소 저장소 (오프라인 수집 명령)
+
+    python -m backend.data.ingest                      # 변경된 원천 파일만 재처리
+    python -m backend.data.ingest --full               # 전체 재처리
+    python -m backend.data.ingest --source <dir> --store <dir>
+
+처리 단계
+1) 원천 파일별: 인코딩 판별(utf-8-sig → cp949) → 헤더로 스키마 판별 → 표준 스키마로 매핑
+   → staging/<파일>.parquet 저장. manifest.json에 파일 sha256을 기록해 바뀐 파일만 다시 처리한다.
+2) 병합: staging 전체를 이어 붙여 place_id 기준 중복 제거(우선순위 높은 원천의 값 우선,
+   빈 값은 다른 원천으로 보충) → 좌표 없는 행은 로컬 지오코딩(geocode.py, geocode_cache.parquet)
+   → 축제 운영기간 텍스트를 period_start/period_end/period_annual로 구조화(festival_dates.py)
+   → BICOLOR 코스 참여 지표로 gem_score 산출, 카탈로그용 gem_scores.csv 갱신(popularity.py)
+   → kind별로 파티션된 places/ 데이터셋으로 기록.
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from backend.data.festival_dates import add_period_columns
+from backend.data.geocode import GeocodeCache, fill_coordinates
+from backend.data.popularity import GEM_SCORES_CSV, name_key, write_gem_scores
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent
+REPO_ROOT = DATA_DIR.parents[2]
+DEFAULT_SOURCE_DIR = Path(os.getenv("INGEST_SOURCE_DIR", REPO_ROOT / "부울경_공모전" / "Gildam-main" / "data"))
+DEFAULT_STORE_DIR = Path(os.getenv("PLACE_STORE_DIR", DATA_DIR / "store"))
+
+ENCODINGS = ["utf-8-sig", "cp949"]
+
+# 표준 장소 스키마 (컬럼 순서 고정)
+CANONICAL_COLUMNS = [
+    "place_id", "source", "kind", "name", "gu", "address", "latitude", "longitude",
+    "phone", "subtitle", "description", "category_main", "category_sub", "menu", "hashtags",
+    "period_text", "hours_text", "rooms", "views", "likes", "favorites",
+]
+# 병합 단계에서 붙는 파생 컬럼
+DERIVED_COLUMNS = ["geo_confidence", "geo_method", "period_start", "period_end", "period_annual", "gem_score"]
+TEXT_COLUMNS = [
+    "name", "address", "phone", "subtitle", "description", "menu", "hashtags", "period_text", "hours_text",
+]
+COUNT_COLUMNS = ["rooms", "views", "likes", "favorites"]
+CATEGORY_COLUMNS = ["source", "kind", "gu", "category_main", "category_sub"]
+
+_NULL_TOKENS = {"", "null", "none", "nan"}
+_GU_RE = re.compile(r"부산(?:광역)?시\s+(\S+?[구군])(?:\s|$)")
+
+# 원천 스키마 정의: detect(헤더에 모두 있어야 함) / namespace(원천 ID 체계) / priority(작을수록 우선)
+# columns 값은 후보 컬럼 목록 (먼저 존재하는 것 사용)
+SCHEMAS: List[Dict[str, Any]] = [
+    {
+        "name": "bicolor_2021",
+        "detect": {"TURSM_CNTNTS_SEQ_NO", "CNTNTS_REPRSNT_TITLE_NM"},
+        "namespace": "bicolor",
+        "priority": 0,
+        "id": "TURSM_CNTNTS_SEQ_NO",
+        "kind": "코스",
+        "columns": {
+            "name": ["MAIN_PLACE_NM"], "subtitle": ["CNTNTS_REPRSNT_TITLE_NM"], "gu": ["GUGUN_NM"],
+            "latitude": ["TRRSRT_LA"], "longitude": ["TRRSRT_LO"], "hashtags": ["HASHTAG_CN"],
+            "description": ["TOUR_HNTIP_CN"], "category_main": ["CTGRY_ONE_NM"], "category_sub": ["CTGRY_TWO_NM"],
+            "period_text": ["OPER_PD"], "hours_text": ["UTILIIZA_WKDAY_ND_PD"], "menu": ["REPRSNT_MENU_NM"],
+            "views": ["VIEWS_CO"], "likes": ["LIKE_CO"], "favorites": ["FAVORITE_CO"],
+        },
+    },
+    {
+        "name": "bicolor_2020",
+        "detect": {"TURSM_CNTNTS_SEQ", "CNTNTS_REPRSNT_TITLE"},
+        "namespace": "bicolor",
+        "priority": 1,
+        "id": "TURSM_CNTNTS_SEQ",
+        "kind": "코스",
+        "columns": {
+            "name": ["MAIN_PLACE_NM"], "subtitle": ["CNTNTS_REPRSNT_TITLE"], "gu": ["GUGUN_NM"],
+            "latitude": ["LA"], "longitude": ["LO"], "hashtags": ["HASHTAG"],
+            "description": ["TOUR_HNTIP"], "category_main": ["ONE_CTGRY_NM"], "category_sub": ["TWO_CTGRY_NM"],
+            "period_text": ["OPER_TERM"], "hours_text": ["USE_DAY_ND_TERM"], "menu": ["REPRSNT_MENU_NM"],
+            "views": ["VIEWS_CO"], "likes": ["LIKE_CO"], "favorites": ["FAVORITE_CO"],
+        },
+    },
+    {
+        # 부산명소/부산축제/명소_축제_통합 (visitbusan 콘텐츠)
+        "name": "visitbusan",
+        "detect": {"콘텐츠ID", "콘텐츠명"},
+        "namespace": "visitbusan",
+        "priority": 2,
+        "id": "콘텐츠ID",
+        "kind": None,  # 행별 판별 (_visitbusan_kind)
+        "columns": {
+            "name": ["콘텐츠명"], "subtitle": ["부제목", "제목"], "gu": ["구군"],
+            "latitude": ["위도"], "longitude": ["경도"], "address": ["주소", "주소 기타"],
+            "phone": ["연락처"], "description": ["상세내용"],
+            "menu": ["대표메뉴"], "period_text": ["운영기간"],
+            "hours_text": ["이용요일 및 시간", "운영 및 시간"],
+        },
+    },
+    {
+        # 구군별 숙박업 현황 (파일마다 컬럼명이 조금씩 다름)
+        "name": "lodging",
+        "detect": {"업소명"},
+        "namespace": "lodging",
+        "priority": 3,
+        "id": None,  # 업소명 + 주소 해시
+        "kind": "숙박",
+        "columns": {
+            "name": ["업소명"],
+            "address": ["영업소 주소(도로명)", "소재지도로명", "사업장도로명주소"],
+            "phone": ["소재지전화", "소재지전화번호"],
+            "category_main": ["업종명"],
+            "rooms": ["객실수"],
+        },
+    },
+]
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_csv_any(path: Path):
+    """인코딩을 판별해 CSV 로드 → (DataFrame, encoding)"""
+    raw = path.read_bytes()
+    for enc in ENCODINGS:
+        try:
+            text = raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+        df = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+        df.columns = df.columns.str.strip()
+        return df, enc
+    raise ValueError(f"인코딩 판별 실패 ({', '.join(ENCODINGS)}): {path.name}")
+
+
+def detect_schema(columns) -> Union[Dict[str, Any], None]:
+    cols = set(columns)
+    for schema in SCHEMAS:
+        if schema["detect"] <= cols:
+            return schema
+    return None
+
+
+def _text(series: pd.Series) -> pd.Series:
+    out = series.fillna("").astype(str).str.strip()
+    return out.mask(out.str.lower().isin(_NULL_TOKENS))
+
+
+def _pick(df: pd.DataFrame, candidates: List[str]) -> pd.Series:
+    for c in candidates:
+        if c in df.columns:
+            return df[c]
+    return pd.Series(pd.NA, index=df.index, dtype=object)
+
+
+def _visitbusan_kind(df: pd.DataFrame) -> pd.Series:
+    """유형 컬럼이 있으면 그대로, 없으면 축제 전용 컬럼(주요장소/운영기간/이용요일) 값 유무로 판별"""
+    if "유형" in df.columns:
+        return _text(df["유형"]).fillna("명소")
+    festival_cols = [c for c in ["주요장소", "운영기간", "이용요일 및 시간"] if c in df.columns]
+    if not festival_cols:
+        return pd.Series("명소", index=df.index)
+    is_festival = df[festival_cols].apply(_text).notna().any(axis=1)
+    return is_festival.map({True: "축제", False: "명소"})
+
+
+def normalize_frame(df: pd.DataFrame, schema: Dict[str, Any], source: str) -> pd.DataFrame:
+    """원천 프레임 → 표준 스키마 프레임"""
+    out = pd.DataFrame(index=df.index)
+    for canon, candidates in schema["columns"].items():
+        out[canon] = _pick(df, candidates)
+
+    for c in CANONICAL_COLUMNS:
+        if c not in out.columns:
+            out[c] = pd.NA
+    for c in TEXT_COLUMNS + ["gu", "category_main", "category_sub"]:
+        out[c] = _text(out[c].astype(object))
+
+    out["phone"] = out["phone"].str.replace(r"\s+", "", regex=True)
+    out["gu"] = out["gu"].fillna(out["address"].str.extract(_GU_RE, expand=False))
+    out["latitude"] = pd.to_numeric(out["latitude"], errors="coerce")
+    out["longitude"] = pd.to_numeric(out["longitude"], errors="coerce")
+    for c in COUNT_COLUMNS:
+        out[c] = pd.to_numeric(out[c], errors="coerce").astype("Int64")
+
+    out["kind"] = _visitbusan_kind(df) if schema["kind"] is None else schema["kind"]
+    out["source"] = source
+
+    if schema["id"]:
+        native = _text(df[schema["id"]])
+    else:
+        key = out["name"].fillna("") + "|" + out["address"].fillna("")
+        native = key.map(lambda k: hashlib.sha1(k.encode("utf-8")).hexdigest()[:16])
+    out["place_id"] = schema["namespace"] + ":" + native
+
+    out = out[out["name"].notna() & native.notna()]
+    return out[CANONICAL_COLUMNS].reset_index(drop=True)
+
+
+def _apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    for c in CATEGORY_COLUMNS:
+        df[c] = df[c].astype("category")
+    return df
+
+
+class PlaceStore:
+    """staging(원천 파일별) + places(병합/파티션) 두 층으로 구성된 Parquet 저장소"""
+
+    def __init__(self, store_dir: Union[str, Path] = DEFAULT_STORE_DIR, gem_scores_path: Union[str, Path] = GEM_SCORES_CSV):
+        self.root = Path(store_dir)
+        self.staging_dir = self.root / "staging"
+        self.places_dir = self.root / "places"
+        self.manifest_path = self.root / "manifest.json"
+        self.geocode_cache_path = self.root / "geocode_cache.parquet"
+        self.gem_scores_path = Path(gem_scores_path)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        return {"sources": {}}
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    def _staging_path(self, file_name: str) -> Path:
+        return self.staging_dir / f"{hashlib.sha1(file_name.encode('utf-8')).hexdigest()[:12]}.parquet"
+
+    def ingest(self, source_dir: Union[str, Path] = DEFAULT_SOURCE_DIR, full: bool = False) -> Dict[str, int]:
+        """원천 디렉터리 수집. 반환: {"processed": n, "skipped": n, "removed": n, "rows": n}"""
+        source_dir = Path(source_dir)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        sources: Dict[str, Any] = manifest["sources"]
+        stats = {"processed": 0, "skipped": 0, "removed": 0, "rows": 0}
+
+        files = sorted(source_dir.glob("*.csv"))
+        for path in files:
+            digest = _sha256(path)
+            entry = sources.get(path.name)
+            staged = self._staging_path(path.name)
+            if not full and entry and entry["sha256"] == digest and staged.exists():
+                stats["skipped"] += 1
+                continue
+
+            df, encoding = read_csv_any(path)
+            schema = detect_schema(df.columns)
+            if schema is None:
+                logger.warning(f"⚠️ 스키마 판별 실패 → 건너뜀: {path.name} ({list(df.columns)[:6]}...)")
+                continue
+
+            frame = normalize_frame(df, schema, path.stem)
+            frame.to_parquet(staged, index=False)
+            sources[path.name] = {
+                "sha256": digest,
+                "encoding": encoding,
+                "schema": schema["name"],
+                "priority": schema["priority"],
+                "rows": len(frame),
+                "staging": staged.name,
+            }
+            stats["processed"] += 1
+            logger.info(f"   ✅ {path.name}: {schema['name']} / {encoding} / {len(frame)}행")
+
+        present = {p.name for p in files}
+        for name in [n for n in sources if n not in present]:
+            self._staging_path(name).unlink(missing_ok=True)
+            del sources[name]
+            stats["removed"] += 1
+            logger.info(f"   🗑️ 원천 파일 삭제 반영: {name}")
+
+        changed = stats["processed"] or stats["removed"] or not self.places_dir.exists()
+        if changed:
+            merged = self.merge(sources)
+            self._write_places(merged)
+            manifest["rows"] = len(merged)
+            stats["rows"] = len(merged)
+        else:
+            stats["rows"] = manifest.get("rows", 0)
+
+        self._save_manifest(manifest)
+        return stats
+
+    def merge(self, sources: Dict[str, Any]) -> pd.DataFrame:
+        """staging 전체 병합 + place_id 기준 중복 제거"""
+        ordered = sorted(sources.items(), key=lambda kv: (kv[1]["priority"], kv[0]))
+        frames = [pd.read_parquet(self.staging_dir / meta["staging"]) for _, meta in ordered]
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return _apply_dtypes(pd.DataFrame(columns=CANONICAL_COLUMNS + DERIVED_COLUMNS))
+
+        for f in frames:
+            for c in CATEGORY_COLUMNS:
+                f[c] = f[c].astype(object)
+        all_rows = pd.concat(frames, ignore_index=True)
+
+        # 우선순위 순으로 쌓였으므로 groupby.first = 우선 원천 값 + 빈 값은 다른 원천에서 보충
+        merged = all_rows.groupby("place_id", sort=False, dropna=False).first().reset_index()
+        merged = merged[CANONICAL_COLUMNS]
+        logger.info(f"   🔗 병합: {len(all_rows)}행 → 중복 제거 후 {len(merged)}곳")
+        merged = fill_coordinates(merged, GeocodeCache(self.geocode_cache_path))
+        merged = add_period_columns(merged, ["period_text", "hours_text"], rows=(merged["kind"] == "축제").to_numpy())
+        scores = write_gem_scores(merged, out_path=self.gem_scores_path)
+        merged["gem_score"] = merged["name"].map(name_key).map(dict(zip(scores["name_key"], scores["gem_score"])))
+        return _apply_dtypes(merged)
+
+    def _write_places(self, merged: pd.DataFrame) -> None:
+        """kind별 파티션으로 기록 (임시 디렉터리에 쓴 뒤 교체)"""
+        tmp = self.root / "places.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        merged.to_parquet(tmp, partition_cols=["kind"], index=False)
+        shutil.rmtree(self.places_dir, ignore_errors=True)
+        tmp.rename(self.places_dir)
+
+    def read(self, kinds: Union[List[str], None] = None) -> pd.DataFrame:
+        """저장소 로드 (kinds 지정 시 해당 파티션만)"""
+        filters = [("kind", "in", kinds)] if kinds else None
+        return pd.read_parquet(self.places_dir, filters=filters)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=str(DEFAULT_SOURCE_DIR), help="원천 CSV 디렉터리")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_DIR), help="Parquet 저장소 디렉터리")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 무관하게 전체 재처리")
+    parser.add_argument("--gem-scores", default=str(GEM_SCORES_CSV), help="카탈로그용 숨은 명소 점수 CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    logger.info("📥 장소 데이터 수집 시작")
+    stats = PlaceStore(args.store, args.gem_scores).ingest(args.source, full=args.full)
+    logger.info(
+        f"🎉 완료: 처리 {stats['processed']} / 건너뜀 {stats['skipped']} / "
+        f"삭제 {stats['removed']} / 최종 {stats['rows']}곳"
+    )
+
+
+if __name__ == "__main__":
+    main()
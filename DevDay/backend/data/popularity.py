@@ -0,0 +1,155 @@
+"""
+BICOLOR 관광 코스 참여 지표 → 장소별 '숨은 명소' 점수 (오프라인 단계)
+
+코스(47개)마다 조회/좋아요/즐겨찾기 수와 해시태그·대표 장소명이 있다. 장소가 코스에 언급될 때마다
+그 코스의 노출량(views + 좋아요·즐겨찾기 가중, 부분 일치는 절반)을 더해 장소별 노출량을 구하고,
+
+    gem_score = 1 - log1p(노출량) / log1p(최대 노출량)        (0 = 가장 유명, 1 = 언급 없음)
+
+로 정규화한다. 결과는 gem_scores.csv(name_key 기준)로 저장되어 카탈로그 로드 시 조인된다.
+
+    python -m backend.data.popularity            # 저장소(store/places) 코스 + busan_data.csv 장소명
+"""
+import argparse
+import logging
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent
+GEM_SCORES_CSV = DATA_DIR / "gem_scores.csv"
+CATALOG_CSV = DATA_DIR / "busan_data.csv"
+
+# 좋아요/즐겨찾기 1건을 조회수 몇 건으로 칠지
+LIKE_WEIGHT = 50
+FAVORITE_WEIGHT = 100
+# 이 비율 이상의 코스에 붙은 태그(#부산여행, #추천여행 …)는 장소가 아닌 일반 태그로 본다
+GENERIC_TAG_SHARE = 0.15
+# 부분 일치(태그 ⊂ 장소명, 예: #해운대 → 해운대수목원)를 허용할 최소 태그 길이와 반영 비율
+MIN_PARTIAL_LEN = 3
+PARTIAL_SHARE = 0.5
+
+_LANG_SUFFIX_RE = re.compile(r"\((?:[^)]*(?:한|영|중간|중번|일)[^)]*)\)")
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def name_key(name: str) -> str:
+    """장소명 조인 키: 다국어 표기 괄호 제거 + 소문자 + 공백/기호 제거"""
+    if not isinstance(name, str):
+        return ""
+    return _NON_WORD_RE.sub("", _LANG_SUFFIX_RE.sub("", name).lower())
+
+
+def name_keys(names: pd.Series) -> pd.Series:
+    """name_key의 벡터 버전"""
+    return (
+        names.fillna("").astype(str)
+        .str.replace(_LANG_SUFFIX_RE, "", regex=True)
+        .str.lower()
+        .str.replace(_NON_WORD_RE, "", regex=True)
+    )
+
+
+def _course_tags(courses: pd.DataFrame) -> list:
+    """코스별 (장소 태그 집합, 노출량)"""
+    out = []
+    for hashtags, main_places, views, likes, favorites in zip(
+        courses["hashtags"], courses["name"], courses["views"], courses["likes"], courses["favorites"]
+    ):
+        tags = {name_key(t) for t in str(hashtags or "").split("#")}
+        tags |= {name_key(p) for p in str(main_places or "").split(",")}
+        tags.discard("")
+        exposure = (
+            (0 if pd.isna(views) else int(views))
+            + LIKE_WEIGHT * (0 if pd.isna(likes) else int(likes))
+            + FAVORITE_WEIGHT * (0 if pd.isna(favorites) else int(favorites))
+        )
+        out.append((tags, exposure))
+
+    df_count: Dict[str, int] = defaultdict(int)
+    for tags, _ in out:
+        for t in tags:
+            df_count[t] += 1
+    generic = {t for t, n in df_count.items() if n / max(len(out), 1) >= GENERIC_TAG_SHARE}
+    return [(tags - generic, exposure) for tags, exposure in out]
+
+
+def score_names(names: Iterable[str], courses: pd.DataFrame) -> pd.DataFrame:
+    """장소명 목록 × 코스 → name_key / mentions / exposure / gem_score"""
+    keys = sorted({k for k in (name_key(n) for n in names) if k})
+    course_tags = _course_tags(courses)
+
+    mentions = dict.fromkeys(keys, 0)
+    exposure = dict.fromkeys(keys, 0.0)
+    for tags, course_exposure in course_tags:
+        partial_tags = [t for t in tags if len(t) >= MIN_PARTIAL_LEN]
+        for key in keys:
+            if key in tags:
+                share = 1.0
+            elif any(t in key for t in partial_tags):
+                share = PARTIAL_SHARE
+            else:
+                continue
+            mentions[key] += 1
+            exposure[key] += course_exposure * share
+
+    scores = pd.DataFrame({
+        "name_key": keys,
+        "mentions": [mentions[k] for k in keys],
+        "exposure": [round(exposure[k], 1) for k in keys],
+    })
+    top = math.log1p(max(scores["exposure"].max(), 0)) if len(scores) else 0.0
+    gem = 1.0 - scores["exposure"].map(math.log1p) / top if top else pd.Series(1.0, index=scores.index)
+    # 언급은 됐지만 코스 조회수가 0인 경우도 '알려진 곳'으로 본다
+    scores["gem_score"] = gem.where(scores["mentions"] == 0, gem.clip(upper=0.95)).round(4)
+    return scores
+
+
+def write_gem_scores(
+    places: pd.DataFrame,
+    catalog_csv: Union[str, Path] = CATALOG_CSV,
+    out_path: Union[str, Path] = GEM_SCORES_CSV,
+) -> pd.DataFrame:
+    """저장소 장소 + 카탈로그 CSV 장소명 전체에 대한 점수 파일 생성"""
+    courses = places[places["kind"] == "코스"]
+    names = places.loc[places["kind"] != "코스", "name"].tolist()
+    if Path(catalog_csv).exists():
+        names += pd.read_csv(catalog_csv, encoding="utf-8-sig", usecols=["콘텐츠명"])["콘텐츠명"].tolist()
+
+    scores = score_names(names, courses)
+    scores.to_csv(out_path, index=False, encoding="utf-8")
+    known = scores[scores["mentions"] > 0]
+    logger.info(f"   💎 숨은 명소 점수: {len(scores)}곳 (코스 언급 {len(known)}곳) → {Path(out_path).name}")
+    return scores
+
+
+def load_gem_scores(path: Union[str, Path] = GEM_SCORES_CSV) -> Dict[str, float]:
+    """name_key → gem_score (파일이 없으면 빈 dict)"""
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"⚠️ 숨은 명소 점수 파일 없음: {path} (python -m backend.data.ingest 로 생성)")
+        return {}
+    df = pd.read_csv(path, encoding="utf-8", dtype={"name_key": str})
+    return dict(zip(df["name_key"], df["gem_score"]))
+
+
+def main() -> None:
+    from backend.data.ingest import DEFAULT_STORE_DIR, PlaceStore
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default=str(DEFAULT_STORE_DIR), help="Parquet 저장소 디렉터리")
+    parser.add_argument("--out", default=str(GEM_SCORES_CSV))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    write_gem_scores(PlaceStore(args.store).read(), out_path=args.out)
+
+
+if __name__ == "__main__":
+    main()
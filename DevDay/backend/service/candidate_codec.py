@@ -0,0 +1,84 @@
+import logging
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 압축 블록에 넣을 키워드 기본 최대 길이 (테마 판단용으로만 쓰이므로 짧게, 토큰 예산에 따라 더 줄어듦)
+KEYWORD_CHARS = 60
+
+# 모델이 돌려준 값 대신 항상 카탈로그 값으로 채우는 필드
+HYDRATED_FIELDS = ("name", "address", "latitude", "longitude", "category")
+
+
+def _minutes(hhmm: Any) -> Union[int, None]:
+    if not isinstance(hhmm, str) or len(hhmm) != 5 or hhmm[2] != ":":
+        return None
+    try:
+        return int(hhmm[:2]) * 60 + int(hhmm[3:])
+    except ValueError:
+        return None
+
+
+class CandidateCodec:
+    """
+    후보 장소 ↔ 짧은 ID(P1, P2, …) 변환.
+    - block(): 프롬프트용 압축 표 (id|name|category|gu|lat,lng|keywords, 좌표 소수 3자리)
+    - hydrate(): 모델이 id/시간/이유만 돌려준 일정에 이름·주소·좌표·카테고리를 카탈로그 값으로 채움
+    모델이 주소/좌표를 옮겨 적지 않으므로 입출력 토큰이 줄고, 복사 오류로 검증에 실패하는 일이 없다.
+    """
+
+    def __init__(self, candidates: pd.DataFrame, keyword_chars: int = KEYWORD_CHARS):
+        self.keyword_chars = keyword_chars
+        self.records: List[Dict[str, Any]] = candidates[
+            ["name", "address", "latitude", "longitude", "category", "keywords", "gu"]
+        ].to_dict("records")
+        self.ids = [f"P{i + 1}" for i in range(len(self.records))]
+        self.by_id = dict(zip(self.ids, self.records))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def block(self) -> str:
+        lines = ["id|name|category|gu|lat,lng|keywords"]
+        for pid, r in zip(self.ids, self.records):
+            keywords = str(r.get("keywords") or "").strip()
+            if len(keywords) > self.keyword_chars:
+                keywords = keywords[:self.keyword_chars].rstrip() + "…" if self.keyword_chars > 0 else ""
+            lines.append(
+                f"{pid}|{str(r.get('name') or '').strip()}|{r.get('category') or ''}|{r.get('gu') or ''}"
+                f"|{float(r['latitude']):.3f},{float(r['longitude']):.3f}|{keywords}"
+            )
+        return "\n".join(lines)
+
+    def hydrate_day(self, day_plan: Any) -> Any:
+        """일차 하나의 places를 카탈로그 값으로 채움. 알 수 없는 id의 장소는 제외"""
+        if not isinstance(day_plan, dict) or not isinstance(day_plan.get("places"), list):
+            return day_plan
+        places = []
+        for place in day_plan["places"]:
+            if not isinstance(place, dict):
+                continue
+            pid = str(place.get("id") or "").strip().upper()
+            record = self.by_id.get(pid)
+            if record is None:
+                logger.warning(f"      ⚠️ 알 수 없는 장소 id 제외: {place.get('id')!r}")
+                continue
+            hydrated = {k: place[k] for k in place if k != "id"}
+            for field in HYDRATED_FIELDS:
+                hydrated[field] = record[field]
+            hydrated["latitude"] = float(hydrated["latitude"])
+            hydrated["longitude"] = float(hydrated["longitude"])
+            if "duration" not in hydrated:
+                start, end = _minutes(place.get("start_time")), _minutes(place.get("end_time"))
+                if start is not None and end is not None and end > start:
+                    hydrated["duration"] = end - start
+            places.append(hydrated)
+        return {**day_plan, "places": places}
+
+    def hydrate(self, result: Any) -> Any:
+        """전체 응답의 itinerary[]를 hydrate_day로 채움 (형식이 다르면 그대로 반환 → 검증 단계에서 거름)"""
+        if not isinstance(result, dict) or not isinstance(result.get("itinerary"), list):
+            return result
+        return {**result, "itinerary": [self.hydrate_day(d) for d in result["itinerary"]]}
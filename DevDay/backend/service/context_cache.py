@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 만료 직전 핸들은 쓰지 않고 새로 만든다 (요청 도중 만료 방지)
+REFRESH_MARGIN = 60
+
+# 모델별 명시적 캐시 최소 입력 토큰 수 (이보다 짧은 접두부는 cachedContents 생성이 거부됨).
+# 모델명에 포함된 접두어로 찾고, 모르는 모델은 보수적으로 DEFAULT_MIN_TOKENS
+MIN_CACHE_TOKENS = (
+    ("gemini-1.5", 32768),
+    ("gemini-2.0", 32768),
+    ("gemini-2.5-pro", 4096),
+    ("gemini-2.5-flash", 1024),
+)
+DEFAULT_MIN_TOKENS = 4096
+
+
+def prefix_digest(prefix: str) -> str:
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+
+def min_cache_tokens(model: str) -> int:
+    for marker, tokens in MIN_CACHE_TOKENS:
+        if marker in model:
+            return tokens
+    return DEFAULT_MIN_TOKENS
+
+
+class ContextCache:
+    """
+    정적 프롬프트 접두부 → 모델별 컨텍스트 캐시 핸들 (TTL 동안 프로세스 내에서 재사용).
+    - 같은 (모델, 접두부)는 동시에 요청돼도 한 번만 만든다
+    - 접두부 추정 토큰 수가 모델의 최소 캐시 크기보다 작으면 만들기 요청 없이 None
+    - 만들기에 실패한 모델(미지원 등)은 retry_after초 동안 다시 시도하지 않음
+    handle()이 None이면 호출한 쪽은 접두부를 프롬프트에 그대로 포함해 보낸다.
+    하위 클래스는 _create(model, prefix) → 핸들 이름만 구현.
+    """
+
+    def __init__(self, ttl: int = 3600, retry_after: float = 600):
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._handles: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._blocked: Dict[str, float] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.creates = 0
+        self.failures = 0
+        self.skipped = 0
+        self.rejected = 0
+
+    def _create(self, model: str, prefix: str) -> str:
+        raise NotImplementedError
+
+    def _lookup(self, key: Tuple[str, str], now: float) -> Union[str, None]:
+        entry = self._handles.get(key)
+        if entry is not None and entry[1] - REFRESH_MARGIN > now:
+            return entry[0]
+        return None
+
+    def handle(self, model: str, prefix: str, prefix_tokens: Union[int, None] = None) -> Union[str, None]:
+        """(모델, 접두부)의 캐시 핸들. 없으면 만들고, 만들 수 없으면 None. prefix_tokens는 접두부 추정 토큰 수"""
+        if not prefix:
+            return None
+        if prefix_tokens is not None and prefix_tokens < min_cache_tokens(model):
+            with self._lock:
+                self.skipped += 1
+            return None
+        key = (model, prefix_digest(prefix))
+        with self._lock:
+            name = self._lookup(key, time.time())
+            if name is not None:
+                self.hits += 1
+                return name
+            if self._blocked.get(model, 0) > time.time():
+                return None
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                name = self._lookup(key, time.time())
+                if name is not None:
+                    self.hits += 1
+                    return name
+            try:
+                name = self._create(model, prefix)
+            except Exception as e:
+                logger.warning(f"   ⚠️ 컨텍스트 캐시 생성 실패 ({model}) → {self.retry_after:g}초간 전체 프롬프트 전송: {e}")
+                with self._lock:
+                    self.failures += 1
+                    self._blocked[model] = time.time() + self.retry_after
+                return None
+            with self._lock:
+                self.creates += 1
+                self._handles[key] = (name, time.time() + self.ttl)
+            logger.info(f"   🗂️ 컨텍스트 캐시 생성: {model} → {name} (접두부 {len(prefix)}자, TTL {self.ttl}초)")
+            return name
+
+    def discard(self, model: str, prefix: str) -> None:
+        """서버가 핸들을 거부한 경우: 핸들을 버리고 이 모델은 retry_after초 동안 캐시 없이 보냄"""
+        with self._lock:
+            self.rejected += 1
+            self._handles.pop((model, prefix_digest(prefix)), None)
+            self._blocked[model] = time.time() + self.retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "handles": sum(1 for _, expires in self._handles.values() if expires > now),
+                "hits": self.hits,
+                "creates": self.creates,
+                "failures": self.failures,
+                "skipped": self.skipped,
+                "rejected": self.rejected,
+                "blocked_models": sorted(m for m, until in self._blocked.items() if until > now),
+            }
+
+
+class GeminiContextCache(ContextCache):
+    """Gemini cachedContents (v1beta). 접두부는 user 턴 하나로 올려 인라인 전송과 같은 순서를 유지"""
+
+    API = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
+
+    def __init__(self, http, api_key: str, ttl: int = 3600, retry_after: float = 600):
+        super().__init__(ttl=ttl, retry_after=retry_after)
+        self.http = http
+        self.api_key = api_key
+
+    def _create(self, model: str, prefix: str) -> str:
+        r = self.http.post(
+            self.API,
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+            json={
+                "model": model,
+                "contents": [{"role": "user", "parts": [{"text": prefix}]}],
+                "ttl": f"{self.ttl}s",
+            },
+        )
+        if r.status_code >= 300:
+            raise RuntimeError(f"HTTP {r.status_code}: {(r.text or '')[:300]}")
+        return r.json()["name"]
+
+
+class LocalContextCache(ContextCache):
+    """
+    서버 없이 동작하는 대체 구현 (테스트용). 핸들 이름 → 접두부를 메모리에 보관하고,
+    가짜 전송 계층이 resolve()로 접두부를 되살려 전체 프롬프트를 재구성할 수 있다.
+    """
+
+    def __init__(self, ttl: int = 3600, retry_after: float = 600):
+        super().__init__(ttl=ttl, retry_after=retry_after)
+        self._store: Dict[str, str] = {}
+
+    def _create(self, model: str, prefix: str) -> str:
+        name = f"cachedContents/local-{prefix_digest(prefix)[:16]}"
+        self._store[name] = prefix
+        return name
+
+    def resolve(self, name: str) -> Union[str, None]:
+        return self._store.get(name)
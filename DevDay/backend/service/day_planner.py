@@ -0,0 +1,118 @@
+import datetime
+import logging
+import math
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.data.popularity import name_key
+from backend.services.spatial_index import haversine_km
+
+logger = logging.getLogger(__name__)
+
+# 군집 중심 재계산 횟수 (후보 수십 개라 몇 번이면 수렴)
+LLOYD_ITERATIONS = 5
+
+
+def _seed_centers(lats: np.ndarray, lngs: np.ndarray, k: int, anchors: np.ndarray) -> np.ndarray:
+    """최원점 시딩: 앵커(관광지) 중 서로 가장 먼 k곳을 초기 중심으로"""
+    pool = anchors if len(anchors) >= k else np.arange(len(lats))
+    centroid = (lats[pool].mean(), lngs[pool].mean())
+    first = pool[int(np.argmax(haversine_km(centroid[0], centroid[1], lats[pool], lngs[pool])))]
+    seeds = [first]
+    dist = haversine_km(lats[first], lngs[first], lats[pool], lngs[pool])
+    while len(seeds) < k:
+        nxt = pool[int(np.argmax(dist))]
+        seeds.append(nxt)
+        dist = np.minimum(dist, haversine_km(lats[nxt], lngs[nxt], lats[pool], lngs[pool]))
+    return np.array([[lats[s], lngs[s]] for s in seeds])
+
+
+def _balanced_assign(dist: np.ndarray, groups: np.ndarray, k: int) -> np.ndarray:
+    """
+    카테고리별 용량(ceil(n_cat / k))을 지키며 가까운 순으로 배정.
+    → 모든 일차가 식당/카페/관광지를 고르게 나눠 갖는다
+    """
+    labels = np.full(dist.shape[0], -1, dtype=np.int64)
+    for group in np.unique(groups):
+        rows = np.flatnonzero(groups == group)
+        capacity = np.full(k, math.ceil(len(rows) / k), dtype=np.int64)
+        sub = dist[rows]
+        order = np.argsort(sub, axis=None, kind="stable")
+        for flat in order.tolist():
+            r, c = divmod(flat, k)
+            row = rows[r]
+            if labels[row] >= 0 or capacity[c] == 0:
+                continue
+            labels[row] = c
+            capacity[c] -= 1
+    return labels
+
+
+def cluster_candidates(candidates: pd.DataFrame, days: int) -> List[pd.DataFrame]:
+    """
+    후보를 일차 수만큼 지리적 군집으로 분할 (카테고리 균형 용량 제약 + 중심 재계산).
+    군집은 서로 겹치지 않으며, 1일차부터 서쪽→동쪽(경도 순)으로 정렬된다.
+    """
+    if days <= 1 or len(candidates) == 0:
+        return [candidates.reset_index(drop=True)]
+
+    k = min(days, len(candidates))
+    lats = candidates["latitude"].to_numpy(dtype=np.float64)
+    lngs = candidates["longitude"].to_numpy(dtype=np.float64)
+    groups = candidates["category"].astype(str).to_numpy()
+
+    centers = _seed_centers(lats, lngs, k, np.flatnonzero(groups == "관광지"))
+    labels = np.zeros(len(candidates), dtype=np.int64)
+    for _ in range(LLOYD_ITERATIONS):
+        dist = haversine_km(lats[:, None], lngs[:, None], centers[None, :, 0], centers[None, :, 1])
+        new_labels = _balanced_assign(dist, groups, k)
+        new_centers = np.array([
+            [lats[new_labels == c].mean(), lngs[new_labels == c].mean()] if (new_labels == c).any() else centers[c]
+            for c in range(k)
+        ])
+        converged = np.array_equal(new_labels, labels)
+        labels, centers = new_labels, new_centers
+        if converged:
+            break
+
+    order = np.argsort(centers[:, 1], kind="stable")
+    clusters = [candidates.iloc[np.flatnonzero(labels == c)].reset_index(drop=True) for c in order]
+    # 후보가 일수보다 적으면 남는 날은 빈 군집
+    clusters += [candidates.iloc[0:0].reset_index(drop=True)] * (days - k)
+    return clusters
+
+
+def merge_days(
+    day_plans: List[Union[Dict[str, Any], None]],
+    start: str,
+    summary: str,
+) -> Union[Dict[str, Any], None]:
+    """
+    일차별 결과 → 전체 일정. 앞 일차에 이미 나온 장소(이름 키 기준)는 뒤 일차에서 제거하고,
+    day/date를 다시 매긴다. 빠진 일차가 있거나 중복 제거로 빈 일차가 생기면 None.
+    """
+    base = datetime.datetime.strptime(start, "%Y-%m-%d").date()
+    seen = set()
+    itinerary = []
+    for i, day_plan in enumerate(day_plans):
+        if not day_plan:
+            return None
+        places = []
+        for place in day_plan.get("places") or []:
+            key = name_key(place.get("name"))
+            if key in seen:
+                logger.info(f"      ♻️ {i + 1}일차 중복 장소 제거: {place.get('name')}")
+                continue
+            seen.add(key)
+            places.append(place)
+        if not places:
+            return None
+        itinerary.append({
+            **day_plan,
+            "day": i + 1,
+            "date": (base + datetime.timedelta(days=i)).strftime("%Y-%m-%d"),
+            "places": places,
+        })
+    return {"summary": summary, "itinerary": itinerary}
@@ -1,17 +1,41 @@
+import itertools
 import logging
 import json
-import re
 import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import requests
 from packaging import version as _v
 
 import google.generativeai as genai
 from backend.config import Config
-from backend.services.prompt_templates import PromptTemplates
+from backend.data.popularity import name_key
+from backend.services.candidate_codec import KEYWORD_CHARS as COMPACT_KEYWORD_CHARS, CandidateCodec
+from backend.services.context_cache import GeminiContextCache
+from backend.services.day_planner import cluster_candidates, merge_days
+from backend.services.http_transport import get_transport
+from backend.services.interval_index import FestivalCalendar
+from backend.services.itinerary_repair import ItineraryRepairer, place_violations
+from backend.services.json_extract import extract_json
+from backend.services.json_stream import ItineraryStreamParser
+from backend.services.keyword_index import KeywordIndex
+from backend.services.latency import LatencyTracker
+from backend.services.local_planner import LocalPlanner
+from backend.services.model_registry import ModelRegistry
+from backend.services.name_index import NameIndex
+from backend.services.place_catalog import get_catalog
+from backend.services.profile_cache import ProfileCache, canonical_profile
+from backend.services.prompt_templates import KEYWORD_CHARS as VERBOSE_KEYWORD_CHARS, PromptTemplates
+from backend.services.rate_limiter import RateLimited, RateLimiter, backoff_delay, parse_retry_after
+from backend.services.response_cache import ResponseCache, response_key
+from backend.services.spatial_index import SpatialIndex
+from backend.services.token_budget import CandidateLineStats, PromptBudget, TokenEstimator
+from backend.untils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -21,138 +45,67 @@ genai.configure(api_key=Config.GEMINI_API_KEY)
 # --- 데이터 경로 ---
 CSV_PATH = Path(Config.DATA_CSV_PATH)
 
-def _best_filled_column(df: pd.DataFrame, candidates: List[str]) -> pd.Series:
-    """여러 후보 중 '존재하고 non-null이 가장 많은' 컬럼을 선택해 반환"""
-    cols = [c for c in candidates if c in df.columns]
-    if not cols:
-        return pd.Series([None] * len(df))
-    cols.sort(key=lambda c: df[c].notna().sum(), reverse=True)
-    return df[cols[0]]
 
-# 데이터 로딩 / 전처리
-
-def _load_master_df() -> pd.DataFrame:
-    """CSV 파일 로드 및 전처리"""
-    logger.info("=" * 60)
-    logger.info("📂 CSV 파일 로드 시작.")
-    logger.info(f"   경로: {CSV_PATH}")
-
-    try:
-        df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
-        logger.info(f"✅ CSV 로드 성공: {len(df)}행")
-    except Exception as e:
-        logger.error(f"❌ CSV 로드 실패: {e}")
-        raise
-
-    df.columns = df.columns.str.strip()
-
-    def col(df, *names):
-        for n in names:
-            if n in df.columns:
-                return df[n]
-        return pd.Series([None] * len(df))
-
-    def s(x):
-        if pd.isna(x):
-            return ""
-        sx = str(x).strip()
-        if sx.lower() in {"null", "none", "nan"}:
-            return ""
-        return sx
-
-    # 다양한 컬럼명을 허용 (사용자 CSV 호환)
-    name = col(df, "콘텐츠명", "제목", "name", "장소명")
-    gu = col(df, "구군", "gu", "구")
-    lat = pd.to_numeric(col(df, "위도", "latitude", "lat"), errors="coerce")
-    lng = pd.to_numeric(col(df, "경도", "longitude", "lng", "lon"), errors="coerce")
-    address = _best_filled_column(df, ["주소", "주소 기타", "주소 기타 ", "장소", "address"])
-    raw_type = col(df, "유형", "여행지", "type", "타입")
-    detail = col(df, "상세내용", "detail", "설명")
-    subtitle = col(df, "부제", "부제목", "subtitle")
-    spot = col(df, "주요장소", "spot")
-    place = col(df, "장소", "place")
-    rep_menu = col(df, "대표메뉴", "menu", "메뉴")
-
-    master = pd.DataFrame(
-        {
-            "name": name.apply(s),
-            "gu": gu.apply(s),
-            "latitude": lat,
-            "longitude": lng,
-            "address": address.apply(s),
-            "raw_type": raw_type.apply(s),
-            "rep_menu": rep_menu.apply(s),
-            "keywords": (
-                detail.apply(s)
-                + " "
-                + subtitle.apply(s)
-                + " "
-                + spot.apply(s)
-                + " "
-                + place.apply(s)
-            ).str.strip(),
-        }
-    )
-
-    # 좌표 유효값만 (부산 대략 범위)
-    master = master.dropna(subset=["latitude", "longitude"])
-    master = master[
-        (master["latitude"].between(34.8, 36.2))
-        & (master["longitude"].between(128.5, 130.0))
-    ]
-
-    # 초유명 스팟 제외 (비주류 중심)
-    ban = ["해운대", "광안리", "감천문화마을", "자갈치", "국제시장", "BIFF"]
-    patt = "|".join(ban)
-    master = master[~master["name"].str.contains(patt, case=False, na=False)]
-
-    # 간단 카테고리 추론
-    def guess_category(row):
-        text = f"{row['name']} {row['raw_type']} {row['keywords']}"
-        if "카페" in text:
-            return "카페"
-        if row["rep_menu"]:
-            return "식당"
-        if any(kw in text for kw in ["체험", "공방", "워크샵"]):
-            return "체험"
-        if any(kw in text for kw in ["쇼핑", "상점", "마켓"]):
-            return "쇼핑"
-        return "관광지"
-
-    master["category"] = master.apply(guess_category, axis=1)
-
-    cat_counts = master["category"].value_counts()
-    logger.info("   카테고리별 개수:")
-    for cat, cnt in cat_counts.items():
-        logger.info(f"     - {cat}: {cnt}개")
-
-    logger.info("=" * 60)
-    return master.reset_index(drop=True)
-
-
-def _filter_candidates(master_df: pd.DataFrame, themes, days: int) -> pd.DataFrame:
-    """테마에 맞는 후보 필터링 (일정 길이에 따라 동적 조정)"""
+# 테마 상위 관광지 주변으로 식당/카페 등을 우선 채울 반경 (km)
+NEARBY_KM = 3.0
+
+# 숨은 명소 점수(0~1)의 순위 가중치 — 1.0이면 장소명 테마 매칭(3점) 하나와 같은 비중
+GEM_WEIGHT = 3.0
+
+# 잘린 응답에서 {"itinerary": [...]}의 일차 경계 깊이 (이보다 깊게 잘렸으면 마지막 일차가 미완성)
+ITINERARY_DEPTH = 2
+
+
+def _nearby_rows(spatial_index: SpatialIndex, anchors: List[int], exclude: set) -> List[int]:
+    """앵커 장소들 반경 NEARBY_KM 이내 행 (가장 가까운 앵커까지 거리순, exclude 제외)"""
+    rows, dists = [], []
+    for a in anchors:
+        r, d = spatial_index.within_radius(spatial_index.lats[a], spatial_index.lngs[a], NEARBY_KM)
+        rows.append(r)
+        dists.append(d)
+    if not rows:
+        return []
+    rows, dists = np.concatenate(rows), np.concatenate(dists)
+    order = np.lexsort((rows, dists))
+    seen = set(exclude)
+    out = []
+    for r in rows[order].tolist():
+        if r not in seen:
+            seen.add(r)
+            out.append(r)
+    return out
+
+
+def default_max_candidates(days: int) -> int:
+    """하루당 5~6곳, 안전계수 3, 최대 60"""
+    return min(days * 6 * 3, 60)
+
+
+def _filter_candidates(
+    master_df: pd.DataFrame,
+    themes,
+    days: int,
+    keyword_index: Union[KeywordIndex, None] = None,
+    spatial_index: Union[SpatialIndex, None] = None,
+    festival_calendar: Union[FestivalCalendar, None] = None,
+    start: Union[str, None] = None,
+    end: Union[str, None] = None,
+    max_candidates: Union[int, None] = None,
+) -> pd.DataFrame:
+    """테마에 맞는 후보 필터링 (일정 길이에 따라 동적 조정, 여행 기간 밖 축제 제외, max_candidates는 토큰 예산 기준 상한)"""
     logger.info("=" * 60)
     logger.info(f"🔍 후보 필터링 시작 (테마: {themes}, 일수: {days})")
 
-    def nrm(s):
-        return (s or "").strip().lower()
-
-    def hit(kw):
-        t = nrm(kw)
-        return any(nrm(th) in t for th in (themes or []))
-
-    df = master_df.copy()
-    df["theme_hit"] = df["keywords"].apply(hit)
-    df["rank"] = df["theme_hit"].astype(int) * 3
+    if keyword_index is None:
+        keyword_index = KeywordIndex.build(master_df)
 
-    hit_count = df["theme_hit"].sum()
-    logger.info(f"   테마 매칭: {hit_count}개")
+    # 테마 매칭은 역색인 포스팅 합집합으로만 계산 (전체 행 스캔/복사 없음)
+    hit_rows, rank, theme_hits = keyword_index.theme_scores(themes)
+    logger.info(f"   테마 매칭: {len(hit_rows)}개 (2개 이상 테마: {int((theme_hits >= 2).sum())}개)")
 
-    # 하루당 5~6곳, 안전계수 3, 최대 60
-    max_candidates = min(days * 6 * 3, 60)
-
-    filtered = df.sort_values("rank", ascending=False).head(max_candidates * 2)
+    if max_candidates is None:
+        max_candidates = default_max_candidates(days)
+    pool_size = max_candidates * 2
 
     categories = {
         "관광지": int(max_candidates * 0.4),
@@ -162,6 +115,38 @@ def _filter_candidates(master_df: pd.DataFrame, themes, days: int) -> pd.DataFra
         "쇼핑": int(max_candidates * 0.05),
     }
 
+    # 여행 기간과 겹치지 않는(또는 기간을 알 수 없는) 축제는 어떤 경로로도 후보에 넣지 않는다
+    if festival_calendar is None:
+        festival_calendar = FestivalCalendar.build(master_df)
+    blocked = festival_calendar.blocked_mask(start, end)
+    if blocked.any():
+        logger.info(f"   기간 외 축제 제외: {int(blocked.sum())}개 (기간 {start} ~ {end})")
+        keep = ~blocked[hit_rows]
+        hit_rows, rank = hit_rows[keep], rank[keep]
+
+    # 테마 매칭 강도 + 숨은 명소 점수 내림차순 (동점은 원래 순서) — 정렬 한 번
+    gem = master_df["gem_score"].to_numpy(dtype=np.float64)
+    score = rank + GEM_WEIGHT * gem[hit_rows]
+    order = hit_rows[np.lexsort((hit_rows, -score))][:pool_size].tolist()
+
+    # 다음 순위: 테마 상위 관광지 주변 장소 (식사/카페가 하루 동선에서 멀어지지 않도록)
+    if spatial_index is not None and order:
+        category_of = master_df["category"].to_numpy()
+        anchors = [r for r in order if category_of[r] == "관광지"][: categories["관광지"]]
+        nearby = _nearby_rows(spatial_index, anchors, set(order) | set(np.flatnonzero(blocked).tolist()))
+        logger.info(f"   관광지 {len(anchors)}곳 주변 {NEARBY_KM:g}km 이내: {len(nearby)}개")
+        order += nearby
+
+    # 그래도 부족하면 미매칭 행을 숨은 명소 점수 순으로 채움
+    if len(order) < pool_size:
+        matched = set(order)
+        by_gem = np.argsort(-gem, kind="stable").tolist()
+        order += list(itertools.islice(
+            (r for r in by_gem if r not in matched and not blocked[r]), pool_size - len(order)
+        ))
+
+    filtered = master_df.iloc[order]
+
     result = []
     for cat, limit in categories.items():
         cat_df = filtered[filtered["category"] == cat].head(limit)
@@ -180,6 +165,31 @@ def _filter_candidates(master_df: pd.DataFrame, themes, days: int) -> pd.DataFra
     ].reset_index(drop=True)
 
 
+class _AttemptLog:
+    """REST 호출 1회분의 시도 기록 (헤지 요청 스레드와 공유)"""
+
+    def __init__(self):
+        self.tried_models = set()
+        self.dead_models = set()
+        self.done = set()
+        self.errors: List[str] = []
+        self.retry_hints: List[Union[float, None]] = []
+        self._lock = threading.Lock()
+
+    def start(self, name: str, idx: str) -> None:
+        with self._lock:
+            self.tried_models.add(name)
+            self.done.add((name, idx))
+
+    def fail(self, error: str, dead_model: Union[str, None] = None, retry_after: Union[float, None] = None) -> None:
+        with self._lock:
+            self.errors.append(error)
+            if dead_model is not None:
+                self.dead_models.add(dead_model)
+            if error.startswith("429:"):
+                self.retry_hints.append(retry_after)
+
+
 # =========================
 # Gemini 호출 서비스 (교체본)
 # =========================
@@ -193,8 +203,70 @@ class GeminiService:
             "max_output_tokens": 2048,
         }
 
-        # 모델명은 호출 직전에 자동 선택 (ListModels)
+        # 장소 카탈로그는 프로세스당 1회 빌드 후 공유 (데이터 변경 시 자동 리로드)
+        self.catalog = get_catalog(CSV_PATH, reload_interval=Config.CATALOG_RELOAD_INTERVAL)
+        self.catalog.register_index("keywords", KeywordIndex.build)
+        self.catalog.register_index("spatial", SpatialIndex.build)
+        self.catalog.register_index("festivals", FestivalCalendar.build)
+        self.catalog.register_index("line_stats", CandidateLineStats.build)
+        self.catalog.register_index("names", NameIndex.build)
+        self.catalog.load()
+
+        # 같은 (모델, 생성 설정, 프롬프트)의 검증된 응답은 재사용 (프로세스/재시작 간 공유)
+        self.response_cache = ResponseCache(
+            Config.RESPONSE_CACHE_PATH,
+            ttl=Config.RESPONSE_CACHE_TTL,
+            max_bytes=int(Config.RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+        )
+        # 감정/테마 순서나 실제 날짜만 다른 요청은 이전 일정을 날짜만 옮겨 재사용
+        self.profile_cache = ProfileCache(
+            Config.PROFILE_CACHE_PATH,
+            ttl=Config.PROFILE_CACHE_TTL,
+            max_bytes=int(Config.RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+        )
+
+        # REST 호출은 프로세스 전역 keep-alive 연결 풀로, SDK 모델 객체는 모델명별로 재사용
+        self.http = get_transport(
+            pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+            connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+            read_timeout=Config.HTTP_READ_TIMEOUT,
+        )
+        self._sdk_models = LRUCache(maxsize=8, name="sdk-models")
+        # 프롬프트의 정적 접두부(규칙/스키마)는 모델별 cachedContents로 한 번만 올리고 핸들로 재사용
+        self.context_cache = (
+            GeminiContextCache(
+                self.http, Config.GEMINI_API_KEY, ttl=Config.CONTEXT_CACHE_TTL, retry_after=Config.MODEL_COOLDOWN
+            )
+            if Config.CONTEXT_CACHE
+            else None
+        )
+        # 모델별 응답 지연 히스토그램 → 헤지 요청을 보낼 시점(HEDGE_PERCENTILE 분위)
+        self.latency = LatencyTracker()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=Config.HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+        self.hedges = 0
+        # 모델별 글자/토큰 비율(실제 usageMetadata로 보정) → 입력 토큰 예산에 맞춰 후보 수/키워드 길이 결정
+        self.token_estimator = TokenEstimator()
+        self.prompt_budget = PromptBudget(
+            self.token_estimator, Config.PROMPT_TOKEN_BUDGET, Config.PROMPT_TOKEN_BUDGETS
+        )
+        # 분당 요청/토큰 쿼터를 워커 간 공유 버킷으로 지킴 (429가 나기 전에 필요한 만큼만 대기)
+        self.rate_limiter = RateLimiter(
+            Config.RATE_LIMIT_PATH,
+            rpm=Config.GEMINI_RPM,
+            tpm=Config.GEMINI_TPM,
+            max_wait=Config.RATE_LIMIT_MAX_WAIT,
+        )
+
+        # Gemini 없이 규칙대로 일정을 짜는 로컬 플래너 (폴백 일정 / 스트리밍 초안)
+        self.local_planner = LocalPlanner()
+
+        # 모델명은 호출 직전에 자동 선택 (ListModels, 결과는 레지스트리에 TTL 캐시)
         self.model_name: Union[str, None] = None
+        self.model_registry = ModelRegistry(
+            Config.MODEL_REGISTRY_PATH,
+            discovery_ttl=Config.MODEL_DISCOVERY_TTL,
+            cooldown=Config.MODEL_COOLDOWN,
+        )
 
         # SDK 사용 가능 여부
         self._use_sdk = False
@@ -211,11 +283,32 @@ class GeminiService:
             self._use_sdk = False
 
     # --- 모델 자동 선택 ---
-    def _pick_model_name(self) -> str:
-        api_key = Config.GEMINI_API_KEY
+    @staticmethod
+    def _list_models() -> List[str]:
+        """ListModels → generateContent 지원 모델명 목록"""
         url = "https://generativelanguage.googleapis.com/v1/models"
-        headers = {"x-goog-api-key": api_key}
+        headers = {"x-goog-api-key": Config.GEMINI_API_KEY}
+        r = get_transport().get(url, headers=headers)
+        r.raise_for_status()
+        data = r.json()
+
+        def supports_generate(m):
+            ops = m.get("supportedGenerationMethods") or m.get("generation_methods")
+            return bool(ops and ("generateContent" in ops))
+
+        return [m["name"] for m in data.get("models", []) if supports_generate(m)]
 
+    def _available_models(self) -> List[str]:
+        """모델 목록 (레지스트리 TTL 동안 캐시, 워커 간 공유). 조회 실패 시 빈 목록"""
+        try:
+            return self.model_registry.models(self._list_models)
+        except requests.HTTPError as e:
+            logger.error(f"   ❌ ListModels 실패: {e}")
+        except Exception as e:
+            logger.error(f"   ❌ ListModels 예외: {e}")
+        return []
+
+    def _pick_model_name(self) -> str:
         # 신→구 선호순 (호환성 고려해 1.5 먼저 시도하도록 아래 REST에서 재정렬함)
         preferred = [
             "models/gemini-2.5-flash",
@@ -226,46 +319,41 @@ class GeminiService:
             "models/gemini-pro",
         ]
 
-        try:
-            r = requests.get(url, headers=headers, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            models = {m["name"]: m for m in data.get("models", [])}
-
-            def supports_generate(m):
-                ops = m.get("supportedGenerationMethods") or m.get("generation_methods")
-                return bool(ops and ("generateContent" in ops))
-
-            candidates = [name for name, meta in models.items() if supports_generate(meta)]
-
-            logger.info(f"   🔎 사용가능 모델 수: {len(candidates)}")
-            for p in preferred:
-                if p in candidates:
-                    logger.info(f"   ✅ 선택된 모델: {p}")
-                    return p
-
-            if candidates:
-                choice = candidates[0]
-                logger.info(f"   ⚠️ 선호 목록엔 없음 → {choice} 사용")
-                return choice
-
-            raise RuntimeError("사용 가능한 Gemini 모델이 없습니다. (ListModels 결과 비어 있음)")
-
-        except requests.HTTPError as e:
-            logger.error(f"   ❌ ListModels 실패: {e}")
-            return "models/gemini-1.5-flash"
-        except Exception as e:
-            logger.error(f"   ❌ ListModels 예외: {e}")
+        candidates = self._available_models()
+        if not candidates:
             return "models/gemini-1.5-flash"
 
-    # --- v1 REST 호출 (견고 버전) ---
-    def _rest_generate_content(self, prompt: str) -> str:
-        api_key = Config.GEMINI_API_KEY
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": api_key,
-        }
+        logger.info(f"   🔎 사용가능 모델 수: {len(candidates)}")
+        for p in preferred:
+            if p in candidates:
+                logger.info(f"   ✅ 선택된 모델: {p}")
+                return p
+
+        choice = candidates[0]
+        logger.info(f"   ⚠️ 선호 목록엔 없음 → {choice} 사용")
+        return choice
+
+    def _sdk_model(self, model_name: str) -> "genai.GenerativeModel":
+        """모델명별 GenerativeModel (재시도마다 새로 만들지 않음)"""
+        sdk_name = model_name.replace("models/", "")
+        return self._sdk_models.get_or_compute(
+            sdk_name, lambda: genai.GenerativeModel(sdk_name, generation_config=self.generation_config)
+        )
+
+    def _estimate_tokens(self, prompt: str) -> int:
+        """쿼터 차감용 토큰 수 (모델별 보정된 글자/토큰 비율로 추정한 입력 + 최대 출력)"""
+        return self.token_estimator.tokens(self.model_name, len(prompt)) + int(
+            self.generation_config.get("max_output_tokens", 2048)
+        )
+
+    def _record_usage(self, model: str, prompt: str, text: str, prompt_tokens: Any, output_tokens: Any) -> None:
+        """응답의 실제 토큰 수로 글자/토큰 비율 보정 (값이 없으면 무시)"""
+        self.token_estimator.record(model, len(prompt), prompt_tokens)
+        self.token_estimator.record(model, len(text), output_tokens, kind="output")
 
+    # --- v1 REST 호출 (견고 버전) ---
+    def _rest_generate_content(self, prompt: str, stream: bool = False) -> Union[str, Iterator[str]]:
+        """generateContent 텍스트. stream=True면 streamGenerateContent(SSE) 텍스트 조각 이터레이터"""
         if not self.model_name:
             self.model_name = self._pick_model_name()
 
@@ -284,20 +372,26 @@ class GeminiService:
         # pick 결과를 맨 앞에 끼워넣기
         if self.model_name not in model_candidates:
             model_candidates.insert(0, self.model_name)
+        model_candidates = list(dict.fromkeys(to_full_name(m) for m in model_candidates))
+
+        # ListModels에 없는 모델은 시도하지 않음 (목록을 못 얻었으면 전부 시도)
+        available = set(self._available_models())
+        if available:
+            model_candidates = [m for m in model_candidates if m in available] or model_candidates
 
         base_min = [{"parts": [{"text": prompt}]}]
         base_role = [{"role": "user", "parts": [{"text": prompt}]}]
 
-        payload_variants = [
-            {"contents": base_min},  # #1 미니멀
-            {"contents": base_role},  # #2 role 포함
-            {"contents": base_min,    # #3 gen config
+        payload_variants = {
+            "minimal": {"contents": base_min},  # #1 미니멀
+            "role": {"contents": base_role},  # #2 role 포함
+            "config": {"contents": base_min,    # #3 gen config
              "generationConfig": {
                  "temperature": self.generation_config.get("temperature", 0.8),
                  "topP": self.generation_config.get("top_p", 0.95),
                  "maxOutputTokens": self.generation_config.get("max_output_tokens", 2048),
              }},
-            {"contents": base_role,   # #4 gen config + safety (최후)
+            "safety": {"contents": base_role,   # #4 gen config + safety (최후)
              "generationConfig": {
                  "temperature": self.generation_config.get("temperature", 0.8),
                  "topP": self.generation_config.get("top_p", 0.95),
@@ -309,79 +403,328 @@ class GeminiService:
                  {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
                  {"category": "HARM_CATEGORY_SEXUAL_CONTENT", "threshold": "BLOCK_NONE"},
              ]},
-        ]
+        }
 
-        tried_models = set()
-        all_errors = []
+        # 최근 성공한 (모델, 페이로드) 먼저, 쿨다운 중인 404 모델/반복 400 조합은 제외
+        attempts = self.model_registry.plan(model_candidates, list(payload_variants))
+        tokens = self._estimate_tokens(prompt)
+        prefix, _ = PromptTemplates.split_prompt(prompt)
+        log = _AttemptLog()
 
-        for cand_model in model_candidates:
-            name = to_full_name(cand_model)
-            if name in tried_models:
+        if Config.HEDGE_ENABLED and not stream:
+            text = self._hedged_attempts(attempts, payload_variants, tokens, log, prefix)
+            if text is not None:
+                return text
+
+        for name, idx in attempts:
+            if name in log.dead_models or (name, idx) in log.done:
                 continue
-            tried_models.add(name)
-
-            url = f"https://generativelanguage.googleapis.com/v1/{name}:generateContent"
-
-            for idx, payload in enumerate(payload_variants, 1):
-                try:
-                    logger.info(f"   ▶ 모델 {name} / 페이로드#{idx} 시도")
-                    r = requests.post(url, headers=headers, json=payload, timeout=60)
-
-                    if r.status_code == 404:
-                        logger.warning(f"   ⚠️ 404 Not Found (model): {name} → 다른 모델 시도")
-                        all_errors.append(f"404:{name}")
-                        break  # 다음 모델로
-
-                    if r.status_code == 400:
-                        err_text = (r.text or "")[:800]
-                        logger.error(f"   ❌ 400 Bad Request (payload#{idx}) for {name} | body: {err_text}")
-                        all_errors.append(f"400:{name}#p{idx}")
-                        continue  # 다음 페이로드
-
-                    if r.status_code >= 300:
-                        err_text = (r.text or "")[:800]
-                        logger.error(f"   ❌ HTTP {r.status_code} for {name} (payload#{idx}) | body: {err_text}")
-                        all_errors.append(f"{r.status_code}:{name}#p{idx}")
-                        continue
-
-                    data = r.json()
-
-                    if "promptFeedback" in data:
-                        logger.info(f"   ℹ️ promptFeedback: {data['promptFeedback']}")
-
-                    cands = data.get("candidates", [])
-                    if not cands:
-                        logger.warning(f"   ⚠️ candidates 비어있음 (model={name}, payload#{idx}) → 다음 시도")
-                        all_errors.append(f"emptyCands:{name}#p{idx}")
-                        continue
-
-                    text = "".join(
-                        part.get("text", "")
-                        for cand in cands
-                        for part in (cand.get("content", {}) or {}).get("parts", [])
-                    ).strip()
-
-                    if not text:
-                        logger.warning(f"   ⚠️ parts[].text 비어있음 (model={name}, payload#{idx}) → 다음 시도")
-                        all_errors.append(f"emptyText:{name}#p{idx}")
-                        continue
-
-                    logger.info(f"   ✅ 성공 (model={name}, payload#{idx})")
-                    return text
-
-                except requests.HTTPError as e:
-                    body = getattr(e.response, "text", "")[:800]
-                    logger.error(f"   ❌ HTTPError {e} (model={name}, payload#{idx}) | body: {body}")
-                    all_errors.append(f"HTTP:{name}#p{idx}")
-                except Exception as e:
-                    logger.error(f"   ❌ 예외 {type(e).__name__}: {e} (model={name}, payload#{idx})")
-                    all_errors.append(f"EX:{name}#p{idx}")
-
-        raise RuntimeError(f"모든 모델/페이로드 호출 실패. 시도 모델 수: {len(tried_models)} / 에러: {all_errors}")
+            outcome, value = self._rest_attempt(name, idx, payload_variants[idx], tokens, log, stream, prefix)
+            if outcome == "ok":
+                return value
+
+        if log.retry_hints and log.dead_models >= log.tried_models:
+            # 시도한 모델이 모두 쿼터 초과 → 서버가 알려준 시간 동안 모든 워커 보류
+            hints = [h for h in log.retry_hints if h is not None]
+            retry_after = min(hints) if hints else None
+            if retry_after:
+                self.rate_limiter.hold(retry_after)
+            raise RateLimited(f"모든 모델 쿼터 초과: {log.errors}", retry_after=retry_after)
+
+        raise RuntimeError(f"모든 모델/페이로드 호출 실패. 시도 모델 수: {len(log.tried_models)} / 에러: {log.errors}")
+
+    def _rest_attempt(
+        self,
+        name: str,
+        idx: str,
+        payload: Dict[str, Any],
+        tokens: int,
+        log: "_AttemptLog",
+        stream: bool = False,
+        prefix: str = "",
+    ) -> tuple:
+        """
+        (모델, 페이로드) 1회 호출 → ("ok", 텍스트 또는 스트림 이터레이터) / ("fail", None).
+        결과는 log(시도/404 모델/429 힌트/에러)와 모델 레지스트리·지연 히스토그램에 기록.
+        prefix(프롬프트의 정적 접두부)의 컨텍스트 캐시 핸들이 있으면 접두부를 빼고 핸들로 보낸다
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": Config.GEMINI_API_KEY,
+        }
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        sent, api = self._with_context(name, payload, prefix)
+        log.start(name, idx)
+
+        try:
+            self.rate_limiter.acquire(tokens)
+            logger.info(f"   ▶ 모델 {name} / 페이로드#{idx} 시도")
+            started = time.monotonic()
+            r = self.http.post(
+                f"https://generativelanguage.googleapis.com/{api}/{name}:{method}", headers=headers, json=sent, stream=stream
+            )
+
+            if sent is not payload and r.status_code in (400, 403, 404):
+                # 만료/삭제된 핸들 등: 캐시 탓이므로 모델·페이로드 실패로 기록하지 않고 전체 프롬프트로 다시 보냄
+                # (같은 논리 요청이므로 쿼터 버킷에서 다시 차감하지 않는다)
+                logger.warning(f"   ⚠️ 컨텍스트 캐시 요청 거부 ({r.status_code}, {name}) → 전체 프롬프트로 재시도")
+                log.fail(f"cache{r.status_code}:{name}#p{idx}")
+                r.close()
+                self.context_cache.discard(name, prefix)
+                started = time.monotonic()
+                r = self.http.post(
+                    f"https://generativelanguage.googleapis.com/v1/{name}:{method}", headers=headers, json=payload, stream=stream
+                )
+
+            if r.status_code == 404:
+                logger.warning(f"   ⚠️ 404 Not Found (model): {name} → 다른 모델 시도")
+                log.fail(f"404:{name}", dead_model=name)
+                self.model_registry.record_failure(name, idx, 404)
+                return "fail", None  # 다음 모델로
+
+            if r.status_code == 400:
+                err_text = (r.text or "")[:800]
+                logger.error(f"   ❌ 400 Bad Request (payload#{idx}) for {name} | body: {err_text}")
+                log.fail(f"400:{name}#p{idx}")
+                self.model_registry.record_failure(name, idx, 400)
+                return "fail", None  # 다음 페이로드
+
+            if r.status_code == 429:
+                # 쿼터는 모델별이므로 다른 모델은 계속 시도, 이 모델의 다른 페이로드는 건너뜀
+                retry_after = parse_retry_after(r.headers.get("Retry-After"), r.text)
+                logger.warning(f"   ⚠️ 429 Too Many Requests: {name} (retry after: {retry_after})")
+                log.fail(f"429:{name}", dead_model=name, retry_after=retry_after)
+                return "fail", None
+
+            if r.status_code >= 300:
+                err_text = (r.text or "")[:800]
+                logger.error(f"   ❌ HTTP {r.status_code} for {name} (payload#{idx}) | body: {err_text}")
+                log.fail(f"{r.status_code}:{name}#p{idx}")
+                self.model_registry.record_failure(name, idx, r.status_code)
+                return "fail", None
+
+            if stream:
+                logger.info(f"   📡 스트림 시작 (model={name}, payload#{idx})")
+                self.model_registry.record_success(name, idx)
+                return "ok", self._iter_sse_text(r)
+
+            data = r.json()
+
+            if "promptFeedback" in data:
+                logger.info(f"   ℹ️ promptFeedback: {data['promptFeedback']}")
+
+            cands = data.get("candidates", [])
+            if not cands:
+                logger.warning(f"   ⚠️ candidates 비어있음 (model={name}, payload#{idx}) → 다음 시도")
+                log.fail(f"emptyCands:{name}#p{idx}")
+                return "fail", None
+
+            text = "".join(
+                part.get("text", "")
+                for cand in cands
+                for part in (cand.get("content", {}) or {}).get("parts", [])
+            ).strip()
+
+            if not text:
+                logger.warning(f"   ⚠️ parts[].text 비어있음 (model={name}, payload#{idx}) → 다음 시도")
+                log.fail(f"emptyText:{name}#p{idx}")
+                return "fail", None
+
+            elapsed = time.monotonic() - started
+            self.latency.observe(name, elapsed)
+            usage = data.get("usageMetadata") or {}
+            self._record_usage(
+                name,
+                payload["contents"][0]["parts"][0]["text"],
+                text,
+                usage.get("promptTokenCount"),
+                usage.get("candidatesTokenCount"),
+            )
+            logger.info(f"   ✅ 성공 (model={name}, payload#{idx}, {elapsed:.1f}초)")
+            self.model_registry.record_success(name, idx)
+            return "ok", text
+
+        except RateLimited:
+            raise
+        except requests.HTTPError as e:
+            body = getattr(e.response, "text", "")[:800]
+            logger.error(f"   ❌ HTTPError {e} (model={name}, payload#{idx}) | body: {body}")
+            log.fail(f"HTTP:{name}#p{idx}")
+        except Exception as e:
+            logger.error(f"   ❌ 예외 {type(e).__name__}: {e} (model={name}, payload#{idx})")
+            log.fail(f"EX:{name}#p{idx}")
+        return "fail", None
+
+    def _with_context(self, name: str, payload: Dict[str, Any], prefix: str) -> tuple:
+        """(보낼 페이로드, API 버전). 캐시 핸들이 있으면 contents에서 접두부를 빼고 cachedContent 지정 (v1beta 전용)"""
+        if not prefix or self.context_cache is None:
+            return payload, "v1"
+        handle = self.context_cache.handle(name, prefix, self.token_estimator.tokens(name, len(prefix)))
+        if handle is None:
+            return payload, "v1"
+        contents = [
+            {**content, "parts": [{"text": content["parts"][0]["text"][len(prefix):]}]}
+            for content in payload["contents"]
+        ]
+        return {**payload, "contents": contents, "cachedContent": handle}, "v1beta"
+
+    def _hedged_attempts(
+        self,
+        attempts: List[tuple],
+        payload_variants: Dict[str, Dict[str, Any]],
+        tokens: int,
+        log: "_AttemptLog",
+        prefix: str = "",
+    ) -> Union[str, None]:
+        """
+        1순위 조합을 보내고, 그 모델의 지연 HEDGE_PERCENTILE 분위를 넘기도록 응답이 없으면
+        다른 모델의 다음 조합을 하나 더 보내 먼저 성공한 응답을 쓴다.
+        진행 중인 HTTP 호출은 중단할 수 없으므로 늦은 쪽은 백그라운드에서 끝나고 결과만 버린다.
+        둘 다 실패하면 None (남은 조합은 호출한 쪽이 순차로 시도).
+        """
+        if not attempts:
+            return None
+        primary = attempts[0]
+        backup = next((pair for pair in attempts[1:] if pair[0] != primary[0]), None)
+        delay = self.latency.delay(
+            primary[0], Config.HEDGE_PERCENTILE, Config.HEDGE_MIN_SAMPLES, Config.HEDGE_DEFAULT_DELAY
+        )
+
+        def run(pair):
+            return self._rest_attempt(pair[0], pair[1], payload_variants[pair[1]], tokens, log, prefix=prefix)
+
+        pending = {self._hedge_pool.submit(run, primary)}
+        done, pending = wait(pending, timeout=delay)
+        if not done and backup is not None:
+            logger.info(f"   🏁 {primary[0]} 응답 {delay:.1f}초 초과 → {backup[0]} 헤지 요청")
+            self.hedges += 1
+            pending.add(self._hedge_pool.submit(run, backup))
+
+        while done or pending:
+            for future in done:
+                outcome, value = future.result()
+                if outcome == "ok":
+                    if pending:
+                        logger.info("   🏁 먼저 온 응답 사용, 나머지 요청 결과는 버림")
+                    for other in pending:
+                        other.cancel()
+                    return value
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        return None
+
+    def _call_model(self, prompt: str) -> str:
+        """SDK(가능하면) 또는 REST로 응답 텍스트 1건. 쿼터 초과는 RateLimited"""
+        if not self._use_sdk:
+            return self._rest_generate_content(prompt)
+
+        self.rate_limiter.acquire(self._estimate_tokens(prompt))
+        try:
+            response = self._sdk_model(self.model_name).generate_content(prompt)
+            response_text = getattr(response, "text", "")
+            logger.info(f"   ✅ SDK 응답 (길이: {len(response_text)}자)")
+            usage = getattr(response, "usage_metadata", None)
+            self._record_usage(
+                self.model_name,
+                prompt,
+                response_text,
+                getattr(usage, "prompt_token_count", None),
+                getattr(usage, "candidates_token_count", None),
+            )
+            return response_text
+        except Exception as e:
+            if "429" in str(e) or "ResourceExhausted" in type(e).__name__:
+                retry_after = parse_retry_after(body=str(e))
+                if retry_after:
+                    self.rate_limiter.hold(retry_after)
+                raise RateLimited(str(e), retry_after=retry_after) from e
+            logger.error(f"   ❌ SDK 호출 실패: {e}")
+            logger.info("   🔁 REST(v1)로 폴백")
+            return self._rest_generate_content(prompt)
+
+    @staticmethod
+    def _iter_sse_text(response) -> Iterator[str]:
+        """streamGenerateContent?alt=sse 응답 → candidates[].content.parts[].text 조각"""
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = json.loads(line[5:].strip())
+                text = "".join(
+                    part.get("text", "")
+                    for cand in data.get("candidates", [])
+                    for part in (cand.get("content", {}) or {}).get("parts", [])
+                )
+                if text:
+                    yield text
+        finally:
+            response.close()
+
+    def _stream_text(self, prompt: str) -> Iterator[str]:
+        """SDK(stream=True) 또는 REST SSE로 응답 텍스트 조각을 받는다"""
+        if self._use_sdk:
+            self.rate_limiter.acquire(self._estimate_tokens(prompt))
+            yielded = False
+            try:
+                for chunk in self._sdk_model(self.model_name).generate_content(prompt, stream=True):
+                    text = getattr(chunk, "text", "")
+                    if text:
+                        yielded = True
+                        yield text
+                return
+            except Exception as e:
+                if "429" in str(e) or "ResourceExhausted" in type(e).__name__:
+                    retry_after = parse_retry_after(body=str(e))
+                    if retry_after:
+                        self.rate_limiter.hold(retry_after)
+                    raise RateLimited(str(e), retry_after=retry_after) from e
+                logger.error(f"   ❌ SDK 스트림 실패: {e}")
+                if yielded:
+                    # 이미 보낸 조각 뒤에 REST 응답을 처음부터 이어 붙이면 파서 입력이 깨진다 → 재시도 루프에서 새로 시작
+                    raise
+                logger.info("   🔁 REST(v1) 스트림으로 폴백")
+        yield from self._rest_generate_content(prompt, stream=True)
+
+    def _collect_stream(
+        self,
+        prompt: str,
+        on_day: Callable[[int, Dict[str, Any]], None],
+        codec: Union[CandidateCodec, None] = None,
+        repairer: Union[ItineraryRepairer, None] = None,
+    ) -> str:
+        """
+        스트림을 끝까지 받으며, 닫힌 일차 객체를 (압축 모드면 채우고, repairer가 있으면 장소 단위로 고친 뒤)
+        검증해 on_day(일차 번호, 일차)로 즉시 전달. 전체 텍스트 반환
+        """
+        parser = ItineraryStreamParser()
+        started = time.monotonic()
+        day_no = 0
+        for chunk in self._stream_text(prompt):
+            for day_plan in parser.feed(chunk):
+                day_no += 1
+                if codec is not None:
+                    day_plan = codec.hydrate_day(day_plan)
+                if repairer is not None:
+                    day_plan = repairer.repair_day(day_plan, day_no)
+                if day_plan is not None and self._validate_day(day_plan, day_no):
+                    logger.info(f"   📦 {day_no}일차 수신 ({time.monotonic() - started:.1f}초)")
+                    on_day(day_no, day_plan)
+        return parser.text
 
     # --- 외부 진입점 (반드시 클래스 내부 메서드로 유지!) ---
-    def generate_itinerary(self, trip_data: Dict[str, Any]) -> Union[Dict, None]:
-        """일정 생성 with 재시도 + Rate Limit 처리"""
+    def generate_itinerary(
+        self,
+        trip_data: Dict[str, Any],
+        progress: Union[Callable[[str, str], None], None] = None,
+        on_day: Union[Callable[[int, Dict[str, Any]], None], None] = None,
+    ) -> Union[Dict, None]:
+        """
+        일정 생성 with 재시도 + Rate Limit 처리. progress(stage, message)로 단계 보고 (비동기 작업용).
+        on_day가 있으면 스트리밍으로 받아 검증된 일차를 완성되는 대로 on_day(일차 번호, 일차)로 전달
+        (재시도 시 같은 번호로 다시 전달될 수 있음). 반환값은 전체 응답 검증 후의 최종 일정.
+        """
+        report = progress or (lambda stage, message: None)
         logger.info("=" * 60)
         logger.info("🚀 일정 생성 시작")
         logger.info(f"   기간: {trip_data.get('start')} ~ {trip_data.get('end')}")
@@ -393,47 +736,77 @@ class GeminiService:
         max_retries = 3
 
         # 후보 데이터 준비
+        report("candidates", "여행 조건에 맞는 장소를 고르고 있어요.")
         try:
-            master = _load_master_df()
+            snapshot = self.catalog.snapshot()
+
+            profile = self._trip_profile(snapshot, trip_data)
+            if profile is not None:
+                cached = self.profile_cache.get(profile, trip_data["start"])
+                if cached is not None:
+                    logger.info("   ⚡ 동등 프로필 일정 재사용 (날짜만 재배치) → Gemini 호출 생략")
+                    return cached
+
+            if not self.model_name:
+                self.model_name = self._pick_model_name()
+            max_candidates, keyword_chars = self._budget_prompt(snapshot, trip_data)
+
             candidates = _filter_candidates(
-                master, trip_data.get("themes", []), trip_data.get("days", 1)
+                snapshot.df,
+                trip_data.get("themes", []),
+                trip_data.get("days", 1),
+                snapshot.index("keywords"),
+                snapshot.index("spatial"),
+                snapshot.index("festivals"),
+                trip_data.get("start"),
+                trip_data.get("end"),
+                max_candidates,
             )
         except Exception as e:
             logger.error(f"❌ 데이터 로드 실패: {e}")
             import traceback; traceback.print_exc()
             return None
 
+        # 스트리밍이면 로컬 초안을 먼저 보여준다 (Gemini가 만든 일차가 도착하면 같은 번호로 교체)
+        if on_day is not None and Config.LOCAL_DRAFT:
+            draft = self._local_plan(trip_data, candidates)
+            for day_no, day_plan in enumerate(draft["itinerary"], 1):
+                if day_plan["places"] and self._validate_day(day_plan, day_no):
+                    on_day(day_no, day_plan)
+
+        # 여러 날 일정은 일차별 군집 프롬프트로 나눠 동시에 생성 (실패하면 아래 단일 요청으로 진행)
+        if Config.PLANNER_MODE == "parallel" and int(trip_data.get("days") or 1) > 1:
+            result = self._generate_parallel(trip_data, candidates, report, on_day, keyword_chars)
+            if result is not None and self._validate_itinerary(result, trip_data):
+                if profile is not None:
+                    self.profile_cache.put(profile, result)
+                logger.info("🎉 일정 생성 완료! (일차별 병렬)")
+                return result
+            logger.warning("   🔁 병렬 생성 실패 → 단일 요청으로 재시도")
+
+        # 프롬프트는 시도마다 같으므로 한 번만 생성하고, 같은 요청의 검증된 응답이 있으면 바로 반환
+        logger.info("   📝 프롬프트 생성 중.")
+        codec = self._codec(candidates, keyword_chars)
+        prompt = PromptTemplates.get_itinerary_prompt(trip_data, candidates, codec, keyword_chars)
+        logger.info(f"   ✅ 프롬프트 생성 완료 (길이: {len(prompt)}자)")
+
+        cache_key = response_key(self.model_name, self.generation_config, prompt)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("   ⚡ 응답 캐시 적중 → Gemini 호출 생략")
+            return cached
+
         for attempt in range(max_retries):
             try:
                 logger.info(f"\n🔄 시도 {attempt + 1}/{max_retries}")
 
-                if attempt > 0:
-                    wait_time = 35
-                    logger.info(f"   ⏳ Rate limit 대기 중. ({wait_time}초)")
-                    time.sleep(wait_time)
-
-                logger.info("   📝 프롬프트 생성 중.")
-                prompt = PromptTemplates.get_itinerary_prompt(trip_data, candidates)
-                logger.info(f"   ✅ 프롬프트 생성 완료 (길이: {len(prompt)}자)")
-
                 logger.info("   🤖 Gemini 호출 중...")
-                if self._use_sdk:
-                    if not self.model_name:
-                        self.model_name = self._pick_model_name()
-                    sdk_model = self.model_name.replace("models/", "")
-                    try:
-                        model = genai.GenerativeModel(
-                            sdk_model, generation_config=self.generation_config
-                        )
-                        response = model.generate_content(prompt)
-                        response_text = getattr(response, "text", "")
-                        logger.info(f"   ✅ SDK 응답 (길이: {len(response_text)}자)")
-                    except Exception as e:
-                        logger.error(f"   ❌ SDK 호출 실패: {e}")
-                        logger.info("   🔁 REST(v1)로 폴백")
-                        response_text = self._rest_generate_content(prompt)
+                report("llm", f"AI가 일정을 작성하고 있어요. ({attempt + 1}/{max_retries})")
+                if on_day is not None and Config.GEMINI_STREAM:
+                    response_text = self._collect_stream(prompt, on_day, codec, self._repairer(candidates))
+                    logger.info(f"   ✅ 스트림 응답 완료 (길이: {len(response_text)}자)")
                 else:
-                    response_text = self._rest_generate_content(prompt)
+                    response_text = self._call_model(prompt)
 
                 logger.info("   📄 응답 내용 (처음 1000자):")
                 logger.info("-" * 60)
@@ -441,7 +814,9 @@ class GeminiService:
                 logger.info("-" * 60)
 
                 logger.info("   🔍 응답 파싱 중.")
-                result = self._parse_response(response_text)
+                result, cut_depth = self._parse_response(response_text)
+                if codec is not None:
+                    result = codec.hydrate(result)
                 if not result:
                     logger.warning("   ❌ 파싱 실패 - 재시도")
                     continue
@@ -456,8 +831,13 @@ class GeminiService:
                         logger.info(f"        {i}일차: {len(day.get('places', []))}개 장소")
 
                 logger.info("   🔍 일정 검증 중.")
-                if self._validate_itinerary(result, trip_data):
+                report("validating", "일정을 검토하고 있어요.")
+                result = self._repair_and_fill(trip_data, candidates, result, keyword_chars, cut_depth=cut_depth)
+                if result is not None and self._validate_itinerary(result, trip_data):
                     logger.info("   ✅ 검증 성공!")
+                    self.response_cache.put(cache_key, result, model=self.model_name)
+                    if profile is not None:
+                        self.profile_cache.put(profile, result)
                     logger.info("=" * 60)
                     logger.info("🎉 일정 생성 완료!")
                     logger.info("=" * 60)
@@ -465,17 +845,20 @@ class GeminiService:
                 else:
                     logger.warning("   ❌ 검증 실패, 재시도.")
 
+            except RateLimited as e:
+                logger.warning(f"   ⚠️ API Rate Limit 도달: {e}")
+                delay = backoff_delay(attempt, retry_after=e.retry_after)
+                if attempt < max_retries - 1 and delay <= Config.RATE_LIMIT_MAX_WAIT:
+                    logger.info(f"   ⏳ {delay:.1f}초 대기 후 재시도.")
+                    time.sleep(delay)
+                    continue
+                logger.warning("   🔄 쿼터 대기 한도 초과 → Fallback 일정 생성.")
+                return self._get_fallback_itinerary(trip_data, candidates)
+
             except Exception as e:
                 error_msg = str(e)
                 logger.error(f"   ❌ 오류 발생: {type(e).__name__}: {error_msg}")
 
-                if "429" in error_msg or "ResourceExhausted" in error_msg:
-                    logger.warning("   ⚠️ API Rate Limit 도달")
-                    if attempt < max_retries - 1:
-                        logger.info("   ⏳ 35초 대기 후 재시도.")
-                        time.sleep(35)
-                        continue
-
                 import traceback; traceback.print_exc()
 
                 if attempt == max_retries - 1:
@@ -485,39 +868,229 @@ class GeminiService:
         logger.error("❌ 모든 시도 실패")
         return self._get_fallback_itinerary(trip_data, candidates)
 
-    # --- 응답 파싱 ---
-    def _parse_response(self, text: str) -> Union[Dict[str, Any], None]:
-        try:
-            if not text or not text.strip():
-                logger.error("      ❌ 응답이 비어있음(response_text=''). 모델이 텍스트를 생성하지 않았습니다.")
-                return None
+    @staticmethod
+    def _codec(candidates: pd.DataFrame, keyword_chars: int = COMPACT_KEYWORD_CHARS) -> Union[CandidateCodec, None]:
+        """압축 프롬프트 모드면 후보 id 코덱 (응답의 id를 카탈로그 값으로 채울 때도 사용)"""
+        return CandidateCodec(candidates, keyword_chars) if Config.PROMPT_MODE == "compact" else None
+
+    def _repairer(self, candidates: pd.DataFrame) -> ItineraryRepairer:
+        """장소 단위 수리기: 카탈로그 이름 인덱스로 장소를 실제 행에 붙여 정본 값으로 덮어씀"""
+        snapshot = self.catalog.snapshot()
+        return ItineraryRepairer(candidates, snapshot.index("names"), snapshot.df)
+
+    # --- 입력 토큰 예산 ---
+    def _budget_prompt(self, snapshot, trip_data: Dict[str, Any]) -> tuple:
+        """
+        (후보 수 상한, 키워드 길이): 후보를 뺀 프롬프트 길이와 카탈로그 후보 한 줄 평균 길이로
+        모델별 입력 토큰 예산(PROMPT_TOKEN_BUDGET)에 맞춘다. 병렬 모드면 일차 프롬프트 기준.
+        """
+        days = int(trip_data.get("days") or 1)
+        compact = Config.PROMPT_MODE == "compact"
+        max_snippet = COMPACT_KEYWORD_CHARS if compact else VERBOSE_KEYWORD_CHARS
+        empty = snapshot.df.iloc[0:0]
+        codec = self._codec(empty)
+        parallel = Config.PLANNER_MODE == "parallel" and days > 1
+        if parallel:
+            template = PromptTemplates.get_day_prompt(trip_data, empty, days, trip_data.get("start", ""), codec)
+        else:
+            template = PromptTemplates.get_itinerary_prompt(trip_data, empty, codec)
+
+        max_candidates, keyword_chars = self.prompt_budget.plan(
+            self.model_name,
+            len(template),
+            snapshot.index("line_stats"),
+            days,
+            default_max_candidates(days),
+            max_snippet,
+            compact,
+            requests=days if parallel else 1,
+        )
+        logger.info(
+            f"   🧮 토큰 예산 {self.prompt_budget.budget(self.model_name)} → 후보 최대 {max_candidates}개, "
+            f"키워드 {keyword_chars}자 (글자/토큰 {self.token_estimator.ratio(self.model_name):.2f})"
+        )
+        return max_candidates, keyword_chars
+
+    # --- 일차별 병렬 생성 ---
+    def _generate_day(
+        self,
+        trip_data: Dict[str, Any],
+        cluster: pd.DataFrame,
+        day: int,
+        date: str,
+        keyword_chars: int,
+    ) -> Union[Dict[str, Any], None]:
+        """군집 후보로 하루 일정 1건 생성 (일차 프롬프트별 응답 캐시, 실패 시 PARALLEL_DAY_RETRIES회 재시도)"""
+        if cluster.empty:
+            logger.warning(f"   ⚠️ {day}일차 후보 없음")
+            return None
 
-            text = text.strip()
-            logger.info(f"      응답 시작 부분: {text[:200]}.")
+        codec = self._codec(cluster, keyword_chars)
+        prompt = PromptTemplates.get_day_prompt(trip_data, cluster, day, date, codec, keyword_chars)
+        cache_key = response_key(self.model_name, self.generation_config, prompt)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"   ⚡ {day}일차 응답 캐시 적중")
+            return cached
 
-            # ```json ... ``` 제거
-            json_match = re.search(r"```(?:json)?\s*(\{.*\})\s*```", text, re.DOTALL)
-            if json_match:
-                text = json_match.group(1)
-                logger.info("      ✅ Markdown 코드 블록 제거")
+        for attempt in range(1 + Config.PARALLEL_DAY_RETRIES):
+            try:
+                logger.info(f"   🤖 {day}일차 생성 요청 (후보 {len(cluster)}곳, 시도 {attempt + 1})")
+                result, _ = self._parse_response(self._call_model(prompt))
+                if codec is not None:
+                    result = codec.hydrate(result)
+            except RateLimited as e:
+                logger.warning(f"   ⚠️ {day}일차 쿼터 초과: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"   ❌ {day}일차 호출 실패: {type(e).__name__}: {e}")
+                continue
 
-            # 첫 번째 {} 블록만 추출
-            json_match = re.search(r"\{.*\}", text, re.DOTALL)
-            if json_match:
-                text = json_match.group(0)
+            days = (result or {}).get("itinerary") if isinstance(result, dict) else None
+            day_plan = days[0] if isinstance(days, list) and days else None
+            if day_plan is not None:
+                day_plan = self._repairer(cluster).repair_day(day_plan, day)
+            if day_plan is not None and self._validate_day(day_plan, day):
+                day_plan = {**day_plan, "day": day, "date": date}
+                if result.get("summary"):
+                    day_plan.setdefault("summary", result["summary"])
+                self.response_cache.put(cache_key, day_plan, model=self.model_name)
+                return day_plan
+            logger.warning(f"   ❌ {day}일차 결과 검증 실패")
+        return None
+
+    def _generate_parallel(
+        self,
+        trip_data: Dict[str, Any],
+        candidates: pd.DataFrame,
+        report: Callable[[str, str], None],
+        on_day: Union[Callable[[int, Dict[str, Any]], None], None],
+        keyword_chars: int,
+    ) -> Union[Dict[str, Any], None]:
+        """
+        후보를 일차별 지리 군집으로 나눠 하루씩 동시에 생성(최대 PARALLEL_DAY_CONCURRENCY개) 후 병합.
+        소요 시간은 가장 느린 하루 기준, 하루 응답이 짧아 출력 토큰 한도로 잘리지 않는다.
+        """
+        import datetime
 
-            data = json.loads(text)
-            logger.info("      ✅ JSON 파싱 성공")
-            return data
+        days = int(trip_data["days"])
+        start = datetime.datetime.strptime(trip_data["start"], "%Y-%m-%d").date()
+        dates = [(start + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+        clusters = cluster_candidates(candidates, days)
+        logger.info(f"   🗺️ 일차별 군집: {[len(c) for c in clusters]}곳")
+        report("llm", f"AI가 {days}일 일정을 하루씩 동시에 작성하고 있어요.")
+
+        day_plans: List[Union[Dict[str, Any], None]] = [None] * days
+        workers = max(1, min(Config.PARALLEL_DAY_CONCURRENCY, days))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="day-plan") as pool:
+            futures = {
+                pool.submit(self._generate_day, trip_data, clusters[i], i + 1, dates[i], keyword_chars): i
+                for i in range(days)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                day_plans[i] = future.result()
+                if day_plans[i] is not None and on_day is not None:
+                    on_day(i + 1, day_plans[i])
+
+        summaries = [p.pop("summary", None) for p in day_plans if p]
+        summary = next((s for s in summaries if s), None) or (
+            f"{(trip_data.get('emotions') or ['여유로운'])[0]} 부산 여행 일정입니다."
+        )
+        result = merge_days(day_plans, trip_data["start"], summary)
+        if result is None:
+            failed = [i + 1 for i, p in enumerate(day_plans) if not p]
+            logger.warning(f"   ❌ 병렬 생성 병합 실패 (실패 일차: {failed or '중복 제거 후 빈 일차'})")
+        return result
+
+    def _repair_and_fill(
+        self,
+        trip_data: Dict[str, Any],
+        candidates: pd.DataFrame,
+        result: Union[Dict[str, Any], None],
+        keyword_chars: int,
+        cut_depth: int = 0,
+    ) -> Union[Dict[str, Any], None]:
+        """
+        응답 일정 → 장소 단위로 검사/수리(ItineraryRepairer). 복구할 수 없는 일차와 (잘린 응답이면)
+        빠진 일차만 아직 안 쓴 후보의 지리 군집으로 하루씩 다시 생성해 병합한다.
+        cut_depth — extract_json의 절단 깊이. 마지막 일차 안에서 잘렸을 때(ITINERARY_DEPTH 초과)만 그 일차를 버린다.
+        전체를 다시 요청하지 않는다. 살릴 일차가 하나도 없거나 채우지 못하면 None.
+        """
+        import datetime
 
-        except json.JSONDecodeError as e:
-            logger.error(f"      ❌ JSON 파싱 실패: {e}")
-            logger.error(f"      문제 위치: line {e.lineno}, col {e.colno}")
+        days = int(trip_data["days"])
+        itinerary = result.get("itinerary") if isinstance(result, dict) else None
+        if not isinstance(itinerary, list):
             return None
-        except Exception as e:
-            logger.error(f"      ❌ 예상치 못한 오류: {e}")
+        if cut_depth > ITINERARY_DEPTH:
+            itinerary = itinerary[:-1]
+
+        repairer = self._repairer(candidates)
+        day_plans = [repairer.repair_day(d, i) for i, d in enumerate(itinerary[:days], 1)]
+        day_plans += [None] * (days - len(day_plans))
+        missing = [i + 1 for i, p in enumerate(day_plans) if p is None]
+        if len(missing) == days:
+            logger.warning("   ❌ 살릴 수 있는 일차 없음")
             return None
 
+        if missing:
+            logger.info(f"   🩹 {days - len(missing)}일치 유지, {missing}일차만 다시 생성")
+            used = {name_key(p["name"]) for d in day_plans if d for p in d["places"]}
+            remaining = candidates[[name_key(n) not in used for n in candidates["name"]]].reset_index(drop=True)
+            clusters = cluster_candidates(remaining, len(missing))
+            start = datetime.datetime.strptime(trip_data["start"], "%Y-%m-%d").date()
+            dates = [(start + datetime.timedelta(days=d - 1)).strftime("%Y-%m-%d") for d in missing]
+
+            workers = max(1, min(Config.PARALLEL_DAY_CONCURRENCY, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="day-plan") as pool:
+                filled = list(pool.map(
+                    lambda args: self._generate_day(trip_data, args[0], args[1], args[2], keyword_chars),
+                    zip(clusters, missing, dates),
+                ))
+            for day, day_plan in zip(missing, filled):
+                if day_plan:
+                    day_plan.pop("summary", None)
+                day_plans[day - 1] = day_plan
+
+        summary = result.get("summary") or f"{(trip_data.get('emotions') or ['여유로운'])[0]} 부산 여행 일정입니다."
+        return merge_days(day_plans, trip_data["start"], summary)
+
+    # --- 여행 프로필 (일정 재사용 키) ---
+    @staticmethod
+    def _trip_profile(snapshot, trip_data: Dict[str, Any]) -> Union[Dict[str, Any], None]:
+        """
+        정규화된 프로필 + 날짜에 따라 달라지는 조건(기간 내 축제 집합)과 카탈로그 버전.
+        시작/종료일이 없으면 재배치할 수 없으므로 None.
+        """
+        start, end = trip_data.get("start"), trip_data.get("end")
+        if not start or not end:
+            return None
+        try:
+            festivals = snapshot.index("festivals").in_season(start, end)
+        except ValueError:
+            return None
+        context = {"catalog": snapshot.digest, "festivals": festivals.tolist()}
+        return canonical_profile(trip_data, context)
+
+    # --- 응답 파싱 ---
+    def _parse_response(self, text: str) -> Tuple[Union[Dict[str, Any], None], int]:
+        """
+        응답 텍스트 → (JSON 객체, 절단 깊이). 코드 블록/앞뒤 설명문/주석/trailing comma는 무시하고,
+        출력이 잘렸으면 마지막 완성된 일차/장소 경계까지 살린다 (절단 깊이 > 0 → 빠진 일차는 _repair_and_fill로 채움)
+        """
+        if not text or not text.strip():
+            logger.error("      ❌ 응답이 비어있음(response_text=''). 모델이 텍스트를 생성하지 않았습니다.")
+            return None, 0
+
+        logger.info(f"      응답 시작 부분: {text.strip()[:200]}.")
+        data, cut_depth = extract_json(text, openers="{")
+        if data is None:
+            logger.error("      ❌ JSON 파싱 실패: 응답에서 JSON 객체를 찾지 못함")
+            return None, 0
+        logger.info("      ✅ JSON 파싱 성공" + (" (잘린 응답 복구)" if cut_depth else ""))
+        return data, cut_depth
+
     # --- 결과 검증 ---
     def _validate_itinerary(self, data: Dict[str, Any], trip_data: Dict[str, Any]) -> bool:
         if not isinstance(data, dict):
@@ -536,83 +1109,48 @@ class GeminiService:
             logger.error(f"      ❌ 일수 불일치: {len(itinerary)} != {trip_data['days']}")
             return False
 
-        def hhmm_ok(s):
-            return isinstance(s, str) and len(s) == 5 and s[2] == ":" and s[:2].isdigit() and s[3:].isdigit()
-
         for i, day_plan in enumerate(itinerary, 1):
-            if not isinstance(day_plan, dict):
-                logger.error(f"      ❌ {i}일차가 dict가 아님"); return False
+            if not self._validate_day(day_plan, i):
+                return False
 
-            places = day_plan.get("places", [])
-            if not isinstance(places, list) or not places:
-                logger.error(f"      ❌ {i}일차 장소가 비어있음"); return False
+        logger.info(f"      ✅ 모든 검증 통과 ({len(itinerary)}일)")
+        return True
 
-            for j, place in enumerate(places, 1):
-                required = ["name","address","latitude","longitude","start_time","end_time","category","duration","reason"]
-                missing = [k for k in required if k not in place]
-                if missing:
-                    logger.error(f"      ❌ {i}일차 {j}번째 장소에 필수 필드 누락: {missing}")
-                    return False
+    @staticmethod
+    def _validate_day(day_plan: Dict[str, Any], i: int) -> bool:
+        """일차 하나 검증 (스트리밍 중 일차별 전달에도 사용). 장소별 스키마 위반 필드를 기록"""
+        if not isinstance(day_plan, dict):
+            logger.error(f"      ❌ {i}일차가 dict가 아님"); return False
 
-                if not hhmm_ok(place["start_time"]) or not hhmm_ok(place["end_time"]):
-                    logger.error(f"      ❌ {i}일차 {j}번째 장소의 시간 형식 오류"); return False
+        places = day_plan.get("places", [])
+        if not isinstance(places, list) or not places:
+            logger.error(f"      ❌ {i}일차 장소가 비어있음"); return False
 
-                try:
-                    float(place["latitude"]); float(place["longitude"])
-                except Exception as e:
-                    logger.error(f"      ❌ {i}일차 {j}번째 장소의 좌표 형식 오류: {e}"); return False
-
-        logger.info(f"      ✅ 모든 검증 통과 ({len(itinerary)}일)")
-        return True
+        ok = True
+        for j, place in enumerate(places, 1):
+            violations = place_violations(place)
+            if violations:
+                logger.error(f"      ❌ {i}일차 {j}번째 장소 스키마 위반: {violations}")
+                ok = False
+        return ok
 
     # --- 폴백 ---
-    def _get_fallback_itinerary(self, trip_data: Dict[str, Any], candidates: pd.DataFrame) -> Dict[str, Any]:
+    def _local_plan(self, trip_data: Dict[str, Any], candidates: pd.DataFrame) -> Dict[str, Any]:
+        """로컬 플래너 일정 (후보가 모자란 일차는 카탈로그에서 보충, 여행 기간 밖 축제는 제외)"""
+        snapshot = self.catalog.snapshot()
+        blocked = snapshot.index("festivals").blocked_mask(trip_data.get("start"), trip_data.get("end"))
+        return self.local_planner.plan(trip_data, candidates, snapshot.df, snapshot.index("spatial"), blocked)
+
+    def _get_fallback_itinerary(self, trip_data: Dict[str, Any], candidates: pd.DataFrame) -> Union[Dict[str, Any], None]:
+        """Gemini 없이 로컬 플래너로 만든 일정 (식사 시간대/반경/마지막 날 종료/중복 규칙 준수). 검증 실패 시 None"""
         logger.warning("🔄 Fallback 일정 생성")
-        import datetime
-
-        start_date = datetime.datetime.strptime(trip_data["start"], "%Y-%m-%d")
-        places_per_day = min(6, max(1, len(candidates) // max(trip_data["days"], 1)))
-        itinerary: List[Dict[str, Any]] = []
-
-        for day_num in range(trip_data["days"]):
-            current_date = start_date + datetime.timedelta(days=day_num)
-            start_idx = day_num * places_per_day
-            end_idx = start_idx + places_per_day
-            sample_places = candidates.iloc[start_idx:end_idx].to_dict("records")
-
-            base_places: List[Dict[str, Any]] = []
-            current_time = datetime.time(9, 0)
-
-            for place in sample_places:
-                start = current_time.strftime("%H:%M")
-                duration = 90 if place["category"] == "식당" else 60
-                end_time = (datetime.datetime.combine(datetime.date.today(), current_time)
-                            + datetime.timedelta(minutes=duration)).time()
-
-                base_places.append({
-                    "name": place["name"],
-                    "address": place["address"],
-                    "latitude": float(place["latitude"]),
-                    "longitude": float(place["longitude"]),
-                    "start_time": start,
-                    "end_time": end_time.strftime("%H:%M"),
-                    "duration": duration,
-                    "category": place["category"],
-                    "reason": f"{place['category']} 추천 장소입니다.",
-                })
-
-                current_time = (datetime.datetime.combine(datetime.date.today(), end_time)
-                                + datetime.timedelta(minutes=30)).time()
-
-            itinerary.append({
-                "day": day_num + 1,
-                "date": current_date.strftime("%Y-%m-%d"),
-                "title": f"{day_num + 1}일차 일정",
-                "places": base_places,
-            })
-
-        logger.info(f"✅ Fallback 일정 생성 완료 ({len(itinerary)}일)")
-        return {
-            "summary": f"{(trip_data.get('emotions') or ['여유로운'])[0]} 부산 여행 일정입니다.",
-            "itinerary": itinerary,
-        }
+        started = time.perf_counter()
+        result = self._local_plan(trip_data, candidates)
+        if not self._validate_itinerary(result, trip_data):
+            logger.error("❌ Fallback 일정 검증 실패")
+            return None
+        logger.info(
+            f"✅ Fallback 일정 생성 완료 ({len(result['itinerary'])}일, "
+            f"{sum(len(d['places']) for d in result['itinerary'])}곳, {(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+        return result
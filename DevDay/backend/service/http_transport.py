@@ -0,0 +1,95 @@
+import logging
+import threading
+from typing import Any, Dict, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_TRANSPORT = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+class HttpTransport:
+    """
+    keep-alive 연결 풀을 공유하는 HTTP 전송 계층.
+    - requests.Session 하나를 모든 스레드가 공유 (urllib3 연결 풀은 스레드 안전)
+    - 호스트당 pool_maxsize개 연결 유지, 풀이 차면 새 연결을 만들지 않고 기다린다(block)
+    - 연결/응답 대기 타임아웃 분리 (연결이 안 되면 빨리 실패, 생성 응답은 길게 기다림)
+    재시도는 호출하는 쪽(모델/페이로드 순회)이 담당하므로 어댑터 재시도는 끈다.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+    ):
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def request(self, method: str, url: str, timeout: Union[float, Tuple[float, float], None] = None, **kwargs) -> requests.Response:
+        """timeout을 생략하면 (connect, read) 기본값 사용"""
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """호스트별 요청 수 / 새 연결 수 (requests - connections = 재사용된 연결로 보낸 요청)"""
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "requests": pool.num_requests,
+                "connections": pool.num_connections,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+            }
+        total_requests = sum(h["requests"] for h in hosts.values())
+        total_connections = sum(h["connections"] for h in hosts.values())
+        reused = max(total_requests - total_connections, 0)
+        return {
+            "requests": total_requests,
+            "connections": total_connections,
+            "reused": reused,
+            "reuse_rate": round(reused / total_requests, 4) if total_requests else 0.0,
+            "hosts": hosts,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def get_transport(
+    pool_maxsize: int = 16,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 60.0,
+) -> HttpTransport:
+    """프로세스 전역 전송 계층 (최초 호출 시 생성)"""
+    global _TRANSPORT
+    if _TRANSPORT is None:
+        with _TRANSPORT_LOCK:
+            if _TRANSPORT is None:
+                _TRANSPORT = HttpTransport(
+                    pool_maxsize=pool_maxsize,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                )
+                logger.info(f"🔌 HTTP 연결 풀 생성 (호스트당 최대 {pool_maxsize}개, 타임아웃 {connect_timeout:g}s/{read_timeout:g}s)")
+    return _TRANSPORT
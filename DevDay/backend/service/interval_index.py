@@ -0,0 +1,123 @@
+import datetime
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from backend.data.festival_dates import ANNUAL_YEAR
+
+_EMPTY_ROWS = np.zeros(0, dtype=np.int64)
+
+DateLike = Union[str, datetime.date, pd.Timestamp]
+
+
+def _day(value: DateLike) -> int:
+    """날짜 → 일 단위 정수 (proleptic ordinal)"""
+    return pd.Timestamp(value).date().toordinal()
+
+
+class IntervalIndex:
+    """
+    닫힌 구간 [start, end] 집합 (일 단위 정수).
+    시작일 기준 정렬 배열 + 최장 구간 길이로, 겹침 질의는 searchsorted 두 번으로 자른
+    시작일 창(start ∈ [lo - max_len, hi]) 안에서만 종료일을 확인한다.
+    """
+
+    def __init__(self, starts, ends, rows):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.rows = np.asarray(rows, dtype=np.int64)[order]
+        self.max_len = int((self.ends - self.starts).max()) if len(self.starts) else 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, lo: int, hi: int) -> np.ndarray:
+        """[lo, hi]와 겹치는 구간의 행 id (오름차순, 중복 제거)"""
+        if not len(self.starts) or hi < lo:
+            return _EMPTY_ROWS
+        a = np.searchsorted(self.starts, lo - self.max_len, side="left")
+        b = np.searchsorted(self.starts, hi, side="right")
+        keep = self.ends[a:b] >= lo
+        return np.unique(self.rows[a:b][keep])
+
+
+class FestivalCalendar:
+    """
+    기간이 있는 장소(축제)의 날짜 인덱스.
+    - 연도가 있는 구간은 절대 날짜 인덱스에,
+    - '매년' 구간은 기준 연도(ANNUAL_YEAR)의 월/일 인덱스에 넣어(연말을 넘기면 둘로 분할) 함께 질의
+    gated — 날짜로 거를 대상 행 (축제이거나 기간이 파싱된 행). 기간을 알 수 없는 축제도 포함된다.
+    """
+
+    _year_first = datetime.date(ANNUAL_YEAR, 1, 1).toordinal()
+    _year_last = datetime.date(ANNUAL_YEAR, 12, 31).toordinal()
+
+    def __init__(self, starts, ends, annual, gated):
+        starts = pd.to_datetime(pd.Series(starts)).reset_index(drop=True)
+        ends = pd.to_datetime(pd.Series(ends)).reset_index(drop=True)
+        annual = np.asarray(annual, dtype=bool)
+        known = (starts.notna() & ends.notna()).to_numpy()
+
+        self.gated = np.asarray(gated, dtype=bool) | known
+
+        fixed = np.flatnonzero(known & ~annual)
+        self.fixed = IntervalIndex(
+            [d.toordinal() for d in starts[fixed].dt.date],
+            [d.toordinal() for d in ends[fixed].dt.date],
+            fixed,
+        )
+
+        a_starts, a_ends, a_rows = [], [], []
+        year_first, year_last = self._year_first, self._year_last
+        for r in np.flatnonzero(known & annual).tolist():
+            s, e = self._annual_day(starts[r]), self._annual_day(ends[r])
+            if (ends[r] - starts[r]).days >= 365:
+                spans = [(year_first, year_last)]
+            elif e >= s:
+                spans = [(s, e)]
+            else:
+                # 12월 → 2월처럼 해를 넘기는 구간
+                spans = [(s, year_last), (year_first, e)]
+            for lo, hi in spans:
+                a_starts.append(lo)
+                a_ends.append(hi)
+                a_rows.append(r)
+        self.annual = IntervalIndex(a_starts, a_ends, a_rows)
+
+    @staticmethod
+    def _annual_day(ts: pd.Timestamp) -> int:
+        return datetime.date(ANNUAL_YEAR, ts.month, ts.day).toordinal()
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "FestivalCalendar":
+        gated = (df["raw_type"] == "축제").to_numpy() if "raw_type" in df.columns else np.zeros(len(df), bool)
+        return cls(df["period_start"], df["period_end"], df["period_annual"], gated)
+
+    def in_season(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """여행 기간 [start, end]와 겹치는 기간 행 id"""
+        lo, hi = _day(start), _day(end)
+        parts = [self.fixed.overlapping(lo, hi)]
+
+        if len(self.annual):
+            if hi - lo >= 365:
+                parts.append(self.annual.rows)
+            else:
+                s, e = pd.Timestamp(start), pd.Timestamp(end)
+                a_lo, a_hi = self._annual_day(s), self._annual_day(e)
+                if a_hi >= a_lo:
+                    parts.append(self.annual.overlapping(a_lo, a_hi))
+                else:
+                    parts.append(self.annual.overlapping(a_lo, self._year_last))
+                    parts.append(self.annual.overlapping(self._year_first, a_hi))
+        return np.unique(np.concatenate(parts))
+
+    def blocked_mask(self, start: Union[DateLike, None], end: Union[DateLike, None]) -> np.ndarray:
+        """여행 기간 밖(또는 기간 미상)이라 후보에서 뺄 행 마스크. 여행 날짜가 없으면 날짜 대상 행 전부"""
+        blocked = self.gated.copy()
+        if start and end:
+            blocked[self.in_season(start, end)] = False
+        return blocked
@@ -0,0 +1,211 @@
+import logging
+import re
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import pandas as pd
+
+from backend.data.popularity import name_key
+from backend.services.name_index import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# 수리 후 장소가 이보다 적은 일차는 복구 불가 (해당 일차만 다시 생성)
+MIN_PLACES_PER_DAY = 3
+
+# 카탈로그 정본 값으로 항상 덮어쓰는 필드 (모델이 옮겨 적은 값은 믿지 않음)
+GROUNDED_FIELDS = ("name", "address", "latitude", "longitude", "category")
+
+# "9:00", "09:00:00", "9시", "9시 30분", "9.30" → (시, 분)
+_TIME_RE = re.compile(r"^\s*(\d{1,2})\s*(?::|시|\.)\s*(?:(\d{1,2})\s*분?)?\s*(?::\d{2})?\s*$")
+
+
+def _text_ok(v: Any) -> bool:
+    return isinstance(v, str) and v.strip() != "" and v.strip().lower() not in ("null", "nan", "none")
+
+
+def _number_ok(v: Any) -> bool:
+    try:
+        return v is not None and not isinstance(v, bool) and float(v) == float(v)
+    except (TypeError, ValueError):
+        return False
+
+
+def _hhmm_ok(v: Any) -> bool:
+    return isinstance(v, str) and len(v) == 5 and v[2] == ":" and v[:2].isdigit() and v[3:].isdigit() \
+        and int(v[:2]) < 24 and int(v[3:]) < 60
+
+
+def _duration_ok(v: Any) -> bool:
+    return isinstance(v, int) and not isinstance(v, bool) and v > 0
+
+
+# 장소 스키마: 필드 → 검사 함수 (모듈 로드 시 한 번 튜플로 고정)
+PLACE_SCHEMA: Dict[str, Callable[[Any], bool]] = {
+    "name": _text_ok,
+    "address": _text_ok,
+    "latitude": _number_ok,
+    "longitude": _number_ok,
+    "start_time": _hhmm_ok,
+    "end_time": _hhmm_ok,
+    "category": _text_ok,
+    "duration": _duration_ok,
+    "reason": _text_ok,
+}
+_CHECKS: Tuple[Tuple[str, Callable[[Any], bool]], ...] = tuple(PLACE_SCHEMA.items())
+
+
+def place_violations(place: Any) -> List[str]:
+    """장소 하나의 스키마 위반 필드 목록 (없으면 빈 목록). 시간 역전은 'end_time'으로 보고"""
+    if not isinstance(place, dict):
+        return ["<not an object>"]
+    bad = [field for field, check in _CHECKS if not check(place.get(field))]
+    if "start_time" not in bad and "end_time" not in bad and place["end_time"] <= place["start_time"]:
+        bad.append("end_time")
+    return bad
+
+
+def record_violations(record: Dict[str, Any]) -> List[str]:
+    """카탈로그 행에서 그대로 가져오는 필드(GROUNDED_FIELDS)의 스키마 위반 목록 (빈 주소 등 일정에 쓸 수 없는 행)"""
+    return [field for field in GROUNDED_FIELDS if not PLACE_SCHEMA[field](record.get(field))]
+
+
+def normalize_time(v: Any) -> Union[str, None]:
+    """다양한 시각 표기 → "HH:MM" (해석할 수 없으면 None)"""
+    if not isinstance(v, str):
+        return None
+    m = _TIME_RE.match(v)
+    if not m:
+        return None
+    hour, minute = int(m.group(1)), int(m.group(2) or 0)
+    if hour > 23 or minute > 59:
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _minutes(hhmm: str) -> int:
+    return int(hhmm[:2]) * 60 + int(hhmm[3:])
+
+
+class ItineraryRepairer:
+    """
+    모델이 만든 일차를 장소 단위로 검사하고 고칠 수 있는 것은 로컬에서 고친다.
+    - names(카탈로그 이름 인덱스)가 있으면 장소명을 정확/퍼지 매칭으로 카탈로그 행에 붙이고
+      이름·주소·좌표·카테고리를 정본 값으로 덮어씀. 매칭되지 않는 장소는 지어낸 장소로 보고 제거
+    - candidates가 있으면 (정본 이름 기준) 후보 밖 장소도 제거: 기간 외 축제처럼 후보 필터가 뺀 곳이나
+      병렬 생성에서 다른 일차 군집에 배정된 곳을 모델이 다시 넣지 못하게
+    - 없으면 이름이 후보 목록에 있을 때 주소/좌표/카테고리를 후보 값으로 채움 (비었거나 형식이 틀린 경우)
+    - 시각은 "HH:MM"으로 정규화, 종료 시각이 없으면 duration으로 계산, duration은 항상 재계산
+    - reason이 비면 후보 키워드로 채움
+    고칠 수 없는 장소(시각 해석 불가, 좌표를 알 수 없음 등)와 같은 날 중복 장소는 제거.
+    """
+
+    def __init__(
+        self,
+        candidates: Union[pd.DataFrame, None] = None,
+        names: Union[NameIndex, None] = None,
+        catalog: Union[pd.DataFrame, None] = None,
+    ):
+        self.lookup: Dict[str, Dict[str, Any]] = {}
+        if candidates is not None and len(candidates):
+            for record in candidates.to_dict("records"):
+                self.lookup.setdefault(name_key(record.get("name")), record)
+        self.names = names if catalog is not None else None
+        self.catalog = catalog
+
+    def _ground(self, place: Dict[str, Any], fixed: List[str]) -> Union[Dict[str, Any], None]:
+        """카탈로그 행 레코드 (매칭 실패 시 None). 정본 값으로 place를 덮어쓰고 바뀐 필드를 fixed에 기록"""
+        row, score = self.names.match(place.get("name"), place.get("latitude"), place.get("longitude"))
+        if row is None:
+            return None
+        record = self.catalog.iloc[row].to_dict()
+        if score < 1.0:
+            logger.info(f"      🔗 '{place.get('name')}' → '{record['name']}' (유사도 {score:.2f})")
+        for field in GROUNDED_FIELDS:
+            if place.get(field) != record[field]:
+                place[field] = record[field]
+                fixed.append(field)
+        return record
+
+    def repair_place(self, place: Any) -> Tuple[Union[Dict[str, Any], None], List[str]]:
+        """(고친 장소, 고친 필드 목록) 또는 (None, 제거 사유)"""
+        if not isinstance(place, dict):
+            return None, ["형식"]
+        fixed: List[str] = []
+        place = dict(place)
+        if self.names is not None:
+            record = self._ground(place, fixed)
+            if record is None:
+                return None, ["카탈로그에 없음"]
+            if self.lookup and name_key(place["name"]) not in self.lookup:
+                return None, ["후보 밖"]
+        else:
+            record = self.lookup.get(name_key(place.get("name"))) if _text_ok(place.get("name")) else None
+
+        if record is not None:
+            for field in ("address", "category"):
+                if not _text_ok(place.get(field)) and _text_ok(record.get(field)):
+                    place[field] = record[field]
+                    fixed.append(field)
+            for field in ("latitude", "longitude"):
+                if not _number_ok(place.get(field)) and _number_ok(record.get(field)):
+                    place[field] = record[field]
+                    fixed.append(field)
+        for field in ("latitude", "longitude"):
+            if _number_ok(place.get(field)):
+                place[field] = float(place[field])
+
+        start = normalize_time(place.get("start_time"))
+        end = normalize_time(place.get("end_time"))
+        if end is None and start is not None and _number_ok(place.get("duration")) and float(place["duration"]) > 0:
+            total = _minutes(start) + int(float(place["duration"]))
+            end = f"{total // 60:02d}:{total % 60:02d}" if total < 24 * 60 else None
+        for field, value in (("start_time", start), ("end_time", end)):
+            if value is not None and value != place.get(field):
+                place[field] = value
+                fixed.append(field)
+        if start is not None and end is not None and end > start:
+            duration = _minutes(end) - _minutes(start)
+            if place.get("duration") != duration:
+                place["duration"] = duration
+                fixed.append("duration")
+
+        if not _text_ok(place.get("reason")):
+            keywords = str((record or {}).get("keywords") or "").strip()
+            place["reason"] = keywords[:60] if keywords else f"{place.get('category') or '추천'} 장소"
+            fixed.append("reason")
+
+        violations = place_violations(place)
+        if violations:
+            return None, violations
+        return place, fixed
+
+    def repair_day(self, day_plan: Any, day: int) -> Union[Dict[str, Any], None]:
+        """고친 일차 (시각 순 정렬, 같은 날 중복 제거). 남은 장소가 MIN_PLACES_PER_DAY 미만이면 None"""
+        if not isinstance(day_plan, dict) or not isinstance(day_plan.get("places"), list):
+            logger.warning(f"      ⚠️ {day}일차 형식 오류 → 복구 불가")
+            return None
+
+        places, seen, fixed_count, dropped = [], set(), 0, []
+        for j, raw in enumerate(day_plan["places"], 1):
+            place, notes = self.repair_place(raw)
+            if place is None:
+                dropped.append(f"{j}번째({', '.join(notes)})")
+                continue
+            key = name_key(place["name"])
+            if key in seen:
+                dropped.append(f"{j}번째(중복)")
+                continue
+            seen.add(key)
+            fixed_count += bool(notes)
+            places.append(place)
+        places.sort(key=lambda p: p["start_time"])
+
+        if fixed_count or dropped:
+            logger.info(
+                f"      🔧 {day}일차 장소 {len(day_plan['places'])}곳 중 수정 {fixed_count}, 제거 {len(dropped)}"
+                + (f": {'; '.join(dropped)}" if dropped else "")
+            )
+        if len(places) < MIN_PLACES_PER_DAY:
+            logger.warning(f"      ⚠️ {day}일차 유효 장소 {len(places)}곳 → 복구 불가")
+            return None
+        return {**day_plan, "places": places}
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 진행 보고 콜백: report(stage, message, data=None)
+Reporter = Callable[..., None]
+
+# 부분 결과(완성된 일차) 이벤트 단계
+DAY = "day"
+
+
+class Job:
+    """비동기 일정 생성 작업 1건 (진행 이벤트 로그 + 결과)"""
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.payload = payload
+        self.status = QUEUED
+        self.stage = QUEUED
+        self.events: List[Dict[str, Any]] = []
+        self.result: Union[Dict[str, Any], None] = None
+        self.error: Union[str, None] = None
+        self.created_at = time.time()
+        self.finished_at: Union[float, None] = None
+        self._cond = threading.Condition()
+        self._emit(QUEUED, "대기열에 등록되었습니다.")
+
+    def _emit(self, stage: str, message: str, data: Union[Dict[str, Any], None] = None) -> None:
+        with self._cond:
+            event = {"seq": len(self.events), "stage": stage, "message": message, "ts": time.time()}
+            if data is not None:
+                event["data"] = data
+            if stage != DAY:
+                self.stage = stage
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def _finish(self, status: str, result: Union[Dict[str, Any], None] = None, error: Union[str, None] = None) -> None:
+        with self._cond:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._emit(status, "완료되었습니다." if status == DONE else (error or "실패했습니다."))
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def wait_events(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """seq >= after인 이벤트 (없으면 새 이벤트나 timeout까지 대기)"""
+        with self._cond:
+            if len(self.events) <= after and not self.finished:
+                self._cond.wait(timeout)
+            return self.events[after:]
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "events": list(self.events),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result and self.status == DONE:
+            data["result"] = self.result
+        if self.status == FAILED:
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    일정 생성 작업 큐 (프로세스 내 스레드 풀).
+    HTTP 요청 스레드는 작업 id만 돌려주고 바로 반환, 파이프라인은 workers개 스레드가 실행한다.
+    완료된 작업은 ttl초 보관 후 정리 (보관 중 상태 조회/SSE 재연결 가능).
+    run(payload, report) — 결과 dict 반환, 예외/None이면 실패 처리.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Dict[str, Any], Reporter], Union[Dict[str, Any], None]],
+        workers: int = 4,
+        ttl: float = 600.0,
+    ):
+        self.run = run
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="itinerary-job")
+
+    def submit(self, payload: Dict[str, Any]) -> Job:
+        job = Job(payload)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._execute, job)
+        logger.info(f"📮 작업 등록: {job.id} (대기 {self.pending()}건)")
+        return job
+
+    def get(self, job_id: str) -> Union[Job, None]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _execute(self, job: Job) -> None:
+        job.status = RUNNING
+        job._emit(RUNNING, "일정 생성을 시작합니다.")
+        try:
+            result = self.run(job.payload, job._emit)
+        except Exception as e:
+            logger.exception(f"❌ 작업 실패: {job.id}")
+            job._finish(FAILED, error=f"{type(e).__name__}: {e}")
+            return
+        if not result:
+            job._finish(FAILED, error="일정 생성 실패")
+        else:
+            job._finish(DONE, result=result)
+
+    def _prune(self) -> None:
+        """보관 기간이 지난 완료 작업 정리 (_lock 보유 상태에서 호출)"""
+        cutoff = time.time() - self.ttl
+        expired = [jid for jid, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+    def stream(self, job: Job, after: int = 0, heartbeat: float = 15.0) -> Iterator[str]:
+        """SSE 스트림: 진행(progress)/완성된 일차(day) 이벤트 → 마지막에 done(result 포함) 또는 failed. 빈 구간에는 주석 heartbeat"""
+        seq = after
+        while True:
+            events = job.wait_events(seq, heartbeat)
+            if not events:
+                if not job.finished:
+                    yield ": keep-alive\n\n"
+                    continue
+                # 완료 이벤트까지 받은 뒤 재연결 → 완료 이벤트를 다시 보내고 종료 (대기 없이 빈 목록만 반복되지 않도록)
+                events = [event for event in job.events[-1:] if event["stage"] in (DONE, FAILED)]
+                if not events:
+                    continue  # 상태만 먼저 바뀐 순간 → 다음 wait_events가 _finish의 잠금을 기다린다
+            for event in events:
+                seq = event["seq"] + 1
+                name, data = "progress", event
+                if event["stage"] == DAY:
+                    name = DAY
+                elif event["stage"] == DONE:
+                    name, data = DONE, {**event, "result": job.result}
+                elif event["stage"] == FAILED:
+                    name, data = FAILED, {**event, "error": job.error}
+                yield f"id: {event['seq']}\nevent: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if name in (DONE, FAILED):
+                    return
@@ -0,0 +1,93 @@
+import json
+import logging
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ItineraryStreamParser:
+    """
+    스트리밍 응답 텍스트를 조금씩 받아, 최상위 객체의 "itinerary" 배열 원소(일차 객체)가
+    닫히는 즉시 하나씩 돌려주는 증분 파서.
+    - 문자열/이스케이프 상태와 괄호 깊이만 추적하므로 받은 문자는 한 번씩만 본다
+    - 첫 '{' 앞의 텍스트(```json 같은 코드 블록 표시)는 무시
+    전체 텍스트는 text에 모이므로 스트림이 끝난 뒤 기존 파서로 한 번 더 검증할 수 있다.
+    """
+
+    def __init__(self, key: str = "itinerary"):
+        self.key = key
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._str_start = 0
+        self._last_string: Union[str, None] = None
+        self._array_depth: Union[int, None] = None
+        self._array_done = False
+        self._item_start: Union[int, None] = None
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """chunk를 이어 붙이고 이번에 완성된 일차 객체들을 반환"""
+        if not chunk:
+            return []
+        self.text += chunk
+        text = self.text
+        stack = self._stack
+        done: List[Dict[str, Any]] = []
+
+        i = self._pos
+        n = len(text)
+        while i < n:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if len(stack) == 1:
+                        self._last_string = text[self._str_start + 1:i]
+                i += 1
+                continue
+
+            if not stack:
+                # 최상위 객체 시작 전 텍스트는 건너뜀
+                if c == "{":
+                    stack.append(c)
+            elif c == '"':
+                self._in_string = True
+                self._str_start = i
+            elif c == "{" or c == "[":
+                stack.append(c)
+                if c == "[" and len(stack) == 2 and self._last_string == self.key and not self._array_done:
+                    self._array_depth = 2
+                elif c == "{" and self._array_depth is not None and len(stack) == self._array_depth + 1:
+                    self._item_start = i
+            elif c == "}" or c == "]":
+                if c == "}" and self._item_start is not None and len(stack) == self._array_depth + 1:
+                    item = self._load(text[self._item_start:i + 1])
+                    self._item_start = None
+                    if item is not None:
+                        done.append(item)
+                stack.pop()
+                if c == "]" and self._array_depth is not None and len(stack) == self._array_depth - 1:
+                    # 배열 종료 (같은 키가 다시 나와도 무시)
+                    self._array_depth = None
+                    self._array_done = True
+            i += 1
+
+        self._pos = n
+        self.emitted += len(done)
+        return done
+
+    @staticmethod
+    def _load(fragment: str) -> Union[Dict[str, Any], None]:
+        try:
+            item = json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.warning(f"      ⚠️ 스트림 일차 객체 파싱 실패: {e}")
+            return None
+        return item if isinstance(item, dict) else None
@@ -0,0 +1,185 @@
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+# 매칭 위치별 가중치 (장소명 > 설명 키워드 > 단어 시작 일치 보너스)
+NAME_WEIGHT = 3
+KEYWORD_WEIGHT = 2
+TOKEN_BONUS = 1
+
+
+def normalize(text: str) -> str:
+    """NFC + 소문자 + 공백 1칸으로 정규화 (인덱스/질의 공통)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+def split_theme(theme: str) -> List[str]:
+    """'공방/체험' 같은 복합 테마를 개별 검색어로 분리"""
+    return [t for t in (normalize(p) for p in (theme or "").split("/")) if t]
+
+
+def _union(postings: Iterable[np.ndarray]) -> np.ndarray:
+    postings = [p for p in postings if len(p)]
+    if not postings:
+        return _EMPTY
+    if len(postings) == 1:
+        return postings[0]
+    return np.unique(np.concatenate(postings))
+
+
+def _postings(groups: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {k: np.asarray(v, dtype=np.int32) for k, v in groups.items()}
+
+
+class _GramPostings:
+    """
+    문자 n-gram(코드포인트 정수 키) → 행 id 포스팅 (CSR 형태).
+    행마다 파이썬 set을 만들지 않고 전체 코드포인트 배열에서 한 번에 정렬/중복 제거한다.
+    """
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray):
+        # rows는 이미 오름차순이므로 키 기준 안정 정렬만으로 (key, row) 순서가 된다
+        order = np.argsort(keys, kind="stable")
+        keys, rows = keys[order], rows[order]
+        if len(keys):
+            fresh = np.ones(len(keys), dtype=bool)
+            fresh[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+            keys, rows = keys[fresh], rows[fresh]
+        self.keys, self.starts = np.unique(keys, return_index=True)
+        self.ends = np.append(self.starts[1:], len(keys))
+        self.rows = rows.astype(np.int32)
+
+    def get(self, key: int) -> np.ndarray:
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return _EMPTY
+        return self.rows[self.starts[i]:self.ends[i]]
+
+
+def _gram_key(gram: str) -> int:
+    key = 0
+    for ch in gram:
+        key = (key << 21) | ord(ch)
+    return key
+
+
+class _FieldIndex:
+    """한 컬럼에 대한 n-gram / 토큰 역색인"""
+
+    def __init__(self, texts: Iterable[str]):
+        tokens: Dict[str, List[int]] = defaultdict(list)
+        self.texts: List[str] = [normalize(t) for t in texts]
+
+        for row_id, text in enumerate(self.texts):
+            for tok in set(_TOKEN_RE.findall(text)):
+                tokens[tok].append(row_id)
+
+        # 전체 텍스트를 코드포인트 배열로 이어 붙여 unigram/bigram 키를 벡터 연산으로 생성
+        lengths = np.fromiter((len(t) for t in self.texts), dtype=np.int64, count=len(self.texts))
+        codes = np.frombuffer("".join(self.texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        row_of = np.repeat(np.arange(len(self.texts), dtype=np.int64), lengths)
+        same_row = row_of[:-1] == row_of[1:]
+
+        self.unigrams = _GramPostings(codes, row_of)
+        self.bigrams = _GramPostings(((codes[:-1] << 21) | codes[1:])[same_row], row_of[:-1][same_row])
+        self.tokens = _postings(tokens)
+        self.token_keys = sorted(self.tokens)
+
+    def substring(self, term: str) -> np.ndarray:
+        """term을 부분문자열로 포함하는 행 id (bigram 교집합 → 후보만 원문 확인)"""
+        if not term:
+            return _EMPTY
+        if len(term) == 1:
+            return self.unigrams.get(_gram_key(term))
+
+        grams = {term[i:i + 2] for i in range(len(term) - 1)}
+        lists = [self.bigrams.get(_gram_key(g)) for g in grams]
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+
+        if len(term) == 2:
+            return rows
+        # bigram이 모두 있어도 연속이 아닐 수 있으므로 ('하하하' ⊄ '하하 호') 후보만 원문으로 확인
+        return np.asarray([r for r in rows if term in self.texts[r]], dtype=np.int32)
+
+    def token_prefix(self, term: str) -> np.ndarray:
+        """term으로 시작하는 토큰이 있는 행 id ('바다를', '바다가' 등 조사 붙은 형태 포함)"""
+        lo = bisect.bisect_left(self.token_keys, term)
+        hi = bisect.bisect_left(self.token_keys, term + "\U0010ffff")
+        if lo == hi:
+            return _EMPTY
+        if hi - lo == 1:
+            return self.tokens[self.token_keys[lo]]
+        return np.unique(np.concatenate([self.tokens[k] for k in self.token_keys[lo:hi]]))
+
+
+class KeywordIndex:
+    """
+    장소 카탈로그 역색인 (장소명 + 설명 키워드).
+    테마 매칭은 전체 행을 훑지 않고 포스팅 리스트 합집합으로 계산한다.
+    """
+
+    def __init__(self, names: Iterable[str], keywords: Iterable[str]):
+        self.name = _FieldIndex(names)
+        self.keywords = _FieldIndex(keywords)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "KeywordIndex":
+        return cls(df["name"].tolist(), df["keywords"].tolist())
+
+    def theme_scores(self, themes: Union[List[str], None]):
+        """
+        테마별 매칭 강도를 합산.
+        반환: (rows, rank, hits)
+          rows — 한 테마 이상 매칭된 행 id
+          rank — 행별 매칭 강도 합 (장소명 3 / 키워드 2 / 단어 시작 일치 +1, 테마마다 합산)
+          hits — 행별 매칭된 테마 수
+        """
+        per_theme: List[Dict[int, int]] = []
+        for theme in themes or []:
+            terms = split_theme(theme)
+            if not terms:
+                continue
+            name_rows = _union(self.name.substring(t) for t in terms)
+            keyword_rows = _union(self.keywords.substring(t) for t in terms)
+            token_rows = _union(
+                [self.name.token_prefix(t) for t in terms] + [self.keywords.token_prefix(t) for t in terms]
+            )
+
+            strength: Dict[int, int] = defaultdict(int)
+            for weight, rows in (
+                (NAME_WEIGHT, name_rows),
+                (KEYWORD_WEIGHT, keyword_rows),
+                (TOKEN_BONUS, token_rows),
+            ):
+                for r in rows.tolist():
+                    strength[r] += weight
+            per_theme.append(strength)
+
+        if not per_theme:
+            return _EMPTY, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+
+        rows = np.unique(np.fromiter((r for s in per_theme for r in s), dtype=np.int32))
+        rank = np.zeros(len(rows), dtype=np.int32)
+        hits = np.zeros(len(rows), dtype=np.int32)
+        pos = {r: i for i, r in enumerate(rows.tolist())}
+        for strength in per_theme:
+            for r, w in strength.items():
+                rank[pos[r]] += w
+                hits[pos[r]] += 1
+        return rows, rank, hits
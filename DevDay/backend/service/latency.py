@@ -0,0 +1,78 @@
+import bisect
+import math
+import threading
+from typing import Any, Dict, List, Union
+
+# 히스토그램 버킷 상한(초): 0.1초 ~ 약 200초를 로그 간격(×1.25)으로
+_BOUNDS: List[float] = [round(0.1 * 1.25 ** i, 4) for i in range(35)]
+
+
+class LatencyHistogram:
+    """
+    지연 시간 히스토그램 (로그 간격 고정 버킷, 스레드 안전).
+    분위수는 해당 버킷의 상한으로 근사 — 헤지 지연처럼 '이 정도면 느리다'는 기준에 충분하다.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+            self.total += 1
+            self.sum += seconds
+
+    def quantile(self, q: float) -> Union[float, None]:
+        """q 분위 지연(초), 관측이 없으면 None"""
+        with self._lock:
+            if not self.total:
+                return None
+            rank = max(1, math.ceil(q * self.total))
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return _BOUNDS[i] if i < len(_BOUNDS) else _BOUNDS[-1]
+        return _BOUNDS[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "mean": round(self.sum / self.total, 3) if self.total else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class LatencyTracker:
+    """모델별 지연 히스토그램 모음"""
+
+    def __init__(self):
+        self._hists: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, key: str) -> LatencyHistogram:
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = LatencyHistogram()
+            return hist
+
+    def observe(self, key: str, seconds: float) -> None:
+        self.histogram(key).observe(seconds)
+
+    def delay(self, key: str, q: float, min_samples: int, default: float) -> float:
+        """key의 q 분위 지연. 관측이 min_samples개 미만이면 default"""
+        hist = self.histogram(key)
+        if hist.total < min_samples:
+            return default
+        return hist.quantile(q)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = list(self._hists.items())
+        return {key: hist.snapshot() for key, hist in items}
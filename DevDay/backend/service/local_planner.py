@@ -0,0 +1,291 @@
+import datetime
+import logging
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.data.popularity import name_key
+from backend.services.day_planner import cluster_candidates
+from backend.services.itinerary_repair import record_violations
+from backend.services.route_optimizer import RouteOptimizer
+from backend.services.spatial_index import SpatialIndex, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트와 같은 규칙 (시각은 자정부터의 분)
+DAY_START = 9 * 60                 # 09:00~10:00 시작
+LUNCH = (12 * 60, 13 * 60)         # 점심 시작 가능 구간 (60분 → 14:00 이전 종료)
+DINNER = (18 * 60, 19 * 60)        # 저녁 시작 가능 구간
+LAST_DAY_END = 17 * 60             # 마지막 날은 17:00 이전 종료
+RADIUS_KM = 10.0                   # 하루 이동 반경 (일차 중심 기준)
+MAX_PLACES = 6
+
+# 카테고리별 머무는 시간 (분). 앞의 값이 안 들어가면 차례로 더 짧은 값으로
+DURATIONS = {"관광지": (90, 60, 45), "체험": (90, 60, 45), "카페": (60, 45), "쇼핑": (60, 45)}
+DEFAULT_DURATIONS = (60, 45)
+MEAL_MINUTES = {LUNCH: 60, DINNER: 90}
+# 하루에 이보다 많이 넣지 않는 카테고리 (프롬프트 예시: 카페 0~1)
+DAILY_CAPS = {"카페": 1, "쇼핑": 1}
+# 카테고리 안 순위 1위와 꼴찌의 비용 차이 (km 환산). 군집 밖 후보는 여기에 한 번 더 더함
+RANK_PENALTY_KM = 3.0
+# 반경 안 후보가 모자라면 카탈로그에서 보충할 때 목표보다 이만큼 더 (시간이 안 맞아 못 쓰는 곳 대비)
+TOP_UP_SPARE = 1
+# 보충하는 일반 장소 카테고리 (카페/쇼핑은 하루 1곳이라 후보만으로 충분)
+SIGHT_CATEGORIES = ("관광지", "체험")
+TOP_UP_RANK = 2.0
+# 시작 시각은 이 단위로 올림 ("10:07" 대신 "10:10")
+SLOT_MINUTES = 10
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _round_up(minutes: float) -> int:
+    return int(-(-minutes // SLOT_MINUTES) * SLOT_MINUTES)
+
+
+class LocalPlanner:
+    """
+    Gemini 없이 후보 목록만으로 여러 날 일정을 만든다 (수 밀리초, 같은 입력이면 같은 결과).
+    - 후보를 일차 수만큼 지리적 군집으로 나누고, 일차 중심에서 RADIUS_KM 이내 장소만 사용
+      (군집이 모자라면 반경 안의 다른 미사용 후보로 보충)
+    - 시간 순 최근접 이웃: 비용 = 거리 + 카테고리 안 순위, 이동 시간은 RouteOptimizer 규칙
+    - 점심·저녁 구간에는 식당, 그 사이에는 관광지/체험/카페/쇼핑. 마지막 날은 저녁 없이 17:00 전 종료
+    - 하루 최대 MAX_PLACES곳, 전체 일정에서 같은 장소(이름 키) 중복 없음
+    - 반경 안 후보가 하루를 채우기에 모자라면 catalog/spatial(있을 때)에서 가까운 식당·관광지를 보충
+      (blocked: 여행 기간 밖 축제 등 쓰지 않을 카탈로그 행 마스크)
+    - 주소가 비는 등 장소 스키마를 통과하지 못하는 행은 쓰지 않음
+    Gemini가 느리거나 실패할 때의 대체 일정, 그리고 스트리밍 첫 화면의 초안으로 쓴다.
+    """
+
+    def plan(
+        self,
+        trip_data: Dict[str, Any],
+        candidates: pd.DataFrame,
+        catalog: Union[pd.DataFrame, None] = None,
+        spatial: Union[SpatialIndex, None] = None,
+        blocked: Union[np.ndarray, None] = None,
+    ) -> Dict[str, Any]:
+        days = max(int(trip_data.get("days") or 1), 1)
+        base = datetime.datetime.strptime(trip_data["start"], "%Y-%m-%d").date()
+        usable = [not record_violations(r) for r in candidates.to_dict("records")]
+        pool = candidates[usable].reset_index(drop=True)
+        # 후보는 카테고리별로 점수 순이므로 순위도 카테고리 안에서 0~1로
+        position = pool.groupby("category", sort=False).cumcount()
+        size = pool.groupby("category", sort=False)["category"].transform("size")
+        pool = pool.assign(_rank=(position / (size - 1).clip(lower=1)).to_numpy(dtype=np.float64))
+        clusters = cluster_candidates(pool, days) if len(pool) else []
+        # 일차마다 다시 만들지 않도록 레코드/이름 키/좌표는 한 번만
+        records = pool.to_dict("records")
+        keys = [name_key(r.get("name")) for r in records]
+        coords = (pool["latitude"].to_numpy(dtype=np.float64), pool["longitude"].to_numpy(dtype=np.float64))
+
+        used = set()
+        itinerary = []
+        for i in range(days):
+            cluster = clusters[i] if i < len(clusters) else pool.iloc[0:0]
+            last = i == days - 1
+            day_records = self._day_pool(cluster, records, keys, coords, used)
+            if catalog is not None and spatial is not None and day_records:
+                day_records += self._top_up(day_records, catalog, spatial, used, 1 if last else 2, blocked)
+            places = self._plan_day(day_records, used, last)
+            itinerary.append({
+                "day": i + 1,
+                "date": (base + datetime.timedelta(days=i)).strftime("%Y-%m-%d"),
+                "title": self._title(i + 1, cluster),
+                "places": places,
+            })
+        return {
+            "summary": f"{(trip_data.get('emotions') or ['여유로운'])[0]} 부산 여행 일정입니다.",
+            "itinerary": itinerary,
+        }
+
+    def _plan_day(self, records: List[Dict[str, Any]], used: set, last: bool) -> List[Dict[str, Any]]:
+        """일차 하나의 장소 목록 (시간 순). 고른 장소의 이름 키는 used에 추가"""
+        if not records:
+            return []
+        day = _Day(records)
+
+        # (다음 식사 구간 또는 None=하루 끝, 그 전까지 채우는 일반 장소의 종료 한도)
+        meals = [LUNCH] if last else [LUNCH, DINNER]
+        segments: List[Tuple[Union[Tuple[int, int], None], int]] = [(meal, meal[1]) for meal in meals]
+        if last:
+            segments.append((None, LAST_DAY_END))
+
+        for k, (meal, deadline) in enumerate(segments):
+            # 남은 식사 자리는 비워 둔다
+            reserve = sum(1 for m, _ in segments[k:] if m is not None)
+            while len(day.places) + reserve < MAX_PLACES and day.visit_sight(deadline, meal):
+                pass
+            if meal is not None and len(day.places) < MAX_PLACES:
+                day.visit_meal(meal)
+
+        for place in day.places:
+            used.add(name_key(place["name"]))
+        return day.places
+
+    @staticmethod
+    def _day_pool(
+        cluster: pd.DataFrame,
+        records: List[Dict[str, Any]],
+        keys: List[str],
+        coords: Tuple[np.ndarray, np.ndarray],
+        used: set,
+    ) -> List[Dict[str, Any]]:
+        """일차 중심(군집 중앙값)에서 RADIUS_KM 이내의 미사용 후보. 군집 밖 후보는 순위 비용을 더 받음"""
+        if not records:
+            return []
+        if len(cluster):
+            center = (float(cluster["latitude"].median()), float(cluster["longitude"].median()))
+        else:
+            center = (float(np.median(coords[0])), float(np.median(coords[1])))
+        inside = set(cluster["name"].map(name_key)) if len(cluster) else set()
+        dist = haversine_km(center[0], center[1], coords[0], coords[1])
+
+        day_records, seen = [], set(used)
+        for record, key, d in zip(records, keys, dist.tolist()):
+            if not key or key in seen or d > RADIUS_KM:
+                continue
+            seen.add(key)
+            day_records.append(record if key in inside else {**record, "_rank": record["_rank"] + 1.0})
+        return day_records
+
+    @staticmethod
+    def _top_up(
+        records: List[Dict[str, Any]],
+        catalog: pd.DataFrame,
+        spatial: SpatialIndex,
+        used: set,
+        meals: int,
+        blocked: Union[np.ndarray, None],
+    ) -> List[Dict[str, Any]]:
+        """
+        일차 후보로 하루(식당 meals곳 + 나머지 일반 장소)를 채우기 모자라면
+        카탈로그에서 일차 중심 가까운 식당/관광지를 모자란 만큼 + TOP_UP_SPARE곳 (순위 비용 최하)
+        """
+        categories = [r["category"] for r in records]
+        need_meals = meals + TOP_UP_SPARE - categories.count("식당")
+        need_sights = MAX_PLACES - meals + TOP_UP_SPARE - sum(c in SIGHT_CATEGORIES for c in categories) \
+            - sum(min(cap, categories.count(c)) for c, cap in DAILY_CAPS.items())
+        if need_meals <= 0 and need_sights <= 0:
+            return []
+
+        lat = float(np.median([r["latitude"] for r in records]))
+        lng = float(np.median([r["longitude"] for r in records]))
+        rows, _ = spatial.within_radius(lat, lng, RADIUS_KM)
+        if blocked is not None:
+            rows = rows[~blocked[rows]]
+        category_of = catalog["category"].to_numpy()
+        names = catalog["name"].to_numpy()
+        taken = set(used) | {name_key(r["name"]) for r in records}
+        extra = []
+        for row in rows.tolist():
+            if need_meals <= 0 and need_sights <= 0:
+                break
+            meal = category_of[row] == "식당"
+            if (meal and need_meals <= 0) or (not meal and (category_of[row] not in SIGHT_CATEGORIES or need_sights <= 0)):
+                continue
+            key = name_key(names[row])
+            if not key or key in taken:
+                continue
+            record = catalog.iloc[row].to_dict()
+            if record_violations(record):
+                continue
+            taken.add(key)
+            extra.append({**record, "_rank": TOP_UP_RANK})
+            if meal:
+                need_meals -= 1
+            else:
+                need_sights -= 1
+        if extra:
+            logger.info(f"      ➕ 반경 내 후보 부족 → 카탈로그 장소 {len(extra)}곳 보충")
+        return extra
+
+    @staticmethod
+    def _title(day: int, cluster: pd.DataFrame) -> str:
+        if "gu" in cluster and cluster["gu"].notna().any():
+            return f"{day}일차 {cluster['gu'].mode().iloc[0]} 일대"
+        return f"{day}일차 일정"
+
+
+class _Day:
+    """하루 일정을 채우는 중간 상태 (현재 시각, 위치, 사용한 후보)"""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+        self.lats = np.array([r["latitude"] for r in records], dtype=np.float64)
+        self.lngs = np.array([r["longitude"] for r in records], dtype=np.float64)
+        self.rank_cost = RANK_PENALTY_KM * np.array([r["_rank"] for r in records], dtype=np.float64)
+        categories = np.array([str(r["category"]) for r in records])
+        self.categories = categories
+        self.meal = categories == "식당"
+        self.taken = np.zeros(len(records), dtype=bool)
+        self.places: List[Dict[str, Any]] = []
+        self.now = DAY_START
+        # 첫 장소는 일차 후보들의 중심에서 가까운 곳
+        self.here = (float(self.lats.mean()), float(self.lngs.mean()))
+
+    def _order(self, allowed: np.ndarray) -> List[int]:
+        cost = haversine_km(self.here[0], self.here[1], self.lats, self.lngs) + self.rank_cost
+        cost = np.where(allowed & ~self.taken, cost, np.inf)
+        return [row for row in np.argsort(cost, kind="stable").tolist() if np.isfinite(cost[row])]
+
+    def _travel(self, row: int, origin: Union[Tuple[float, float], None] = None) -> int:
+        if origin is None:
+            if not self.places:
+                return 0
+            origin = self.here
+        return RouteOptimizer.calculate_travel_time(origin[0], origin[1], self.lats[row], self.lngs[row])
+
+    def _meal_reachable(self, row: int, end: int, meal: Tuple[int, int]) -> bool:
+        """row에서 end에 나와 남은 식당 중 가장 가까운 곳에 식사 구간이 끝나기 전에 도착할 수 있는가"""
+        free = np.flatnonzero(self.meal & ~self.taken)
+        if not len(free):
+            return True  # 식당이 없으면 식사는 건너뛰므로 제약 없음
+        nearest = free[int(np.argmin(haversine_km(self.lats[row], self.lngs[row], self.lats[free], self.lngs[free])))]
+        return _round_up(end + self._travel(nearest, (self.lats[row], self.lngs[row]))) <= meal[1]
+
+    def visit_sight(self, deadline: int, meal: Union[Tuple[int, int], None]) -> bool:
+        """deadline 전에 끝나는(다음 식사에 늦지 않는) 가장 싼 일반 장소 하나를 추가. 없으면 False"""
+        allowed = ~self.meal
+        for category, cap in DAILY_CAPS.items():
+            if sum(p["category"] == category for p in self.places) >= cap:
+                allowed &= self.categories != category
+        for row in self._order(allowed):
+            start = _round_up(self.now + self._travel(row))
+            for minutes in DURATIONS.get(self.categories[row], DEFAULT_DURATIONS):
+                end = start + minutes
+                if end <= deadline and (meal is None or self._meal_reachable(row, end, meal)):
+                    self._add(row, start, minutes)
+                    return True
+        return False
+
+    def visit_meal(self, meal: Tuple[int, int]) -> bool:
+        """식사 구간 안에 시작할 수 있는 가장 싼 식당 하나를 추가 (일찍 도착하면 구간 시작까지 대기)"""
+        for row in self._order(self.meal):
+            start = _round_up(max(self.now + self._travel(row), meal[0]))
+            if start <= meal[1]:
+                self._add(row, start, MEAL_MINUTES[meal])
+                return True
+        logger.info(f"      🍽️ {_hhmm(meal[0])} 식사 구간에 갈 수 있는 식당 없음 → 건너뜀")
+        return False
+
+    def _add(self, row: int, start: int, minutes: int) -> None:
+        record = self.records[row]
+        keywords = str(record.get("keywords") or "").strip()
+        self.places.append({
+            "name": record["name"],
+            "address": record["address"],
+            "latitude": float(record["latitude"]),
+            "longitude": float(record["longitude"]),
+            "start_time": _hhmm(start),
+            "end_time": _hhmm(start + minutes),
+            "category": record["category"],
+            "duration": minutes,
+            "reason": keywords[:60] if keywords else f"{record['category']} 추천 장소",
+        })
+        self.taken[row] = True
+        self.now = start + minutes
+        self.here = (float(self.lats[row]), float(self.lngs[row]))
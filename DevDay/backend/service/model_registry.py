@@ -0,0 +1,187 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from backend.untils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# 모델 전체를 막는 건강 기록의 payload 값 (404: 모델 자체가 없음)
+ANY_PAYLOAD = "*"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_list (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    models     TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS model_health (
+    model         TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    last_ok       REAL,
+    failures      INTEGER NOT NULL DEFAULT 0,
+    last_status   INTEGER,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (model, payload)
+);
+"""
+
+
+class ModelRegistry:
+    """
+    Gemini 모델 목록(ListModels) 캐시 + (모델, 페이로드)별 건강 기록.
+    - 모델 목록은 discovery_ttl 동안 재사용 (SQLite 파일로 워커 프로세스 간 공유)
+    - 404는 모델 전체를, 같은 (모델, 페이로드)의 400이 failure_threshold번 연속이면 그 조합을 cooldown초 동안 건너뜀
+    - 성공한 조합은 최근 성공 순으로 맨 앞에 시도 → 보통 HTTP 왕복 1회
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        discovery_ttl: float = 3600.0,
+        cooldown: float = 600.0,
+        failure_threshold: int = 2,
+    ):
+        self.path = Path(path)
+        self.discovery_ttl = discovery_ttl
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self._local = threading.local()
+        # 같은 프로세스의 동시 조회는 ListModels 1회로 합친다
+        self._models = LRUCache(maxsize=1, ttl=discovery_ttl if discovery_ttl > 0 else None, name="models")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- 모델 목록 ---
+    def models(self, fetch: Callable[[], List[str]]) -> List[str]:
+        """generateContent 가능한 모델명 목록 (TTL 내면 캐시, 아니면 fetch() 결과를 저장)"""
+        return self._models.get_or_compute("models", lambda: self._load_models(fetch))
+
+    def _load_models(self, fetch: Callable[[], List[str]]) -> List[str]:
+        now = time.time()
+        try:
+            row = self._conn().execute("SELECT models, fetched_at FROM model_list WHERE id = 1").fetchone()
+            if row is not None and now - row[1] < self.discovery_ttl:
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 모델 목록 캐시 조회 실패: {e}")
+
+        models = fetch()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO model_list (id, models, fetched_at) VALUES (1, ?, ?)",
+                (json.dumps(models), now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 모델 목록 캐시 저장 실패: {e}")
+        return models
+
+    def invalidate_models(self) -> None:
+        self._models.clear()
+        try:
+            self._conn().execute("DELETE FROM model_list")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 모델 목록 캐시 삭제 실패: {e}")
+
+    # --- 건강 기록 ---
+    def plan(self, models: Sequence[str], payloads: Sequence[str]) -> List[Tuple[str, str]]:
+        """
+        시도 순서: 성공 이력 있는 조합(최근 성공 순) → 아직 모르는 조합(입력 순).
+        차단된 모델/조합은 뺀다. 전부 차단이면 입력 순 전체 (쿨다운 정보가 낡았을 수 있음).
+        """
+        pairs = [(m, p) for m in models for p in payloads]
+        now = time.time()
+        try:
+            rows = self._conn().execute(
+                "SELECT model, payload, last_ok, blocked_until FROM model_health"
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 모델 건강 기록 조회 실패: {e}")
+            return pairs
+
+        last_ok: Dict[Tuple[str, str], float] = {}
+        blocked = set()
+        for model, payload, ok_at, blocked_until in rows:
+            if blocked_until > now:
+                blocked.add((model, payload))
+            elif ok_at:
+                last_ok[(model, payload)] = ok_at
+
+        usable = [
+            pair for pair in pairs
+            if pair not in blocked and (pair[0], ANY_PAYLOAD) not in blocked
+        ]
+        if not usable:
+            return pairs
+        good = sorted((pair for pair in usable if pair in last_ok), key=lambda pair: -last_ok[pair])
+        return good + [pair for pair in usable if pair not in last_ok]
+
+    def record_success(self, model: str, payload: str) -> None:
+        self._execute(
+            "INSERT INTO model_health (model, payload, last_ok, failures, last_status, blocked_until) "
+            "VALUES (?, ?, ?, 0, 200, 0) "
+            "ON CONFLICT(model, payload) DO UPDATE SET "
+            "last_ok = excluded.last_ok, failures = 0, last_status = 200, blocked_until = 0",
+            (model, payload, time.time()),
+        )
+
+    def record_failure(self, model: str, payload: str, status: int) -> None:
+        """404 → 모델 전체 쿨다운, 400 → 연속 failure_threshold회면 해당 조합 쿨다운 (그 외 상태는 일시 오류로 보고 기록만)"""
+        now = time.time()
+        if status == 404:
+            self._execute(
+                "INSERT OR REPLACE INTO model_health (model, payload, last_ok, failures, last_status, blocked_until) "
+                "VALUES (?, ?, NULL, 1, 404, ?)",
+                (model, ANY_PAYLOAD, now + self.cooldown),
+            )
+            logger.info(f"   🚫 {model} 404 → {self.cooldown:g}초 동안 건너뜀")
+            return
+
+        # failures는 연속된 400 횟수 (다른 상태가 끼면 0부터 다시)
+        self._execute(
+            "INSERT INTO model_health (model, payload, failures, last_status, blocked_until) "
+            "VALUES (?, ?, ?, ?, 0) "
+            "ON CONFLICT(model, payload) DO UPDATE SET "
+            "failures = CASE WHEN excluded.last_status = 400 THEN failures + 1 ELSE 0 END, "
+            "last_status = excluded.last_status",
+            (model, payload, int(status == 400), status),
+        )
+        if status == 400:
+            self._execute(
+                "UPDATE model_health SET blocked_until = ?, last_ok = NULL "
+                "WHERE model = ? AND payload = ? AND failures >= ?",
+                (now + self.cooldown, model, payload, self.failure_threshold),
+            )
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        try:
+            self._conn().execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 모델 건강 기록 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        try:
+            total, blocked, good = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(blocked_until > ?), 0), COALESCE(SUM(last_ok IS NOT NULL), 0) "
+                "FROM model_health",
+                (now,),
+            ).fetchone()
+        except sqlite3.Error:
+            return {}
+        return {"tracked": total, "blocked": blocked, "known_good": good}
@@ -0,0 +1,122 @@
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple, Union
+
+from backend.data.popularity import name_key
+
+# 퍼지 매칭 채택 기준 (자모 편집거리 유사도 / 바이그램 Dice 중 큰 값)
+FUZZY_THRESHOLD = 0.8
+# 바이그램 후보 중 정밀 비교할 상위 개수
+FUZZY_TOP_K = 8
+# 이보다 많은 이름에 나오는 바이그램('부산', '카페' 등)은 후보 생성에 쓰지 않음 (다른 바이그램이 있을 때)
+COMMON_BIGRAM_ROWS = 200
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_COUNT = 11172
+
+
+def jamo(text: str) -> str:
+    """한글 음절 → 초/중/종성 자모 (오타 한 글자가 편집거리 1~2로만 반영되도록)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code < _HANGUL_COUNT:
+            out.append(chr(0x1100 + code // 588))
+            out.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                out.append(chr(0x11A7 + code % 28))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(key: str) -> List[str]:
+    return [key[i:i + 2] for i in range(len(key) - 1)] if len(key) > 1 else [key]
+
+
+def _levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def similarity(a: str, b: str) -> float:
+    """정규화된 이름 두 개의 유사도 0~1 = max(자모 편집거리 유사도, 바이그램 Dice)"""
+    if not a or not b:
+        return 0.0
+    ga, gb = Counter(_bigrams(a)), Counter(_bigrams(b))
+    dice = 2.0 * sum((ga & gb).values()) / (sum(ga.values()) + sum(gb.values()))
+    ja, jb = jamo(a), jamo(b)
+    longest = max(len(ja), len(jb))
+    # 길이 차이만으로 편집거리 유사도의 상한이 정해지므로, 그 상한이 기준보다 낮으면 계산 생략
+    if dice >= FUZZY_THRESHOLD or 1.0 - abs(len(ja) - len(jb)) / longest < FUZZY_THRESHOLD:
+        return dice
+    return max(1.0 - _levenshtein(ja, jb) / longest, dice)
+
+
+class NameIndex:
+    """
+    장소명 → 카탈로그 행.
+    - 정확 매칭: name_key 해시 (O(1)). 같은 키가 여러 행이면 좌표가 주어질 때 가장 가까운 행
+    - 퍼지 매칭: 이름 바이그램 포스팅으로 후보 상위 FUZZY_TOP_K개만 골라 자모 편집거리로 비교 (O(k))
+    """
+
+    def __init__(self, names: Iterable[str], lats: Union[Iterable[float], None] = None, lngs: Union[Iterable[float], None] = None):
+        self.keys = [name_key(n) for n in names]
+        self.lats = list(lats) if lats is not None else None
+        self.lngs = list(lngs) if lngs is not None else None
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for row, key in enumerate(self.keys):
+            if not key:
+                continue
+            self.exact[key].append(row)
+            for gram in set(_bigrams(key)):
+                self.postings[gram].append(row)
+
+    @classmethod
+    def build(cls, df) -> "NameIndex":
+        return cls(df["name"].tolist(), df["latitude"].tolist(), df["longitude"].tolist())
+
+    def _nearest(self, rows: List[int], lat, lng) -> int:
+        if len(rows) == 1 or self.lats is None or lat is None or lng is None:
+            return rows[0]
+        try:
+            lat, lng = float(lat), float(lng)
+        except (TypeError, ValueError):
+            return rows[0]
+
+        def dist(r):
+            d = (self.lats[r] - lat) ** 2 + (self.lngs[r] - lng) ** 2
+            return d if d == d else math.inf
+
+        return min(rows, key=dist)
+
+    def match(self, name: str, lat=None, lng=None) -> Tuple[Union[int, None], float]:
+        """(행 번호 또는 None, 유사도). 정확 매칭이면 유사도 1.0"""
+        key = name_key(name)
+        if not key:
+            return None, 0.0
+        rows = self.exact.get(key)
+        if rows:
+            return self._nearest(rows, lat, lng), 1.0
+
+        grams = set(_bigrams(key))
+        usable = [g for g in grams if g in self.postings and len(self.postings[g]) <= COMMON_BIGRAM_ROWS]
+        if not usable:
+            usable = [g for g in grams if g in self.postings]
+        counts = Counter(row for g in usable for row in self.postings[g])
+        best_row, best_score = None, 0.0
+        for row, _ in counts.most_common(FUZZY_TOP_K):
+            score = similarity(key, self.keys[row])
+            if score > best_score:
+                best_row, best_score = row, score
+        if best_score < FUZZY_THRESHOLD:
+            return None, best_score
+        return self._nearest(self.exact[self.keys[best_row]], lat, lng), best_score
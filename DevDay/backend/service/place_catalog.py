@@ -0,0 +1,347 @@
+import hashlib
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.data.festival_dates import add_period_columns
+from backend.data.popularity import GEM_SCORES_CSV, load_gem_scores, name_keys
+
+logger = logging.getLogger(__name__)
+
+
+def _best_filled_column(df: pd.DataFrame, candidates: List[str]) -> pd.Series:
+    """여러 후보 중 '존재하고 non-null이 가장 많은' 컬럼을 선택해 반환"""
+    cols = [c for c in candidates if c in df.columns]
+    if not cols:
+        return pd.Series([None] * len(df), index=df.index)
+    cols.sort(key=lambda c: df[c].notna().sum(), reverse=True)
+    return df[cols[0]]
+
+
+# 결측으로 취급할 문자열 토큰 (소문자 비교)
+NULL_TOKENS = ["null", "none", "nan"]
+# lower()가 위 토큰이 되는 문자열 전체 (대소문자 조합). 비ASCII 문자는 lower()해도
+# 이 글자들이 되지 않으므로, 본문 전체를 lower()하는 대신 해시 조회 한 번으로 끝낸다.
+_NULL_TOKEN_VARIANTS = [
+    "".join(chars)
+    for token in NULL_TOKENS
+    for chars in itertools.product(*[(c, c.upper()) for c in token])
+]
+
+# 점수 파일에 없는 장소의 숨은 명소 점수 (BICOLOR 코스에 언급되지 않음 = 덜 알려진 곳)
+DEFAULT_GEM_SCORE = 1.0
+
+# 카테고리 추론 규칙 (위에서부터 먼저 맞는 규칙 적용, None은 대표메뉴 유무 규칙)
+CATEGORY_RULES = [
+    ("카페", ["카페"]),
+    ("식당", None),
+    ("체험", ["체험", "공방", "워크샵"]),
+    ("쇼핑", ["쇼핑", "상점", "마켓"]),
+]
+DEFAULT_CATEGORY = "관광지"
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """결측/'null' 계열 토큰을 빈 문자열로, 나머지는 str + strip (벡터 연산)"""
+    out = values.astype(str).str.strip()
+    is_null = values.isna().to_numpy() | out.isin(_NULL_TOKEN_VARIANTS).to_numpy()
+    return out.mask(is_null, "")
+
+
+def _guess_category(master: pd.DataFrame) -> np.ndarray:
+    """
+    간단 카테고리 추론 (np.select와 같은 순서 규칙).
+    - 키워드에 공백이 없으므로 'name raw_type keywords' 연결 문자열 검색 = 각 컬럼 검색의 OR
+      → 규칙마다 연결 문자열에 단어 alternation 한 번만 검색 (작은 프레임에서 호출당 고정 비용이 크다)
+    - 앞 규칙에서 이미 정해진 행은 뒤 규칙에서 다시 검색하지 않는다
+    """
+    texts = (master["name"] + " " + master["raw_type"] + " " + master["keywords"]).to_numpy()
+    has_menu = (master["rep_menu"] != "").to_numpy()
+
+    category = np.full(len(master), DEFAULT_CATEGORY, dtype=object)
+    undecided = np.ones(len(master), dtype=bool)
+    for label, words in CATEGORY_RULES:
+        idx = np.flatnonzero(undecided)
+        if words is None:
+            hit = has_menu[idx]
+        else:
+            pattern = "|".join(re.escape(word) for word in words)
+            hit = pd.Series(texts[idx]).str.contains(pattern).to_numpy()
+        category[idx[hit]] = label
+        undecided[idx[hit]] = False
+    return category
+
+
+# 데이터 로딩 / 전처리
+
+def build_master_df(csv_path: Union[str, Path], gem_scores_path: Union[str, Path] = GEM_SCORES_CSV) -> pd.DataFrame:
+    """CSV 파일 로드 및 전처리"""
+    logger.info("=" * 60)
+    logger.info("📂 CSV 파일 로드 시작.")
+    logger.info(f"   경로: {csv_path}")
+
+    try:
+        df = pd.read_csv(csv_path, encoding="utf-8-sig")
+        logger.info(f"✅ CSV 로드 성공: {len(df)}행")
+    except Exception as e:
+        logger.error(f"❌ CSV 로드 실패: {e}")
+        raise
+
+    return preprocess_master_df(df, load_gem_scores(gem_scores_path))
+
+
+def preprocess_master_df(df: pd.DataFrame, gem_scores: Union[Dict[str, float], None] = None) -> pd.DataFrame:
+    """원본 CSV 프레임 → 정제된 master 프레임 (행 단위 Python 함수 호출 없음)"""
+    df.columns = df.columns.str.strip()
+
+    def col(df, *names):
+        for n in names:
+            if n in df.columns:
+                return df[n]
+        return pd.Series([None] * len(df), index=df.index)
+
+    # 좌표 유효값만 (부산 대략 범위) — 문자열 정제 전에 먼저 걸러 불필요한 연산을 줄인다
+    lat = pd.to_numeric(col(df, "위도", "latitude", "lat"), errors="coerce")
+    lng = pd.to_numeric(col(df, "경도", "longitude", "lng", "lon"), errors="coerce")
+    valid = (lat.between(34.8, 36.2) & lng.between(128.5, 130.0)).to_numpy()
+
+    # 주소 후보 선택은 원본 전체의 채움 수 기준 (필터 전에 결정)
+    address = _best_filled_column(df, ["주소", "주소 기타", "주소 기타 ", "장소", "address"])
+    # 유효 행은 불리언 마스크로 한 번만 걸러 둔다 (컬럼마다 라벨 인덱싱하는 고정 비용 제거)
+    address = address[valid]
+    lat, lng = lat[valid], lng[valid]
+    df = df[valid]
+
+    name = _clean_text(col(df, "콘텐츠명", "제목", "name", "장소명"))
+
+    # 다양한 컬럼명을 허용 (사용자 CSV 호환)
+    keywords = (
+        _clean_text(col(df, "상세내용", "detail", "설명"))
+        + " "
+        + _clean_text(col(df, "부제", "부제목", "subtitle"))
+        + " "
+        + _clean_text(col(df, "주요장소", "spot"))
+        + " "
+        + _clean_text(col(df, "장소", "place"))
+    ).str.strip()
+
+    master = pd.DataFrame(
+        {
+            "name": name,
+            "gu": _clean_text(col(df, "구군", "gu", "구")),
+            "latitude": lat,
+            "longitude": lng,
+            "address": _clean_text(address),
+            "raw_type": _clean_text(col(df, "유형", "여행지", "type", "타입")),
+            "rep_menu": _clean_text(col(df, "대표메뉴", "menu", "메뉴")),
+            "keywords": keywords,
+            "period_text": _clean_text(col(df, "운영기간", "period")),
+            "hours_text": _clean_text(col(df, "이용요일 및 시간")),
+        }
+    )
+    master["category"] = _guess_category(master)
+    # 유명 스팟은 제외하지 않고 숨은 명소 점수(오프라인 산출, 0=유명 ~ 1=덜 알려짐)로 순위에서 밀어낸다
+    master["gem_score"] = name_keys(master["name"]).map(gem_scores or {}).fillna(DEFAULT_GEM_SCORE).astype(float)
+    # 축제 운영기간은 로드 시 1회 구조화 (FestivalCalendar 인덱스의 입력)
+    add_period_columns(master, ["period_text", "hours_text"], rows=(master["raw_type"] == "축제").to_numpy())
+
+    cat_counts = master["category"].value_counts()
+    logger.info("   카테고리별 개수:")
+    for cat, cnt in cat_counts.items():
+        logger.info(f"     - {cat}: {cnt}개")
+
+    logger.info("=" * 60)
+    return master.reset_index(drop=True)
+
+
+def _file_digest(path: Path) -> str:
+    """파일 내용 sha256 (mtime만 바뀐 touch는 재빌드하지 않기 위함)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _files_digest(paths: List[Path]) -> str:
+    """여러 입력 파일 내용을 합친 해시 (없는 선택 파일은 '-'로)"""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update((_file_digest(path) if path.exists() else "-").encode())
+    return h.hexdigest()
+
+
+class CatalogSnapshot:
+    """
+    한 시점의 정제된 장소 카탈로그 (읽기 전용).
+    요청 처리 중에는 스냅샷 하나만 붙잡고 쓰면 되므로, 리로드가 일어나도 일관된 데이터를 본다.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: int, digest: str, indexes: Dict[str, Any]):
+        self.df = df
+        self.version = version
+        self.digest = digest
+        self.indexes = indexes
+        self.loaded_at = time.time()
+
+    def index(self, name: str) -> Any:
+        return self.indexes.get(name)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+
+class PlaceCatalog:
+    """
+    프로세스 전역 장소 카탈로그.
+    - 시작 시 1회 CSV를 정제해 스냅샷을 만들고 모든 요청이 공유한다.
+    - reload_interval 초마다 입력 파일(카탈로그 CSV + watch_paths, 기본은 숨은 명소 점수 CSV)의
+      mtime/size를 확인하고, 내용 해시가 바뀌었을 때만 재빌드한다. watch_paths 파일은 없어도 된다.
+    - 재빌드는 한 스레드만 수행하며, 완성된 스냅샷을 참조 교체로 원자적으로 바꾼다.
+      (재빌드 중에도 다른 요청은 이전 스냅샷을 그대로 사용)
+    """
+
+    def __init__(
+        self,
+        csv_path: Union[str, Path],
+        builder: Callable[[Path], pd.DataFrame] = build_master_df,
+        reload_interval: float = 5.0,
+        watch_paths: Iterable[Union[str, Path]] = (GEM_SCORES_CSV,),
+    ):
+        self.csv_path = Path(csv_path)
+        self.paths = [self.csv_path] + [Path(p) for p in watch_paths]
+        self.builder = builder
+        self.reload_interval = reload_interval
+        self._index_builders: Dict[str, Callable[[pd.DataFrame], Any]] = {}
+        self._snapshot: Union[CatalogSnapshot, None] = None
+        self._stat_sig = None
+        self._last_check = 0.0
+        self._version = 0
+        self._init_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    # --- 확장 지점: 카탈로그와 함께 빌드되는 인덱스 ---
+    def register_index(self, name: str, builder: Callable[[pd.DataFrame], Any]) -> None:
+        """스냅샷 빌드 시 함께 생성할 인덱스 등록 (이미 로드된 스냅샷에는 즉시 추가)"""
+        with self._reload_lock:
+            self._index_builders[name] = builder
+            snap = self._snapshot
+            if snap is not None and name not in snap.indexes:
+                indexes = dict(snap.indexes)
+                indexes[name] = builder(snap.df)
+                self._snapshot = CatalogSnapshot(snap.df, snap.version, snap.digest, indexes)
+
+    def _stat(self) -> Tuple[Any, ...]:
+        """입력 파일별 (mtime, size). 카탈로그 CSV가 없으면 OSError, 선택 파일이 없으면 None"""
+        sig = []
+        for i, path in enumerate(self.paths):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if i == 0:
+                    raise
+                sig.append(None)
+                continue
+            sig.append((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def _build(self, digest: str) -> CatalogSnapshot:
+        t0 = time.perf_counter()
+        df = self.builder(self.csv_path)
+        indexes = {name: fn(df) for name, fn in self._index_builders.items()}
+        self._version += 1
+        snap = CatalogSnapshot(df, self._version, digest, indexes)
+        logger.info(
+            f"📚 장소 카탈로그 v{snap.version} 빌드 완료: {len(df)}곳 "
+            f"({(time.perf_counter() - t0) * 1000:.0f}ms)"
+        )
+        return snap
+
+    def load(self) -> CatalogSnapshot:
+        """최초 로드 (이미 로드되어 있으면 그대로 반환)"""
+        if self._snapshot is not None:
+            return self._snapshot
+        with self._init_lock:
+            if self._snapshot is None:
+                sig = self._stat()
+                snap = self._build(_files_digest(self.paths))
+                self._stat_sig = sig
+                self._last_check = time.monotonic()
+                self._snapshot = snap
+        return self._snapshot
+
+    def snapshot(self) -> CatalogSnapshot:
+        """현재 스냅샷 반환 (필요 시 변경 감지 후 리로드)"""
+        snap = self._snapshot
+        if snap is None:
+            return self.load()
+        if self.reload_interval > 0 and time.monotonic() - self._last_check >= self.reload_interval:
+            # 다른 스레드가 확인/재빌드 중이면 기다리지 않고 기존 스냅샷 사용
+            if self._reload_lock.acquire(blocking=False):
+                try:
+                    self._last_check = time.monotonic()
+                    self._reload_if_changed()
+                finally:
+                    self._reload_lock.release()
+        return self._snapshot
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.snapshot().df
+
+    def _reload_if_changed(self, force: bool = False) -> bool:
+        try:
+            sig = self._stat()
+        except OSError as e:
+            logger.error(f"❌ 카탈로그 파일 확인 실패 (기존 스냅샷 유지): {e}")
+            return False
+
+        if not force and sig == self._stat_sig:
+            return False
+
+        digest = _files_digest(self.paths)
+        if not force and digest == self._snapshot.digest:
+            self._stat_sig = sig
+            return False
+
+        logger.info("🔄 카탈로그 데이터 변경 감지 → 재빌드")
+        try:
+            snap = self._build(digest)
+        except Exception as e:
+            logger.error(f"❌ 카탈로그 재빌드 실패 (기존 스냅샷 유지): {e}")
+            return False
+
+        self._stat_sig = sig
+        self._snapshot = snap
+        return True
+
+    def reload(self) -> bool:
+        """강제 재빌드 (운영 중 수동 갱신용)"""
+        if self._snapshot is None:
+            self.load()
+            return True
+        with self._reload_lock:
+            self._last_check = time.monotonic()
+            return self._reload_if_changed(force=True)
+
+
+_CATALOG: Union[PlaceCatalog, None] = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def get_catalog(csv_path: Union[str, Path], reload_interval: float = 5.0) -> PlaceCatalog:
+    """프로세스 전역 카탈로그 (최초 호출 시 생성)"""
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                _CATALOG = PlaceCatalog(csv_path, reload_interval=reload_interval)
+    return _CATALOG
@@ -0,0 +1,86 @@
+import copy
+import datetime
+import hashlib
+import logging
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union
+
+from backend.services.response_cache import ResponseCache
+from backend.untils.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+# 목적 문장 지문에서 무시할 문장부호 ("힐링 여행!" == "힐링 여행")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _norm(text: Any) -> str:
+    text = unicodedata.normalize("NFC", str(text or ""))
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+def _norm_set(values: Union[Iterable[Any], None]) -> List[str]:
+    if isinstance(values, str):
+        values = [values]
+    return sorted({v for v in (_norm(x) for x in values or []) if v})
+
+
+def purpose_fingerprint(purpose: Any) -> str:
+    """자유 입력 여행 목적 → 정규화(공백/대소문자/문장부호 무시) 후 짧은 해시"""
+    text = _WS_RE.sub(" ", _PUNCT_RE.sub(" ", _norm(purpose))).strip()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def canonical_profile(trip_data: Dict[str, Any], context: Union[Dict[str, Any], None] = None) -> Dict[str, Any]:
+    """
+    일정 재사용 판단용 여행 프로필.
+    감정/테마는 순서·대소문자·중복과 무관하게, 실제 날짜는 빼고 일수만 남긴다.
+    context에는 날짜에 따라 달라지는 후보 조건(기간 내 축제 등)과 카탈로그 버전을 넣는다.
+    """
+    return {
+        "emotions": _norm_set(trip_data.get("emotions")),
+        "themes": _norm_set(trip_data.get("themes")),
+        "purpose": purpose_fingerprint(trip_data.get("purpose")),
+        "days": int(trip_data.get("days") or 1),
+        "context": context or {},
+    }
+
+
+def profile_key(profile: Dict[str, Any]) -> str:
+    return "profile:" + make_key(profile)
+
+
+def rebase_itinerary(result: Dict[str, Any], start: str) -> Dict[str, Any]:
+    """캐시된 일정의 day/date를 새 시작일 기준으로 다시 매긴다 (원본은 건드리지 않음)"""
+    rebased = copy.deepcopy(result)
+    base = datetime.datetime.strptime(start, "%Y-%m-%d").date()
+    for i, day_plan in enumerate(rebased.get("itinerary") or []):
+        day_plan["day"] = i + 1
+        day_plan["date"] = (base + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+    return rebased
+
+
+class ProfileCache:
+    """
+    동등한 여행 프로필 → 이전에 생성·검증된 일정.
+    저장은 ResponseCache(SQLite)에 위임하므로 워커 간 공유/재시작 후 유지/TTL/용량 상한이 같다.
+    """
+
+    def __init__(self, path: Union[str, Path], ttl: float, max_bytes: int):
+        self.store = ResponseCache(path, ttl=ttl, max_bytes=max_bytes)
+
+    def get(self, profile: Dict[str, Any], start: str) -> Union[Dict[str, Any], None]:
+        cached = self.store.get(profile_key(profile))
+        if cached is None:
+            return None
+        try:
+            return rebase_itinerary(cached, start)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"⚠️ 캐시 일정 날짜 재배치 실패: {e}")
+            return None
+
+    def put(self, profile: Dict[str, Any], result: Dict[str, Any]) -> None:
+        self.store.put(profile_key(profile), result, model="profile")
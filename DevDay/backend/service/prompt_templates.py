@@ -1,6 +1,9 @@
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Tuple, Union
 import pandas as pd
 
+# 상세 프롬프트 후보 목록의 키워드 기본 최대 길이 (토큰 예산에 따라 더 짧아질 수 있음)
+KEYWORD_CHARS = 220
+
 class PromptTemplates:
     # 감정/테마 표현 사전
     EMOTION_STYLES = {
@@ -27,91 +30,58 @@ class PromptTemplates:
         '포토스팟': '인스타그래머블, 사진 명소',
     }
 
-    @staticmethod
-    def _coalesce(v, default=""):
-        return default if v is None else v
-
-    @staticmethod
-    def _render_candidates_block(candidates: Union[pd.DataFrame, List[Dict[str, Any]]]) -> str:
-        """
-        candidates를 모델 컨텍스트용 텍스트 블록으로 변환.
-        """
-        rows: List[Dict[str, Any]]
-        if isinstance(candidates, pd.DataFrame):
-            cols = ["name", "address", "latitude", "longitude", "category", "keywords", "gu"]
-            missing = [c for c in cols if c not in candidates.columns]
-            if missing:
-                raise ValueError(f"candidates DataFrame에 누락된 컬럼이 있습니다: {missing}")
-            rows = candidates[cols].to_dict(orient="records")
-        else:
-            rows = []
-            for i, r in enumerate(candidates):
-                for k in ["name", "address", "latitude", "longitude", "category", "keywords", "gu"]:
-                    if k not in r:
-                        raise ValueError(f"candidates[{i}]에 '{k}' 키가 없습니다.")
-                rows.append(r)
-
-        lines: List[str] = []
-        for r in rows:
-            name = str(PromptTemplates._coalesce(r.get("name", ""))).strip()
-            address = str(PromptTemplates._coalesce(r.get("address", ""))).strip()
-            lat = r.get("latitude", "")
-            lng = r.get("longitude", "")
-            category = str(PromptTemplates._coalesce(r.get("category", ""))).strip()
-            keywords = str(PromptTemplates._coalesce(r.get("keywords", ""))).strip()
-            gu = str(PromptTemplates._coalesce(r.get("gu", ""))).strip()
-
-            if len(keywords) > 220:
-                keywords = keywords[:220].rstrip() + "…"
-
-            lines.append(
-                f"- name:{name} | address:{address} | lat:{lat},lng:{lng} | category:{category} | keywords:{keywords} | gu:{gu}"
-            )
-        return "\n".join(lines)
-
-    @staticmethod
-    def get_itinerary_prompt(
-        data: Dict[str, Any],
-        candidates: Union[pd.DataFrame, List[Dict[str, Any]]]
-    ) -> str:
-        """
-        감정과 테마에 따른 맞춤형 프롬프트
-        """
-        emotions = data.get("emotions", []) or []
-        themes = data.get("themes", []) or []
-        days = int(data.get("days", 1) or 1)
-        nights = int(data.get("nights", max(days - 1, 0)))
-        start = str(data.get("start", "YYYY-MM-DD"))
-        end = str(data.get("end", "YYYY-MM-DD"))
-        purpose = str(data.get("purpose", "")).strip()
-
-        emotion_desc = ", ".join([PromptTemplates.EMOTION_STYLES.get(e, e) for e in emotions]) or "사용자 감정"
-        theme_desc = ", ".join([PromptTemplates.THEME_KEYWORDS.get(t, t) for t in themes]) or "선택 테마"
+    # 정적 접두부: 요청마다 똑같은 역할/규칙/스키마/체크리스트 (서식 치환 없음 → 모듈 로드 시 한 번만 만들어지고,
+    # 모델별 컨텍스트 캐시에 올려 매 요청 다시 토큰화/과금되지 않게 한다). 요청별 내용은 *_SUFFIX만 format.
 
-        # ✅ 수정: candidates를 실제로 렌더링
-        filtered_places = PromptTemplates._render_candidates_block(candidates)
-
-        PROMPT = """
+    # 압축(ID 참조) 모드: 후보는 짧은 id 표로, 응답은 id/시간/이유만
+    COMPACT_PREFIX = """
 당신은 **부산 지역 전문 여행 플래너 AI**입니다.
-아래 제공된 **실제 장소 목록 내부에서만** 일정을 구성하세요. 목록에 없는 장소는 절대 생성하지 마세요.
-
----
+이 지시 뒤에 오는 여행자 프로필과 후보 표를 보고, 후보 표 안의 장소만 `id`로 골라 일정을 구성하세요. 표에 없는 장소는 절대 쓰지 마세요.
+
+## ⚙️ 규칙
+1) 장소는 후보 표의 `id`로만 지정 (이름·주소·좌표는 서버가 채우므로 출력하지 말 것). 같은 id 중복 금지.
+2) 여행자 프로필의 감정 분위기와 테마에 맞는 장소를 keywords 근거로 고르고, 한적한 로컬 스팟 우선.
+3) 하루는 서로 가까운 곳(같은 gu, 이동 반경 10km 이내)으로 묶기.
+4) 1일차는 09:00~10:00 시작, 마지막 날은 17:00 이전 종료. 점심(12:00~14:00)·저녁(18:00~20:00)은 category가 식당인 곳.
+5) 하루 5~6곳, 시간 오름차순, "HH:MM" 24시간제, start_time < end_time.
+6) JSON 한 덩어리만 출력 (마크다운·주석·설명 금지).
+
+## ✅ 출력 스키마
+{
+  "summary": "이번 여행을 한 문장으로",
+  "itinerary": [
+    {
+      "day": 1,
+      "date": "YYYY-MM-DD (해당 일차 날짜)",
+      "title": "첫날 제목",
+      "places": [
+        {"id": "P1", "start_time": "09:00", "end_time": "10:30", "reason": "감정/테마와의 연결 근거 1문장"}
+      ]
+    }
+  ]
+}
+"""
 
-## 🧭 여행자 프로필 (입력)
+    COMPACT_SUFFIX = """
+## 🧭 여행자 프로필
 - 여행 기간: {start} ~ {end} ({nights}박 {days}일)
 - 여행 목적: {purpose}
 - 현재 감정 상태: {emotion_desc}
 - 원하는 테마: {theme_desc}
 
----
+## 📂 후보 장소 (id|name|category|gu|lat,lng|keywords)
+{filtered_places}
 
-## 📂 사용 가능한 장소 목록 (필수 제약)
-아래는 추천 가능한 **실제 장소 데이터**입니다.
-**반드시 이 목록 안에서만 선택**하고, 아래 필드들을 **원문 그대로** 사용하세요.
+1일차 date는 "{start}". 각 날짜(day=1..{days})마다 places 5~6개. JSON만 출력하세요.
+"""
 
-{filtered_places}
+    # 상세 모드: 후보 전체 필드를 주고 장소 값을 그대로 옮겨 적게 함
+    VERBOSE_PREFIX = """
+당신은 **부산 지역 전문 여행 플래너 AI**입니다.
+이 지시 뒤에 제공되는 **실제 장소 목록 내부에서만** 일정을 구성하세요. 목록에 없는 장소는 절대 생성하지 마세요.
+여행자 프로필(기간·목적·감정·테마)과 장소 목록은 이 지시 다음에 주어집니다.
 
-> 각 항목은 최소한 다음 필드를 가집니다:
+> 장소 목록의 각 항목은 최소한 다음 필드를 가집니다:
 > `name`, `address`, `latitude`, `longitude`, `category`, `keywords`, `gu`
 
 ---
@@ -119,7 +89,7 @@ class PromptTemplates:
 ## ⚙️ 엄격 규칙 (하나라도 위반하면 전체 출력을 다시 생성하라)
 
 1) **목록 내부만 사용**
-   - 반드시 위 “사용 가능한 장소 목록” 안의 장소만 선택.
+   - 반드시 “사용 가능한 장소 목록” 안의 장소만 선택.
    - 장소명, 주소, 좌표, 카테고리는 **입력 목록 값 그대로** 복사 사용(철자/띄어쓰기 변경 금지).
    - 목록에 없는 장소/주소/좌표/카테고리는 **금지**.
 
@@ -128,7 +98,7 @@ class PromptTemplates:
    - 로컬/한적/뷰 포인트를 우선 반영.
 
 3) **감정·테마 매칭**
-   - '{emotion_desc}' 분위기를 반영하고 '{theme_desc}'와 관련된 장소만 포함.
+   - 여행자 프로필의 감정 분위기를 반영하고 원하는 테마와 관련된 장소만 포함.
    - 장소 선택 근거는 각 장소의 `keywords`에서 테마·감정과의 연결성을 우선 찾되, 약하면 제외.
 
 4) **동선 최적화 (부산 지리 준수)**
@@ -162,15 +132,15 @@ class PromptTemplates:
 
 ## ✅ 출력 스키마 (정확히 이 구조만)
 
-{{
-  "summary": "이번 여행은 {emotion_desc}한 분위기로 {theme_desc} 중심의 일정입니다.",
+{
+  "summary": "이번 여행은 (감정) 분위기로 (테마) 중심의 일정입니다.",
   "itinerary": [
-    {{
+    {
       "day": 1,
-      "date": "{start}",
+      "date": "YYYY-MM-DD (해당 일차 날짜)",
       "title": "첫날 제목",
       "places": [
-        {{
+        {
           "name": "장소 이름(목록 그대로)",
           "address": "주소(목록 그대로)",
           "latitude": 35.xxxx,
@@ -181,13 +151,13 @@ class PromptTemplates:
           "category": "관광지",
           "reason": "감정/테마와의 연결 근거를 1~2문장으로 간결히",
           "tips": "선택사항: 현지 팁/시간대/좌석/대기/포토스팟 등"
-        }}
+        }
       ]
-    }}
+    }
   ]
-}}
+}
 
-> 주의: 각 날짜(day=1..{days}, date는 해당 날짜)마다 **5~6개** places를 채워 작성.
+> 주의: 각 날짜(day=1..여행 일수, date는 해당 날짜)마다 **5~6개** places를 채워 작성.
 > 마지막 날은 반드시 17:00 이전 종료, 매일 점심·저녁 식당 포함.
 
 ---
@@ -208,15 +178,162 @@ class PromptTemplates:
 - JSON 외 텍스트/마크다운/코멘트/사과문
 - null, "null", 빈 문자열, 잘못된 시간/좌표
 - 하루 이동 반경 10km 이상 과도 이동
+"""
+
+    VERBOSE_SUFFIX = """
+---
+
+## 🧭 여행자 프로필 (입력)
+- 여행 기간: {start} ~ {end} ({nights}박 {days}일)
+- 여행 목적: {purpose}
+- 현재 감정 상태: {emotion_desc}
+- 원하는 테마: {theme_desc}
+
+---
+
+## 📂 사용 가능한 장소 목록 (필수 제약)
+아래는 추천 가능한 **실제 장소 데이터**입니다.
+**반드시 이 목록 안에서만 선택**하고, 필드들을 **원문 그대로** 사용하세요.
+
+{filtered_places}
 
 ---
 
 ## 🎯 생성 목표
 - {emotion_desc} 감정과 {theme_desc} 테마에 정확히 부합하는 부산의 **숨은 명소 중심 일정**
+- 1일차 date는 "{start}", day=1..{days} 각 날짜마다 5~6곳
 - 현실적 시간표, 합리적 동선, 균형 잡힌 카테고리
 - 파서가 바로 쓸 수 있는 **정합성 높은 JSON** 생성
 
 **지금 위 조건을 모두 충족하는 JSON만 출력하세요.**
 """
 
-        return PROMPT
+    # 컨텍스트 캐시에 올릴 수 있는 정적 접두부 (split_prompt가 인식)
+    STATIC_PREFIXES = (COMPACT_PREFIX, VERBOSE_PREFIX)
+
+    def _coalesce(v, default=""):
+        return default if v is None else v
+
+    @staticmethod
+    def _render_candidates_block(
+        candidates: Union[pd.DataFrame, List[Dict[str, Any]]],
+        keyword_chars: int = KEYWORD_CHARS,
+    ) -> str:
+        """
+        candidates를 모델 컨텍스트용 텍스트 블록으로 변환. keywords는 keyword_chars자에서 자름 (0이면 생략)
+        """
+        rows: List[Dict[str, Any]]
+        if isinstance(candidates, pd.DataFrame):
+            cols = ["name", "address", "latitude", "longitude", "category", "keywords", "gu"]
+            missing = [c for c in cols if c not in candidates.columns]
+            if missing:
+                raise ValueError(f"candidates DataFrame에 누락된 컬럼이 있습니다: {missing}")
+            rows = candidates[cols].to_dict(orient="records")
+        else:
+            rows = []
+            for i, r in enumerate(candidates):
+                for k in ["name", "address", "latitude", "longitude", "category", "keywords", "gu"]:
+                    if k not in r:
+                        raise ValueError(f"candidates[{i}]에 '{k}' 키가 없습니다.")
+                rows.append(r)
+
+        lines: List[str] = []
+        for r in rows:
+            name = str(PromptTemplates._coalesce(r.get("name", ""))).strip()
+            address = str(PromptTemplates._coalesce(r.get("address", ""))).strip()
+            lat = r.get("latitude", "")
+            lng = r.get("longitude", "")
+            category = str(PromptTemplates._coalesce(r.get("category", ""))).strip()
+            keywords = str(PromptTemplates._coalesce(r.get("keywords", ""))).strip()
+            gu = str(PromptTemplates._coalesce(r.get("gu", ""))).strip()
+
+            if len(keywords) > keyword_chars:
+                keywords = keywords[:keyword_chars].rstrip() + "…" if keyword_chars > 0 else ""
+
+            lines.append(
+                f"- name:{name} | address:{address} | lat:{lat},lng:{lng} | category:{category} | keywords:{keywords} | gu:{gu}"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def get_itinerary_prompt(
+        data: Dict[str, Any],
+        candidates: Union[pd.DataFrame, List[Dict[str, Any]]],
+        codec=None,
+        keyword_chars: int = KEYWORD_CHARS,
+    ) -> str:
+        """
+        감정과 테마에 따른 맞춤형 프롬프트 = 정적 접두부(*_PREFIX) + 요청별 부분(*_SUFFIX만 format)
+        codec(CandidateCodec)이 있으면 압축 모드: 후보는 id 표로, 응답은 id/시간/이유만 받는다
+        """
+        emotions = data.get("emotions", []) or []
+        themes = data.get("themes", []) or []
+        days = int(data.get("days", 1) or 1)
+        nights = int(data.get("nights", max(days - 1, 0)))
+        start = str(data.get("start", "YYYY-MM-DD"))
+        end = str(data.get("end", "YYYY-MM-DD"))
+        purpose = str(data.get("purpose", "")).strip()
+
+        emotion_desc = ", ".join([PromptTemplates.EMOTION_STYLES.get(e, e) for e in emotions]) or "사용자 감정"
+        theme_desc = ", ".join([PromptTemplates.THEME_KEYWORDS.get(t, t) for t in themes]) or "선택 테마"
+
+        fields = dict(
+            start=start,
+            end=end,
+            nights=nights,
+            days=days,
+            purpose=purpose,
+            emotion_desc=emotion_desc,
+            theme_desc=theme_desc,
+        )
+        if codec is not None:
+            return PromptTemplates.COMPACT_PREFIX + PromptTemplates.COMPACT_SUFFIX.format(
+                filtered_places=codec.block(), **fields
+            )
+
+        filtered_places = PromptTemplates._render_candidates_block(candidates, keyword_chars)
+        return PromptTemplates.VERBOSE_PREFIX + PromptTemplates.VERBOSE_SUFFIX.format(
+            filtered_places=filtered_places, **fields
+        )
+
+    @staticmethod
+    def split_prompt(prompt: str) -> Tuple[str, str]:
+        """프롬프트 → (정적 접두부, 요청별 나머지). 알려진 접두부로 시작하지 않으면 ("", prompt)"""
+        for prefix in PromptTemplates.STATIC_PREFIXES:
+            if prompt.startswith(prefix):
+                return prefix, prompt[len(prefix):]
+        return "", prompt
+
+    @staticmethod
+    def get_day_prompt(
+        data: Dict[str, Any],
+        candidates: Union[pd.DataFrame, List[Dict[str, Any]]],
+        day: int,
+        date: str,
+        codec=None,
+        keyword_chars: int = KEYWORD_CHARS,
+    ) -> str:
+        """
+        병렬 일차별 생성용 프롬프트: 해당 날짜 하루 + 그 날 군집 후보만 담은 1일 일정 프롬프트에
+        전체 여행 중 몇 일차인지(시작/종료 시간 규칙)를 덧붙인다
+        """
+        total_days = int(data.get("days", 1) or 1)
+        day_data = {**data, "start": date, "end": date, "days": 1, "nights": 0}
+        prompt = PromptTemplates.get_itinerary_prompt(day_data, candidates, codec, keyword_chars)
+
+        if day == total_days:
+            time_rule = "이 날은 여행 마지막 날이므로 17:00 이전에 종료하세요."
+        else:
+            time_rule = "이 날은 마지막 날이 아니므로 17:00 종료 규칙 대신 저녁(18:00~20:00) 식당을 포함해 21:00 이전에 종료하세요."
+        if day > 1:
+            time_rule += " 첫날이 아니어도 09:00~10:00 사이에 시작하세요."
+
+        return prompt + f"""
+---
+
+## 📅 일차 지시 (위 규칙보다 우선)
+- 이 요청은 전체 {total_days}일 여행 중 **{day}일차({date}) 하루만** 계획합니다.
+- `itinerary`에는 day={day}, date="{date}" 객체 **하나만** 넣으세요.
+- 위 장소 목록은 이 날 동선에 맞게 미리 묶인 후보입니다. 다른 날과 장소가 겹치지 않도록 목록 밖 장소는 쓰지 마세요.
+- {time_rule}
+"""
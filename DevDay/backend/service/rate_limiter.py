@@ -0,0 +1,183 @@
+import email.utils
+import logging
+import random
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name       TEXT PRIMARY KEY,
+    tokens     REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hold (
+    id    INTEGER PRIMARY KEY CHECK (id = 1),
+    until REAL NOT NULL
+);
+"""
+
+# Gemini 429 본문의 RetryInfo ("retryDelay": "35s") / SDK 예외 메시지 (retry_delay { seconds: 35 })
+_RETRY_DELAY_RE = re.compile(r'"?retry_?delay"?\s*[:{]\s*(?:seconds\s*:\s*)?"?(\d+(?:\.\d+)?)s?"?', re.IGNORECASE)
+
+
+class RateLimited(RuntimeError):
+    """쿼터 초과(429) 또는 한도 내 대기 시간 초과. retry_after — 서버/리미터가 제시한 대기 시간(초)"""
+
+    def __init__(self, message: str, retry_after: Union[float, None] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(header: Union[str, None] = None, body: Union[str, None] = None) -> Union[float, None]:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 없으면 본문/메시지의 retryDelay → 초. 둘 다 없으면 None"""
+    if header:
+        header = header.strip()
+        try:
+            return max(float(header), 0.0)
+        except ValueError:
+            try:
+                return max(email.utils.parsedate_to_datetime(header).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    if body:
+        m = _RETRY_DELAY_RE.search(body)
+        if m:
+            return float(m.group(1))
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 1.0,
+    cap: float = 30.0,
+    retry_after: Union[float, None] = None,
+) -> float:
+    """
+    attempt(0부터)번째 재시도 대기 시간.
+    서버 힌트가 있으면 그 시간 + 작은 지터, 없으면 full jitter 지수 백오프 U(0, min(cap, base·2^attempt)).
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, min(1.0, retry_after * 0.1 + 0.1))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RateLimiter:
+    """
+    Gemini 쿼터(RPM/TPM) 토큰 버킷. 상태는 SQLite 파일에 두고 BEGIN IMMEDIATE 잠금으로 갱신하므로
+    같은 호스트의 모든 스레드/워커 프로세스가 한 버킷을 나눠 쓴다.
+    - requests 버킷: 용량 rpm, 초당 rpm/60 충전, 요청당 1
+    - tokens 버킷: 용량 tpm, 초당 tpm/60 충전, 요청당 추정 토큰 수
+    두 버킷이 모두 허용할 때만 차감(원자적)하고, 아니면 부족분이 찰 때까지만 기다린다.
+    429를 받으면 hold()로 서버가 제시한 시각까지 모든 워커의 요청을 멈춘다.
+    rpm이 0 이하이면 비활성화.
+    """
+
+    def __init__(self, path: Union[str, Path], rpm: float, tpm: float = 0.0, max_wait: float = 20.0):
+        self.path = Path(path)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self.enabled = rpm > 0
+        self._local = threading.local()
+        self.waited = 0.0
+        self.throttled = 0
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (트랜잭션은 직접 관리)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _buckets(self, tokens: float) -> Dict[str, tuple]:
+        """이름 → (용량, 초당 충전량, 이번 요청 비용). 용량보다 큰 비용은 용량으로 자른다"""
+        buckets = {"requests": (self.rpm, self.rpm / 60.0, 1.0)}
+        if self.tpm > 0:
+            buckets["tokens"] = (self.tpm, self.tpm / 60.0, min(float(tokens), self.tpm))
+        return buckets
+
+    def _try_take(self, tokens: float) -> float:
+        """차감 성공이면 0, 아니면 다시 시도하기까지 기다릴 시간(초)"""
+        conn = self._conn()
+        buckets = self._buckets(tokens)
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT until FROM hold WHERE id = 1").fetchone()
+            wait = max((row[0] - now) if row else 0.0, 0.0)
+
+            state = dict(
+                (name, (level, updated))
+                for name, level, updated in conn.execute("SELECT name, tokens, updated_at FROM buckets")
+            )
+            levels = {}
+            for name, (capacity, rate, cost) in buckets.items():
+                level, updated = state.get(name, (capacity, now))
+                level = min(capacity, level + max(now - updated, 0.0) * rate)
+                levels[name] = level
+                if level < cost:
+                    wait = max(wait, (cost - level) / rate)
+
+            if wait <= 0:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    [(name, levels[name] - buckets[name][2], now) for name in buckets],
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def acquire(self, tokens: float = 0.0, max_wait: Union[float, None] = None) -> float:
+        """요청 1건(+토큰) 허가를 받을 때까지 대기. 기다린 시간 반환, max_wait를 넘겨야 하면 RateLimited"""
+        if not self.enabled:
+            return 0.0
+        max_wait = self.max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+        while True:
+            try:
+                wait = self._try_take(tokens)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 레이트 리미터 상태 접근 실패 → 제한 없이 진행: {e}")
+                return 0.0
+            waited = time.monotonic() - started
+            if wait <= 0:
+                if waited > 0:
+                    self.waited += waited
+                    logger.info(f"   🪣 쿼터 대기 {waited:.1f}초")
+                return waited
+            if waited + wait > max_wait:
+                raise RateLimited(f"쿼터 대기 시간 초과 (필요 {wait:.1f}초)", retry_after=wait)
+            self.throttled += 1
+            # 여러 워커가 같은 순간에 깨어나 몰리지 않도록 약간의 지터
+            time.sleep(wait + random.uniform(0, 0.05))
+
+    def hold(self, seconds: float) -> None:
+        """서버가 제시한 시간 동안 모든 워커의 요청을 보류 (기존 보류보다 짧으면 무시)"""
+        if not self.enabled or seconds <= 0:
+            return
+        try:
+            self._conn().execute(
+                "INSERT INTO hold (id, until) VALUES (1, ?) "
+                "ON CONFLICT(id) DO UPDATE SET until = MAX(until, excluded.until)",
+                (time.time() + seconds,),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 레이트 리미터 보류 기록 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        return {"enabled": True, "rpm": self.rpm, "tpm": self.tpm, "throttled": self.throttled, "waited_s": round(self.waited, 2)}
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Union
+
+from backend.untils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at);
+"""
+
+
+def response_key(model: str, generation_config: Dict[str, Any], prompt: str) -> str:
+    """(모델, 생성 설정, 프롬프트) → sha256 키"""
+    h = hashlib.sha256()
+    h.update((model or "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(json.dumps(generation_config or {}, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    h.update(b"\0")
+    h.update((prompt or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    검증을 통과한 LLM 응답(JSON)의 디스크 캐시.
+    - SQLite(WAL) 파일 하나를 모든 워커 프로세스가 공유하고, 재시작 후에도 유지된다
+    - TTL이 지난 항목은 읽을 때/저장할 때 정리, 전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 삭제
+    - 프로세스 내 LRU를 앞단에 두어 같은 키 반복 조회는 디스크를 타지 않는다
+    ttl이 0 이하이면 비활성화(항상 미스, 저장 안 함).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = 86400.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        memory_entries: int = 128,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = ttl > 0
+        self._local = threading.local()
+        self._memory = LRUCache(maxsize=memory_entries, ttl=ttl if self.enabled else None, name="responses")
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._conn() as conn:
+                conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않는다)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Union[Dict[str, Any], None]:
+        if not self.enabled:
+            return None
+        hit = self._memory.get(key)
+        if hit is not None:
+            return json.loads(hit)
+
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 응답 캐시 조회 실패: {e}")
+            return None
+
+        # 메모리 캐시는 디스크 만료 시각을 넘기지 않게 남은 수명만큼만 보관
+        self._memory.set(key, value, ttl=max(expires_at - now, 0.0))
+        return json.loads(value)
+
+    def put(self, key: str, value: Dict[str, Any], model: str = "") -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, payload, size, now, now + self.ttl, now),
+            )
+            self._prune(conn, now)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 응답 캐시 저장 실패: {e}")
+            return
+        self._memory.set(key, payload)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료 항목 삭제 + 크기 상한 초과분을 오래 안 쓴 순으로 삭제"""
+        conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims, freed = [], 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        for (key,) in victims:
+            self._memory.delete(key)
+        logger.info(f"   🧹 응답 캐시 용량 초과 → {len(victims)}건 삭제")
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        count, total = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"enabled": True, "entries": count, "bytes": total, "memory": self._memory.stats()}
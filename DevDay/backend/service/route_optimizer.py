@@ -1,6 +1,10 @@
 from math import radians, sin, cos, sqrt, atan2
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from backend.services.spatial_index import pairwise_km
+
 class RouteOptimizer:
     @staticmethod
     def haversine_distance(lat1, lon1, lat2, lon2):
@@ -35,24 +39,23 @@ class RouteOptimizer:
         # 식사 시간 기준으로 정렬
         meal_times.sort(key=lambda x: x['start_time'])
         
-        # 유연한 장소들은 가까운 순서로 재배치
+        # 유연한 장소들은 가까운 순서로 재배치 (거리 행렬 1회 계산 후 최근접 이웃)
         if flexible_places:
-            optimized_flexible = [flexible_places[0]]
-            remaining = flexible_places[1:]
+            dist = pairwise_km(
+                [p['latitude'] for p in flexible_places],
+                [p['longitude'] for p in flexible_places],
+            )
+            unvisited = np.ones(len(flexible_places), dtype=bool)
+            unvisited[0] = False
+            route = [0]
             
-            while remaining:
-                last = optimized_flexible[-1]
-                nearest = min(
-                    remaining,
-                    key=lambda p: RouteOptimizer.haversine_distance(
-                        last['latitude'], last['longitude'],
-                        p['latitude'], p['longitude']
-                    )
-                )
-                optimized_flexible.append(nearest)
-                remaining.remove(nearest)
+            while unvisited.any():
+                # 동률이면 원래 순서가 앞선 장소 (argmin은 첫 최소값)
+                nearest = int(np.argmin(np.where(unvisited, dist[route[-1]], np.inf)))
+                route.append(nearest)
+                unvisited[nearest] = False
             
-            flexible_places = optimized_flexible
+            flexible_places = [flexible_places[i] for i in route]
         
         # 시간대별로 병합
         result = []
@@ -0,0 +1,125 @@
+import math
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+_EMPTY_ROWS = np.zeros(0, dtype=np.int64)
+_EMPTY_DIST = np.zeros(0, dtype=np.float64)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """벡터화된 haversine 거리 (km). 스칼라/배열 모두 브로드캐스팅"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def pairwise_km(lats, lngs) -> np.ndarray:
+    """n개 지점 간 거리 행렬 (n×n, km)"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    return haversine_km(lats[:, None], lngs[:, None], lats[None, :], lngs[None, :])
+
+
+class SpatialIndex:
+    """
+    위경도 균일 격자 인덱스.
+    - 셀 크기 cell_km(기본 1km) 격자에 행을 버킷팅하고, 셀 키 순으로 정렬된 CSR 배열로 보관
+    - 반경/박스 질의는 겹치는 셀 구간만 searchsorted로 잘라 후보를 모은 뒤 거리로 정밀 필터
+    - k-최근접은 반경을 2배씩 넓혀 k개 이상 확보되면 종료
+    행 id는 인덱스를 만든 DataFrame의 위치(iloc) 기준.
+    """
+
+    def __init__(self, lats, lngs, cell_km: float = 1.0):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.cell_km = cell_km
+
+        mid_lat = float(np.nanmean(self.lats)) if len(self.lats) else 35.0
+        self.dlat = cell_km / KM_PER_DEG_LAT
+        self.dlng = cell_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(mid_lat)), 0.01))
+        self.lat0 = float(np.nanmin(self.lats)) if len(self.lats) else 0.0
+        self.lng0 = float(np.nanmin(self.lngs)) if len(self.lngs) else 0.0
+
+        ci, cj = self._cell(self.lats, self.lngs)
+        self.n_cols = int(cj.max()) + 1 if len(cj) else 1
+        keys = ci * self.n_cols + cj
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "SpatialIndex":
+        return cls(df["latitude"].to_numpy(), df["longitude"].to_numpy())
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def _cell(self, lat, lng) -> Tuple[np.ndarray, np.ndarray]:
+        ci = np.floor((np.asarray(lat) - self.lat0) / self.dlat).astype(np.int64)
+        cj = np.floor((np.asarray(lng) - self.lng0) / self.dlng).astype(np.int64)
+        return ci, cj
+
+    def _rows_in_cells(self, i0: int, i1: int, j0: int, j1: int) -> np.ndarray:
+        """셀 사각형 [i0..i1]×[j0..j1]에 속한 행 id"""
+        j0, j1 = max(j0, 0), min(j1, self.n_cols - 1)
+        if j0 > j1 or not len(self.sorted_keys):
+            return _EMPTY_ROWS
+        i0 = max(i0, int(self.sorted_keys[0] // self.n_cols))
+        i1 = min(i1, int(self.sorted_keys[-1] // self.n_cols))
+        if i0 > i1:
+            return _EMPTY_ROWS
+        rows_i = np.arange(i0, i1 + 1, dtype=np.int64) * self.n_cols
+        lo = np.searchsorted(self.sorted_keys, rows_i + j0, side="left")
+        hi = np.searchsorted(self.sorted_keys, rows_i + j1, side="right")
+        parts = [self.order[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+        if not parts:
+            return _EMPTY_ROWS
+        return np.concatenate(parts)
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lng)에서 radius_km 이내 행 id와 거리 (가까운 순)"""
+        reach_i = int(math.ceil(radius_km / self.cell_km))
+        # 경도 1칸의 실제 폭은 위도에 따라 줄어드므로, 질의 범위의 고위도 쪽 기준으로 넉넉히 잡는다
+        far_lat = min(abs(lat) + radius_km / KM_PER_DEG_LAT, 89.9)
+        lng_cell_km = self.dlng * KM_PER_DEG_LAT * math.cos(math.radians(far_lat))
+        reach_j = int(math.ceil(radius_km / lng_cell_km))
+        ci, cj = self._cell(lat, lng)
+        cand = self._rows_in_cells(int(ci) - reach_i, int(ci) + reach_i, int(cj) - reach_j, int(cj) + reach_j)
+        if not len(cand):
+            return _EMPTY_ROWS, _EMPTY_DIST
+        dist = haversine_km(lat, lng, self.lats[cand], self.lngs[cand])
+        keep = dist <= radius_km
+        cand, dist = cand[keep], dist[keep]
+        order = np.lexsort((cand, dist))
+        return cand[order], dist[order]
+
+    def nearest(
+        self, lat: float, lng: float, k: int = 10, max_radius_km: Union[float, None] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lng)에서 가장 가까운 k개 행 id와 거리"""
+        if k <= 0 or not len(self):
+            return _EMPTY_ROWS, _EMPTY_DIST
+        radius = self.cell_km
+        limit = max_radius_km if max_radius_km is not None else float("inf")
+        while True:
+            r = min(radius, limit)
+            rows, dist = self.within_radius(lat, lng, r)
+            if len(rows) >= k or r >= limit or len(rows) == len(self):
+                return rows[:k], dist[:k]
+            if radius > 2 * EARTH_RADIUS_KM * math.pi:
+                return rows[:k], dist[:k]
+            radius *= 2
+
+    def bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> np.ndarray:
+        """위경도 사각형 안의 행 id (오름차순)"""
+        ci, cj = self._cell([min_lat, max_lat], [min_lng, max_lng])
+        cand = self._rows_in_cells(int(ci[0]), int(ci[1]), int(cj[0]), int(cj[1]))
+        inside = (
+            (self.lats[cand] >= min_lat) & (self.lats[cand] <= max_lat)
+            & (self.lngs[cand] >= min_lng) & (self.lngs[cand] <= max_lng)
+        )
+        return np.sort(cand[inside])
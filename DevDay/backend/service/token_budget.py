@@ -0,0 +1,137 @@
+import logging
+import threading
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 보정 전 기본값: 한글 위주 프롬프트 ≈ 2자당 1토큰
+DEFAULT_CHARS_PER_TOKEN = 2.0
+# 키워드 스니펫 길이 후보 (긴 것부터 시도)
+SNIPPET_LADDER = (220, 160, 120, 80, 60, 40, 20, 0)
+# 후보 한 줄의 고정 서식 글자 수 (필드 이름/구분자/좌표)
+VERBOSE_LINE_OVERHEAD = 80
+COMPACT_LINE_OVERHEAD = 25
+# 하루 5~6곳 → 최소 후보 수 = 일수 × 6
+MIN_CANDIDATES_PER_DAY = 6
+
+
+class TokenEstimator:
+    """
+    모델별 글자/토큰 비율 (입력 프롬프트 / 출력 응답 따로).
+    응답의 usageMetadata(실제 토큰 수)로 지수이동평균 보정 → 쓸수록 추정이 맞아진다. 프로세스 내 유지.
+    """
+
+    def __init__(self, default_ratio: float = DEFAULT_CHARS_PER_TOKEN, alpha: float = 0.2):
+        self.default_ratio = default_ratio
+        self.alpha = alpha
+        self._ratios: Dict[Tuple[str, str], float] = {}
+        self._samples: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def ratio(self, model: Union[str, None], kind: str = "input") -> float:
+        with self._lock:
+            return self._ratios.get((model or "", kind), self.default_ratio)
+
+    def tokens(self, model: Union[str, None], chars: int, kind: str = "input") -> int:
+        return int(chars / self.ratio(model, kind)) + 1
+
+    def record(self, model: str, chars: int, tokens: Any, kind: str = "input") -> None:
+        """실제 사용량 1건 반영 (tokens가 없거나 0이면 무시)"""
+        try:
+            tokens = int(tokens)
+        except (TypeError, ValueError):
+            return
+        if tokens <= 0 or chars <= 0:
+            return
+        observed = chars / tokens
+        key = (model or "", kind)
+        with self._lock:
+            prev = self._ratios.get(key)
+            self._ratios[key] = observed if prev is None else prev + self.alpha * (observed - prev)
+            self._samples[key] = self._samples.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                f"{model}:{kind}": {"chars_per_token": round(ratio, 3), "samples": self._samples.get((model, kind), 0)}
+                for (model, kind), ratio in self._ratios.items()
+            }
+
+
+class CandidateLineStats:
+    """카탈로그 후보 한 줄 길이 통계 (카탈로그 스냅샷 인덱스로 등록, 데이터 변경 시 재계산)"""
+
+    def __init__(self, field_chars: float, keyword_lengths: np.ndarray):
+        self.field_chars = field_chars
+        self.keyword_lengths = np.sort(np.asarray(keyword_lengths, dtype=np.int64))
+        self._prefix = np.concatenate([[0], np.cumsum(self.keyword_lengths)])
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "CandidateLineStats":
+        fields = sum(df[c].fillna("").astype(str).str.len() for c in ("name", "address", "category", "gu"))
+        keywords = df["keywords"].fillna("").astype(str).str.len().to_numpy()
+        return cls(float(fields.mean()) if len(df) else 0.0, keywords)
+
+    def keyword_chars(self, snippet: int) -> float:
+        """스니펫 길이 제한 시 평균 키워드 글자 수 = mean(min(len, snippet))"""
+        n = len(self.keyword_lengths)
+        if not n or snippet <= 0:
+            return 0.0
+        k = int(np.searchsorted(self.keyword_lengths, snippet, side="left"))
+        return float(self._prefix[k] + (n - k) * (snippet + 1)) / n
+
+    def line_chars(self, snippet: int, compact: bool) -> float:
+        overhead = COMPACT_LINE_OVERHEAD if compact else VERBOSE_LINE_OVERHEAD
+        return self.field_chars + overhead + self.keyword_chars(snippet)
+
+
+class PromptBudget:
+    """
+    요청 1건의 입력 토큰 예산 안에서 후보 수와 키워드 스니펫 길이를 정한다.
+    - 상한(max_candidates)개가 들어가는 가장 긴 스니펫을 고르고,
+    - 가장 짧은 스니펫으로도 안 들어가면 들어가는 만큼 줄이되 일수 × 6개 아래로는 줄이지 않는다.
+    budgets: 모델별 예산(토큰), 없으면 default_budget.
+    """
+
+    def __init__(self, estimator: TokenEstimator, default_budget: int, budgets: Union[Dict[str, int], None] = None):
+        self.estimator = estimator
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+
+    def budget(self, model: Union[str, None]) -> int:
+        return self.budgets.get(model or "", self.default_budget)
+
+    def plan(
+        self,
+        model: Union[str, None],
+        template_chars: int,
+        stats: CandidateLineStats,
+        days: int,
+        max_candidates: int,
+        max_snippet: int,
+        compact: bool,
+        requests: int = 1,
+    ) -> Tuple[int, int]:
+        """
+        (후보 수, 스니펫 길이). requests>1이면 후보가 요청(일차)별로 나뉘어 들어가는 것으로 계산.
+        """
+        budget = self.budget(model)
+        template_tokens = self.estimator.tokens(model, template_chars)
+        floor = min(max_candidates, days * MIN_CANDIDATES_PER_DAY)
+        ladder = [s for s in SNIPPET_LADDER if s <= max_snippet] or [0]
+
+        best = None
+        for snippet in ladder:
+            line_tokens = max(self.estimator.tokens(model, int(stats.line_chars(snippet, compact))), 1)
+            fit = max(int((budget - template_tokens) / line_tokens), 0) * requests
+            if fit >= max_candidates:
+                return max_candidates, snippet
+            best = (max(fit, floor), snippet)
+
+        n, snippet = best
+        if n == floor and floor > 0:
+            logger.warning(f"   ⚠️ 토큰 예산 {budget} 부족 → 최소 후보 {floor}개로 진행 (스니펫 {snippet}자)")
+        return n, snippet
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Config는 임포트 시 API 키를 요구하므로 테스트용 값을 넣는다 (실제 호출은 하지 않음).
+# 디스크 캐시(SQLite)는 실행마다 임시 디렉터리에 둔다
+os.environ.setdefault("GEMINI_API_KEY", "test")
+_CACHE_DIR = tempfile.mkdtemp(prefix="gildam-test-")
+for _name in ("RESPONSE_CACHE_PATH", "PROFILE_CACHE_PATH", "MODEL_REGISTRY_PATH", "RATE_LIMIT_PATH"):
+    os.environ.setdefault(_name, os.path.join(_CACHE_DIR, _name.lower() + ".sqlite3"))
@@ -0,0 +1,34 @@
+import pytest
+
+from backend.app import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize("query", [
+    "lat=35.16&lng=129.16&k=0",
+    "lat=35.16&lng=129.16&k=-1",
+    "lat=35.16&lng=129.16&radius=0",
+    "lat=35.16&lng=129.16&radius=-2",
+    "lat=35.16&lng=129.16&radius=inf",
+    "lat=nan&lng=129.16",
+    "lat=35.16&lng=inf",
+    "lat=35.16",
+    "lat=35.16&lng=abc",
+])
+def test_nearby_rejects_invalid_params(client, query):
+    response = client.get(f"/api/places/nearby?{query}")
+    assert response.status_code == 400
+    assert "숫자여야" in response.get_json()["error"]
+
+
+def test_nearby_returns_closest_first(client):
+    response = client.get("/api/places/nearby?lat=35.1587&lng=129.1604&radius=2&k=3")
+    assert response.status_code == 200
+    places = response.get_json()["places"]
+    assert 0 < len(places) <= 3
+    distances = [p["distance_km"] for p in places]
+    assert distances == sorted(distances) and distances[-1] <= 2
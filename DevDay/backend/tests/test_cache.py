@@ -0,0 +1,138 @@
+import threading
+import time
+
+from backend.untils.cache import LRUCache, cache, make_key
+
+
+def test_ttl_expiry_on_read_and_purge():
+    store = LRUCache(ttl=0.05)
+    store.set("a", 1)
+    store.set("b", 2, ttl=None)
+    assert store.get("a") == 1
+    time.sleep(0.1)
+    assert store.get("a") is None
+    assert store.get("b") == 2
+
+    store.set("c", 3)
+    time.sleep(0.1)
+    assert store.purge_expired() == 1
+    assert "b" in store and len(store) == 1
+    assert store.stats()["expirations"] == 2
+
+
+def test_lru_eviction_by_count_and_bytes():
+    store = LRUCache(maxsize=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    assert "b" not in store and "a" in store and "c" in store
+    assert store.evictions == 1
+
+    sized = LRUCache(maxsize=None, max_bytes=10, sizeof=len)
+    sized.set("x", "12345")
+    sized.set("y", "1234")
+    sized.set("z", "123")
+    assert "x" not in sized and sized.stats()["bytes"] == 7
+    sized.set("big", "x" * 11)
+    assert "big" not in sized
+
+
+def test_concurrent_misses_compute_once():
+    store = LRUCache()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_compute("k", compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while store.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert store.stats()["in_flight"] == 0
+
+
+def test_single_flight_error_reaches_waiters_and_is_not_cached():
+    store = LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            store.get_or_compute("k", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    deadline = time.monotonic() + 5
+    while store.coalesced < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert len(errors) == 2
+    assert store.get_or_compute("k", lambda: 42) == 42
+
+
+def test_make_key_ignores_dict_and_set_order():
+    assert make_key({"a": 1, "b": {2, 1}}) == make_key({"b": {1, 2}, "a": 1})
+    assert make_key([1, 2]) != make_key([2, 1])
+
+
+def test_make_key_keeps_dict_key_types_apart():
+    assert make_key({1: "a"}) != make_key({"1": "a"})
+    assert make_key({True: "a"}) != make_key({"true": "a"})
+    assert make_key({(1, 2): "a"}) != make_key({"[1, 2]": "a"})
+    assert make_key({None: 1}) != make_key({"null": 1})
+    assert make_key({1: "a", "b": 2}) == make_key({"b": 2, 1: "a"})
+
+    calls = []
+
+    @cache(ttl=None)
+    def lookup(table):
+        calls.append(table)
+        return [type(k) for k in table]
+
+    assert lookup({1: "a"}) == [int]
+    assert lookup({"1": "a"}) == [str]
+    assert len(calls) == 2
+
+
+def test_cache_decorator_accepts_unhashable_args():
+    calls = []
+
+    @cache(ttl=None, maxsize=4)
+    def load(trip):
+        calls.append(trip)
+        return len(trip["themes"])
+
+    assert load({"themes": ["바다", "맛집"]}) == 2
+    assert load({"themes": ["바다", "맛집"]}) == 2
+    assert len(calls) == 1
+    assert load.cache_info()["hits"] == 1
+    load.cache_clear()
+    assert load({"themes": ["바다"]}) == 1
+    assert len(calls) == 2
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from backend.services.context_cache import LocalContextCache, min_cache_tokens
+from backend.services.gemini_service import GeminiService, _AttemptLog
+from backend.services.prompt_templates import PromptTemplates
+from backend.services.token_budget import TokenEstimator
+
+MODEL = "models/gemini-2.5-flash"
+
+
+def _payload(prompt):
+    return {"contents": [{"role": "user", "parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.8}}
+
+
+def _service(cache):
+    return SimpleNamespace(context_cache=cache, token_estimator=TokenEstimator())
+
+
+def test_prefix_is_stripped_and_cached_content_is_set():
+    cache = LocalContextCache()
+    prefix = "규칙 " * min_cache_tokens(MODEL)
+    payload = _payload(prefix + "요청별 나머지")
+
+    sent, api = GeminiService._with_context(_service(cache), MODEL, payload, prefix)
+
+    assert api == "v1beta"
+    assert sent["contents"][0]["parts"][0]["text"] == "요청별 나머지"
+    assert sent["generationConfig"] == payload["generationConfig"]
+    assert cache.resolve(sent["cachedContent"]) == prefix
+    # 원래 페이로드는 그대로 (캐시 거부 시 전체 프롬프트로 다시 보냄)
+    assert payload["contents"][0]["parts"][0]["text"].startswith(prefix)
+
+    again, _ = GeminiService._with_context(_service(cache), MODEL, payload, prefix)
+    assert again["cachedContent"] == sent["cachedContent"]
+    assert cache.stats()["creates"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_prefix_below_model_minimum_is_sent_inline():
+    cache = LocalContextCache()
+    prefix, _ = PromptTemplates.split_prompt(PromptTemplates.COMPACT_PREFIX + "요청별 나머지")
+    payload = _payload(PromptTemplates.COMPACT_PREFIX + "요청별 나머지")
+
+    sent, api = GeminiService._with_context(_service(cache), MODEL, payload, prefix)
+
+    assert (sent, api) == (payload, "v1")
+    stats = cache.stats()
+    assert stats["creates"] == 0 and stats["failures"] == 0 and stats["skipped"] == 1
+    assert stats["blocked_models"] == []
+
+
+def test_discarded_handle_blocks_model():
+    cache = LocalContextCache(retry_after=600)
+    prefix = "규칙 " * min_cache_tokens(MODEL)
+    assert cache.handle(MODEL, prefix) is not None
+    cache.discard(MODEL, prefix)
+    assert cache.handle(MODEL, prefix) is None
+    assert cache.stats()["blocked_models"] == [MODEL]
+
+
+class _Response:
+    def __init__(self, status, data=None):
+        self.status_code = status
+        self.data = data or {}
+        self.text = ""
+        self.headers = {}
+
+    def json(self):
+        return self.data
+
+    def close(self):
+        pass
+
+
+def test_rejected_handle_retries_full_prompt_under_one_acquire():
+    cache = LocalContextCache()
+    payload = _payload("접두부 나머지")
+    posts, acquired = [], []
+    ok = {"candidates": [{"content": {"parts": [{"text": "응답"}]}}]}
+
+    svc = object.__new__(GeminiService)
+    svc.context_cache = cache
+    svc._with_context = lambda name, payload, prefix: ({**payload, "cachedContent": "h"}, "v1beta")
+    svc.rate_limiter = SimpleNamespace(acquire=acquired.append)
+
+    def post(url, headers, json, stream):
+        posts.append((url, json))
+        return _Response(404 if len(posts) == 1 else 200, ok)
+
+    svc.http = SimpleNamespace(post=post)
+    svc.model_registry = SimpleNamespace(record_success=lambda *a: None, record_failure=lambda *a: None)
+    svc.latency = SimpleNamespace(observe=lambda *a: None)
+    svc._record_usage = lambda *a: None
+    log = _AttemptLog()
+
+    assert svc._rest_attempt(MODEL, "0", payload, 7, log, prefix="접두부 ") == ("ok", "응답")
+    assert acquired == [7]
+    assert [url.split("/")[3] for url, _ in posts] == ["v1beta", "v1"]
+    assert posts[1][1] is payload
+    assert log.errors == [f"cache404:{MODEL}#p0"]
+    assert cache.stats()["rejected"] == 1
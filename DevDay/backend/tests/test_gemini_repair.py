@@ -0,0 +1,54 @@
+import pandas as pd
+
+from backend.services import gemini_service
+from backend.services.gemini_service import GeminiService
+from backend.services.json_extract import extract_json
+
+TRIP = {"days": 2, "start": "2025-05-01", "emotions": ["설렘"]}
+DAY1 = '{"day": 1, "places": [{"name": "해운대"}, {"name": "동백섬"}]}'
+DAY2 = '{"day": 2, "places": [{"name": "광안리"}, {"name": "민락"}]}'
+
+
+class _Repairer:
+    def repair_day(self, day, index):
+        return {"places": day["places"]} if day.get("places") else None
+
+
+def _service(monkeypatch):
+    svc = object.__new__(GeminiService)
+    svc._repairer = lambda candidates: _Repairer()
+    svc.regenerated = []
+
+    def generate_day(trip_data, cluster, day, date, keyword_chars):
+        svc.regenerated.append(day)
+        return {"places": [{"name": f"새 장소 {day}"}]}
+
+    svc._generate_day = generate_day
+    monkeypatch.setattr(gemini_service, "cluster_candidates", lambda frame, k: [frame] * k)
+    return svc
+
+
+def _repair(svc, text):
+    result, cut_depth = extract_json(text, openers="{")
+    return svc._repair_and_fill(TRIP, pd.DataFrame({"name": ["광안리"]}), result, 0, cut_depth=cut_depth)
+
+
+def test_cut_after_complete_day_keeps_it(monkeypatch):
+    svc = _service(monkeypatch)
+    result = _repair(svc, '{"summary": "s", "itinerary": [' + DAY1 + ', {"day": 2, "ti')
+    assert svc.regenerated == [2]
+    assert [p["name"] for p in result["itinerary"][0]["places"]] == ["해운대", "동백섬"]
+
+
+def test_missing_closing_brackets_keeps_last_day(monkeypatch):
+    svc = _service(monkeypatch)
+    result = _repair(svc, '{"summary": "s", "itinerary": [' + DAY1 + ', ' + DAY2)
+    assert svc.regenerated == []
+    assert [len(d["places"]) for d in result["itinerary"]] == [2, 2]
+
+
+def test_cut_inside_last_day_drops_it(monkeypatch):
+    svc = _service(monkeypatch)
+    result = _repair(svc, '{"summary": "s", "itinerary": [' + DAY1 + ', {"day": 2, "places": [{"name": "광안리"}, {"na')
+    assert svc.regenerated == [2]
+    assert result["itinerary"][1]["places"] == [{"name": "새 장소 2"}]
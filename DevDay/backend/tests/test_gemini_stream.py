@@ -0,0 +1,51 @@
+import pytest
+
+from backend.services.gemini_service import GeminiService
+
+
+class _Limiter:
+    def acquire(self, tokens):
+        pass
+
+
+def _service(chunks, fail_after):
+    """SDK 스트림이 fail_after개 조각을 보낸 뒤 끊기는 서비스 (REST 호출은 rest_calls에 기록)"""
+    svc = object.__new__(GeminiService)
+    svc._use_sdk = True
+    svc.model_name = "models/test"
+    svc.rate_limiter = _Limiter()
+    svc._estimate_tokens = lambda prompt: 1
+    svc.rest_calls = []
+
+    class _Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    def generate_content(prompt, stream):
+        for text in chunks[:fail_after]:
+            yield _Chunk(text)
+        raise RuntimeError("stream reset")
+
+    def rest(prompt, stream=False):
+        svc.rest_calls.append(prompt)
+        yield from chunks
+
+    svc._sdk_model = lambda name: type("M", (), {"generate_content": staticmethod(generate_content)})
+    svc._rest_generate_content = rest
+    return svc
+
+
+def test_sdk_failure_before_first_chunk_falls_back_to_rest():
+    svc = _service(['{"itinerary": [', "]}"], fail_after=0)
+    assert "".join(svc._stream_text("p")) == '{"itinerary": []}'
+    assert svc.rest_calls == ["p"]
+
+
+def test_sdk_failure_after_chunks_raises_instead_of_restreaming():
+    svc = _service(['{"itinerary": [', "]}"], fail_after=1)
+    received = []
+    with pytest.raises(RuntimeError):
+        for chunk in svc._stream_text("p"):
+            received.append(chunk)
+    assert received == ['{"itinerary": [']
+    assert svc.rest_calls == []
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from backend.services.itinerary_repair import ItineraryRepairer
+from backend.services.name_index import NameIndex
+
+CATALOG = pd.DataFrame({
+    "name": ["해운대해수욕장", "광안리해수욕장", "부산불꽃축제", "해운대 암소갈비집"],
+    "address": ["부산 해운대구 1", "부산 수영구 2", "부산 수영구 3", "부산 해운대구 4"],
+    "latitude": [35.1587, 35.1532, 35.1531, 35.1630],
+    "longitude": [129.1604, 129.1186, 129.1190, 129.1650],
+    "category": ["관광지", "관광지", "관광지", "식당"],
+    "keywords": ["바다", "야경", "축제", "갈비"],
+})
+
+
+def _place(name, start, end):
+    return {"name": name, "address": "?", "latitude": 0, "longitude": 0, "category": "관광지",
+            "start_time": start, "end_time": end, "duration": 60, "reason": "좋아요"}
+
+
+def _repairer(candidate_rows):
+    return ItineraryRepairer(CATALOG.iloc[candidate_rows], NameIndex.build(CATALOG), CATALOG)
+
+
+def test_places_outside_candidates_are_dropped():
+    # 축제(행 2)는 카탈로그에는 있지만 후보 필터가 뺀 곳
+    day = {"places": [
+        _place("해운대해수욕장", "09:00", "10:30"),
+        _place("부산불꽃축제", "11:00", "12:00"),
+        _place("광안리 해수욕장", "13:00", "14:00"),
+        _place("해운대 암소갈비집", "18:00", "19:30"),
+    ]}
+    repaired = _repairer([0, 1, 3]).repair_day(day, 1)
+
+    assert [p["name"] for p in repaired["places"]] == ["해운대해수욕장", "광안리해수욕장", "해운대 암소갈비집"]
+    # 정본 값으로 덮어씀
+    assert repaired["places"][2]["category"] == "식당"
+    assert repaired["places"][0]["address"] == "부산 해운대구 1"
+
+
+def test_day_below_minimum_after_dropping_is_unrecoverable():
+    day = {"places": [_place("해운대해수욕장", "09:00", "10:00"), _place("부산불꽃축제", "11:00", "12:00"),
+                      _place("광안리해수욕장", "13:00", "14:00")]}
+    assert _repairer([0, 1]).repair_day(day, 1) is None
@@ -0,0 +1,94 @@
+import json
+import time
+from itertools import islice
+
+import pytest
+
+from backend import app as app_module
+from backend.services.job_queue import DONE, FAILED, JobQueue
+
+RESULT = {"itinerary": [{"day": 1, "places": []}]}
+
+
+def _run(payload, report):
+    report("generating", "생성 중")
+    report("day", "1일차", {"day": 1})
+    if payload.get("fail"):
+        return None
+    return RESULT
+
+
+def _finished(job):
+    deadline = time.monotonic() + 5
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _frames(stream):
+    """SSE 텍스트 → (event, data) 목록 (heartbeat 주석 제외)"""
+    frames = []
+    for chunk in stream:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if fields:
+            frames.append((fields["event"], json.loads(fields["data"])))
+    return frames
+
+
+def test_stream_replays_progress_then_done():
+    queue = JobQueue(_run, workers=1)
+    job = _finished(queue.submit({}))
+    frames = _frames(queue.stream(job))
+    assert [name for name, _ in frames] == ["progress", "progress", "progress", "day", DONE]
+    assert frames[-1][1]["result"] == RESULT
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_stream_after_terminal_event_sends_it_again_and_stops(fail):
+    queue = JobQueue(_run, workers=1)
+    job = _finished(queue.submit({"fail": fail}))
+    # 재연결이 반복 keep-alive로 돌면 islice 상한까지 채워진다
+    chunks = list(islice(queue.stream(job, after=len(job.events), heartbeat=0.01), 10))
+    frames = _frames(chunks)
+    assert len(chunks) == 1
+    if fail:
+        assert frames == [(FAILED, {**job.events[-1], "error": "일정 생성 실패"})]
+    else:
+        assert frames == [(DONE, {**job.events[-1], "result": RESULT})]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module.job_queue, "run", _run)
+    return app_module.app.test_client()
+
+
+def test_submit_poll_and_sse(client):
+    payload = {field: "x" for field in app_module.REQUIRED_FIELDS}
+    response = client.post("/api/jobs", json=payload)
+    assert response.status_code == 202
+    body = response.get_json()
+
+    deadline = time.monotonic() + 5
+    status = client.get(body["status_url"]).get_json()
+    while status["status"] != DONE and time.monotonic() < deadline:
+        time.sleep(0.01)
+        status = client.get(body["status_url"]).get_json()
+    assert status["result"] == RESULT
+
+    events = client.get(body["events_url"])
+    assert events.mimetype == "text/event-stream"
+    frames = _frames(events.get_data(as_text=True).split("\n\n"))
+    assert [name for name, _ in frames][-2:] == ["day", DONE]
+
+    last_id = status["events"][-1]["seq"]
+    for header in (str(last_id), str(last_id + 50), "-10"):
+        resumed = _frames(client.get(body["events_url"], headers={"Last-Event-ID": header}).get_data(as_text=True).split("\n\n"))
+        assert resumed[-1][0] == DONE
+    resumed = client.get(body["events_url"], headers={"Last-Event-ID": str(last_id)}).get_data(as_text=True)
+    assert resumed.count("event:") == 1
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/jobs/nope").status_code == 404
+    assert client.get("/api/jobs/nope/events").status_code == 404
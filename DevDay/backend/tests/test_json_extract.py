@@ -0,0 +1,74 @@
+import json
+
+from backend.services.json_extract import extract_json
+
+DAY1 = '{"day": 1, "places": [{"name": "해운대"}, {"name": "동백섬"}]}'
+
+
+def test_truncated_inside_string_cuts_at_last_place():
+    text = '{"itinerary": [{"day": 1, "places": [{"name": "해운대"}, {"name": "광안'
+    value, recovered = extract_json(text)
+    assert recovered
+    assert value == {"itinerary": [{"day": 1, "places": [{"name": "해운대"}]}]}
+
+
+def test_truncated_inside_place_drops_partial_place():
+    text = '{"itinerary": [{"day": 1, "places": [{"name": "해운대"}, {"name": "광안리", "address": '
+    value, recovered = extract_json(text)
+    assert recovered
+    assert value == {"itinerary": [{"day": 1, "places": [{"name": "해운대"}]}]}
+
+
+def test_truncated_after_day_keeps_completed_days():
+    text = '```json\n{"itinerary": [' + DAY1 + ', {"day": 2, "pla'
+    value, recovered = extract_json(text)
+    assert recovered
+    assert value == {"itinerary": [json.loads(DAY1)]}
+
+
+def test_truncated_right_after_array_opens():
+    value, recovered = extract_json('{"itinerary": [{"day": 1, "places": [')
+    assert recovered
+    assert value == {"itinerary": [{"day": 1, "places": []}]}
+
+
+def test_braces_and_escaped_quotes_inside_strings():
+    text = '응답: {"a": "x}]y{[", "b": "그가 \\"}\\" 라고", "c": [1]} 이후 설명 }'
+    value, recovered = extract_json(text)
+    assert not recovered
+    assert value == {"a": "x}]y{[", "b": '그가 "}" 라고', "c": [1]}
+
+
+def test_skips_bracketed_preamble():
+    value, recovered = extract_json('참고 [아래 참조]: {"a": 1}')
+    assert (value, recovered) == ({"a": 1}, False)
+
+
+def test_comments_and_trailing_commas_are_cleaned():
+    text = (
+        '```json\n'
+        '{"a": [1, 2,], // 메모\n'
+        ' "b": {"url": "http://x.kr/*y*/", },\n'
+        ' /* 끝 */}\n'
+        '```'
+    )
+    value, recovered = extract_json(text)
+    assert not recovered
+    assert value == {"a": [1, 2], "b": {"url": "http://x.kr/*y*/"}}
+
+
+def test_no_json_returns_none():
+    assert extract_json("JSON이 없습니다") == (None, False)
+    assert extract_json("") == (None, False)
+
+
+def test_cut_depth_tells_day_boundary_from_partial_day():
+    head = '{"summary": "s", "itinerary": [' + DAY1
+    # 2일차 머리에서 잘림 → 1일차 뒤(일차 경계)에서 절단
+    assert extract_json(head + ', {"day": 2, "ti')[1] == 2
+    # 마지막 "]}"만 빠짐 → 마지막 일차는 완성
+    value, depth = extract_json(head)
+    assert depth == 2 and value["itinerary"] == [json.loads(DAY1)]
+    # 장소 안에서 잘림 → 일차 안쪽에서 절단
+    assert extract_json('{"itinerary": [{"day": 1, "places": [{"name": "해운대"}, {"na')[1] == 4
+    assert extract_json('{"a": 1}')[1] == 0
@@ -0,0 +1,48 @@
+import json
+
+from backend.services.json_stream import ItineraryStreamParser
+
+DAYS = [
+    {"day": 1, "note": 'a"}b\\', "places": [{"name": "{해운대]"}]},
+    {"day": 2, "places": [{"name": "광안리", "itinerary": [1]}]},
+]
+TEXT = "```json\n" + json.dumps(
+    {"title": "itinerary", "itinerary": DAYS, "tips": [{"day": 9}]}, ensure_ascii=False
+) + "\n```"
+
+
+def test_each_day_is_emitted_when_it_closes():
+    parser = ItineraryStreamParser()
+    emitted = []
+    for i, c in enumerate(TEXT):
+        for day in parser.feed(c):
+            emitted.append((i, day))
+    assert [day for _, day in emitted] == DAYS
+    # 일차 객체의 닫는 괄호를 받은 그 순간에 나온다
+    for i, day in emitted:
+        assert TEXT[: i + 1].endswith(json.dumps(day, ensure_ascii=False))
+    assert parser.emitted == 2
+    assert parser.text == TEXT
+
+
+def test_chunk_boundary_splits_escape_sequence():
+    parser = ItineraryStreamParser()
+    assert parser.feed('{"itinerary": [{"day": 1, "n": "a\\') == []
+    assert parser.feed('"}"}, {"day": 2, "n": "\\\\') == [{"day": 1, "n": 'a"}'}]
+    assert parser.feed('"}]}') == [{"day": 2, "n": "\\"}]
+
+
+def test_any_chunking_gives_the_same_days():
+    for size in (1, 2, 3, 7, 64, len(TEXT)):
+        parser = ItineraryStreamParser()
+        days = []
+        for start in range(0, len(TEXT), size):
+            days.extend(parser.feed(TEXT[start:start + size]))
+        assert days == DAYS, size
+
+
+def test_truncated_stream_emits_only_completed_days():
+    cut = TEXT.index('{"day": 2')
+    parser = ItineraryStreamParser()
+    assert parser.feed(TEXT[: cut + 20]) == DAYS[:1]
+    assert parser.feed("") == []
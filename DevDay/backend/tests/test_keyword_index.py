@@ -0,0 +1,14 @@
+from backend.services.keyword_index import _FieldIndex
+
+
+def test_substring_with_repeated_bigram_checks_text():
+    index = _FieldIndex(["하하 호", "하하하"])
+    assert index.substring("하하하").tolist() == [1]
+    assert index.substring("하하").tolist() == [0, 1]
+
+
+def test_substring_requires_contiguous_bigrams():
+    index = _FieldIndex(["해운대 바다", "바다 해운", "해운대바다"])
+    assert index.substring("해운대").tolist() == [0, 2]
+    assert index.substring("대바다").tolist() == [2]
+    assert index.substring("해").tolist() == [0, 1, 2]
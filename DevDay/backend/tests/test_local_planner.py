@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from backend.data.popularity import name_key
+from backend.services.itinerary_repair import place_violations
+from backend.services.local_planner import LocalPlanner
+from backend.services.spatial_index import SpatialIndex
+
+TRIP = {"start": "2025-05-01", "end": "2025-05-03", "days": 3, "emotions": ["힐링"]}
+
+
+def _places(category, n, lat, lng, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"{category}{seed}-{i}" for i in range(n)],
+        "address": [f"부산 {category} {i}" for i in range(n)],
+        "latitude": lat + rng.uniform(-0.01, 0.01, n),
+        "longitude": lng + rng.uniform(-0.01, 0.01, n),
+        "category": category,
+        "keywords": "바다, 산책",
+        "gu": "해운대구",
+    })
+
+
+def _candidates():
+    # 서로 멀리 떨어진 세 동네, 동네마다 관광지 4 / 식당 2 / 카페 1
+    hoods = [(35.10, 129.03), (35.16, 129.16), (35.24, 129.22)]
+    frames = []
+    for seed, (lat, lng) in enumerate(hoods):
+        frames += [_places("관광지", 4, lat, lng, seed), _places("식당", 2, lat, lng, seed), _places("카페", 1, lat, lng, seed)]
+    df = pd.concat(frames, ignore_index=True)
+    df.loc[0, "address"] = ""  # 스키마를 통과하지 못하는 행
+    return df
+
+
+def test_plan_follows_prompt_rules():
+    candidates = _candidates()
+    catalog = pd.concat([candidates] + [_places("관광지", 6, 35.16, 129.16, 10 + s) for s in range(3)], ignore_index=True)
+    plan = LocalPlanner().plan(TRIP, candidates, catalog, SpatialIndex.build(catalog))
+
+    days = plan["itinerary"]
+    assert [d["date"] for d in days] == ["2025-05-01", "2025-05-02", "2025-05-03"]
+    keys = [name_key(p["name"]) for d in days for p in d["places"]]
+    assert len(keys) == len(set(keys))
+    assert candidates.loc[0, "name"] not in keys
+
+    for i, day in enumerate(days):
+        places = day["places"]
+        last = i == len(days) - 1
+        assert 5 <= len(places) <= 6
+        assert all(not place_violations(p) for p in places)
+        assert "09:00" <= places[0]["start_time"] <= "10:00"
+        assert [p["start_time"] for p in places] == sorted(p["start_time"] for p in places)
+        assert all(a["end_time"] <= b["start_time"] for a, b in zip(places, places[1:]))
+        meals = [p["start_time"] for p in places if p["category"] == "식당"]
+        assert any("12:00" <= t <= "13:00" for t in meals)
+        if last:
+            assert places[-1]["end_time"] <= "17:00"
+        else:
+            assert any("18:00" <= t <= "19:00" for t in meals)
+
+
+def test_plan_is_deterministic():
+    candidates = _candidates()
+    assert LocalPlanner().plan(TRIP, candidates) == LocalPlanner().plan(TRIP, candidates)
@@ -0,0 +1,39 @@
+from backend.services.model_registry import ModelRegistry
+
+PAIR = ("models/a", "0")
+
+
+def _registry(tmp_path):
+    return ModelRegistry(tmp_path / "models.sqlite3", cooldown=600, failure_threshold=2)
+
+
+def _blocked(registry):
+    # 전부 막히면 plan()은 전체를 돌려주므로 다른 페이로드를 하나 둔다
+    return PAIR not in registry.plan(["models/a"], ["0", "1"])
+
+
+def test_consecutive_400s_block_the_pair(tmp_path):
+    registry = _registry(tmp_path)
+    registry.record_failure(*PAIR, 400)
+    assert not _blocked(registry)
+    registry.record_failure(*PAIR, 400)
+    assert _blocked(registry)
+
+
+def test_other_status_resets_the_400_streak(tmp_path):
+    registry = _registry(tmp_path)
+    registry.record_failure(*PAIR, 500)
+    registry.record_failure(*PAIR, 400)
+    assert not _blocked(registry)
+
+    registry.record_failure(*PAIR, 503)
+    registry.record_failure(*PAIR, 400)
+    assert not _blocked(registry)
+    registry.record_failure(*PAIR, 400)
+    assert _blocked(registry)
+
+
+def test_404_blocks_every_payload_of_the_model(tmp_path):
+    registry = _registry(tmp_path)
+    registry.record_failure("models/a", "1", 404)
+    assert registry.plan(["models/a", "models/b"], ["0", "1"]) == [("models/b", "0"), ("models/b", "1")]
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from backend.services.place_catalog import PlaceCatalog
+
+
+def _catalog(tmp_path):
+    csv = tmp_path / "places.csv"
+    gem = tmp_path / "gem_scores.csv"
+    csv.write_text("name\n해운대\n", encoding="utf-8")
+
+    def build(path):
+        score = gem.read_text(encoding="utf-8") if gem.exists() else ""
+        return pd.DataFrame({"name": pd.read_csv(path)["name"], "gem": score})
+
+    return PlaceCatalog(csv, builder=build, reload_interval=1e-9, watch_paths=[gem]), csv, gem
+
+
+def test_gem_scores_change_triggers_reload(tmp_path):
+    catalog, _, gem = _catalog(tmp_path)
+    first = catalog.load()
+    assert first.df["gem"].iloc[0] == ""
+
+    gem.write_text("0.9", encoding="utf-8")
+    snap = catalog.snapshot()
+    assert snap.version == first.version + 1
+    assert snap.df["gem"].iloc[0] == "0.9"
+    assert snap.digest != first.digest
+
+
+def test_unchanged_content_does_not_rebuild(tmp_path):
+    catalog, csv, gem = _catalog(tmp_path)
+    gem.write_text("0.5", encoding="utf-8")
+    first = catalog.load()
+
+    gem.write_text("0.5", encoding="utf-8")  # 같은 내용으로 다시 씀 (mtime만 바뀜)
+    csv.write_text(csv.read_text(encoding="utf-8"), encoding="utf-8")
+    assert catalog.snapshot().version == first.version
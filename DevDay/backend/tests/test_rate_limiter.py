@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import rate_limiter
+from backend.services.rate_limiter import RateLimited, RateLimiter, parse_retry_after
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time/monotonic/sleep을 같은 가짜 시계로 (sleep은 시계만 앞으로)"""
+    state = SimpleNamespace(now=1_000_000.0)
+
+    def sleep(seconds):
+        state.now += seconds
+
+    fake = SimpleNamespace(time=lambda: state.now, monotonic=lambda: state.now, sleep=sleep)
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return state
+
+
+def test_request_bucket_refills_at_rpm_rate(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "rl.sqlite3", rpm=60)
+    for _ in range(60):
+        assert limiter.acquire() == 0.0
+    assert limiter._try_take(0) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert limiter._try_take(0) == pytest.approx(0.5)
+
+    waited = limiter.acquire()
+    assert 0.5 <= waited <= 0.55
+    assert limiter.throttled == 1
+
+
+def test_refill_is_capped_at_capacity(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "rl.sqlite3", rpm=6)
+    limiter.acquire()
+    clock.now += 3600
+    for _ in range(6):
+        assert limiter.acquire() == 0.0
+    assert limiter._try_take(0) == pytest.approx(10.0)
+
+
+def test_token_bucket_and_max_wait(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "rl.sqlite3", rpm=1000, tpm=600, max_wait=5)
+    assert limiter.acquire(tokens=600) == 0.0
+    with pytest.raises(RateLimited) as exc:
+        limiter.acquire(tokens=100)
+    assert exc.value.retry_after == pytest.approx(10.0)
+
+    clock.now += 10
+    assert limiter.acquire(tokens=100) == 0.0
+    # 용량보다 큰 요청은 용량으로 잘려 언젠가는 통과한다
+    clock.now += 60
+    assert limiter.acquire(tokens=10_000) == 0.0
+
+
+def test_bucket_is_shared_through_the_file(tmp_path, clock):
+    path = tmp_path / "rl.sqlite3"
+    first = RateLimiter(path, rpm=2)
+    second = RateLimiter(path, rpm=2)
+    first.acquire()
+    first.acquire()
+    assert second._try_take(0) == pytest.approx(30.0)
+
+
+def test_hold_blocks_until_server_hint(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "rl.sqlite3", rpm=60)
+    limiter.hold(30)
+    limiter.hold(5)
+    assert limiter._try_take(0) == pytest.approx(30.0)
+    assert 30 <= limiter.acquire(max_wait=60) <= 30.05
+
+
+def test_disabled_limiter_never_waits(tmp_path):
+    limiter = RateLimiter(tmp_path / "rl.sqlite3", rpm=0)
+    assert limiter.acquire(tokens=10**9) == 0.0
+    assert not (tmp_path / "rl.sqlite3").exists()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None, '{"retryDelay": "35s"}') == 35.0
+    assert parse_retry_after(None, "retry_delay {\n  seconds: 7\n}") == 7.0
+    assert parse_retry_after(None, "no hint") is None
@@ -1,19 +1,296 @@
+"""
+프로세스 내 캐시 라이브러리 (백엔드의 다른 캐시 계층이 공통으로 쓰는 기반)
+
+- 항목 수(maxsize) + 추정 메모리(max_bytes) 기준 LRU 축출
+- TTL: 읽을 때 만료 확인 + 백그라운드 정리 스레드가 주기적으로 만료 항목 제거
+- 중첩 dict/list/set 인자를 정규화해 해시하는 make_key (trip_data 같은 인자도 키로 사용 가능)
+- 같은 키의 동시 미스는 한 번만 계산 (single-flight), 나머지 호출은 결과를 기다린다
+- hit / miss / eviction / expiration / coalesced(대기로 합쳐진 미스) 카운터
+
+    @cache(ttl=300, maxsize=256)
+    def load(trip_data): ...
+
+    load.cache.stats()   # {'hits': .., 'misses': .., ...}
+    load.cache_clear()
+"""
+import hashlib
+import json
+import logging
+import pickle
+import sys
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Union
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _canonical(value: Any) -> Any:
+    """
+    make_key용 정규화: dict는 (키, 값) 쌍 정렬, set은 정렬, tuple/list는 리스트, 그 외 JSON 불가 값은 repr.
+    dict 키도 값과 같은 방식으로 정규화하므로 {1: ..}과 {"1": ..}은 다른 키가 된다.
+    """
+    if isinstance(value, dict):
+        pairs = [[_canonical(k), _canonical(v)] for k, v in value.items()]
+        return {"__dict__": sorted(pairs, key=lambda pair: _sort_key(pair[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted((_canonical(v) for v in value), key=_sort_key)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return {"__repr__": f"{type(value).__qualname__}:{value!r}"}
+
+
+def _sort_key(canonical: Any) -> str:
+    """정규화된 값의 정렬 기준 (타입이 섞여도 비교 가능하도록 JSON 문자열)"""
+    return json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+
+
+def make_key(*args, **kwargs) -> str:
+    """위치/키워드 인자 → 안정적인 sha256 키 (dict 키 순서, set 원소 순서와 무관)"""
+    payload = json.dumps(
+        {"args": _canonical(list(args)), "kwargs": _canonical(kwargs)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """값의 대략적인 메모리 크기 (pickle 길이, 불가하면 sys.getsizeof)"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class _Flight:
+    """진행 중인 계산 1건 (같은 키의 후속 호출이 기다린다)"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Union[BaseException, None] = None
+
+
+class _Reaper:
+    """등록된 캐시들의 만료 항목을 주기적으로 지우는 단일 데몬 스레드"""
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self.caches: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+        self.lock = threading.Lock()
+        self.thread: Union[threading.Thread, None] = None
+
+    def register(self, cache: "LRUCache") -> None:
+        with self.lock:
+            self.caches.add(cache)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="cache-reaper", daemon=True)
+                self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            for cache in list(self.caches):
+                try:
+                    cache.purge_expired()
+                except Exception as e:
+                    logger.warning(f"⚠️ 캐시 만료 정리 실패: {e}")
+
+
+_reaper = _Reaper()
 
-def cache(ttl: int = 300):
+
+class LRUCache:
+    """
+    스레드 안전 LRU + TTL 캐시.
+    maxsize    — 최대 항목 수 (None이면 제한 없음)
+    max_bytes  — 항목 크기 합 상한 (estimate_size 기준, None이면 제한 없음)
+    ttl        — 초 단위 수명 (None이면 만료 없음)
+    """
+
+    def __init__(
+        self,
+        maxsize: Union[int, None] = 1024,
+        max_bytes: Union[int, None] = None,
+        ttl: Union[float, None] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        name: str = "cache",
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.name = name
+
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key → (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+        if ttl is not None:
+            _reaper.register(self)
+
+    # --- 내부 ---
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+    def _lookup(self, key: Hashable, now: float) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= now:
+            self._remove(key)
+            self.expirations += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    # --- 공개 API ---
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Union[float, None] = _MISSING) -> None:
+        ttl = self.ttl if ttl is _MISSING else ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 저장하지 않는다
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+                return True
+            return False
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Union[float, None] = _MISSING) -> Any:
+        """캐시 조회, 없으면 compute() — 같은 키의 동시 미스는 한 스레드만 계산"""
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.set(key, flight.value, ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def purge_expired(self) -> int:
+        """만료 항목 일괄 제거 (백그라운드 스레드가 호출)"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._data.items() if exp is not None and exp <= now]
+            for k in expired:
+                self._remove(k)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key, time.monotonic()) is not _MISSING
+
+
+def cache(
+    ttl: Union[float, None] = 300,
+    maxsize: Union[int, None] = 1024,
+    max_bytes: Union[int, None] = None,
+    key: Callable[..., Hashable] = make_key,
+):
+    """함수 결과 캐시 데코레이터 (인자에 list/dict가 있어도 동작, 동시 미스는 1회 계산)"""
     def decorator(fn):
-        store = {}
+        store = LRUCache(maxsize=maxsize, max_bytes=max_bytes, ttl=ttl, name=fn.__qualname__)
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            key = (args, tuple(sorted(kwargs.items())))
-            now = time.time()
-            if key in store:
-                ts, val = store[key]
-                if now - ts < ttl:
-                    return val
-            val = fn(*args, **kwargs)
-            store[key] = (now, val)
-            return val
+            return store.get_or_compute(key(*args, **kwargs), lambda: fn(*args, **kwargs))
+
+        wrapper.cache = store
+        wrapper.cache_clear = store.clear
+        wrapper.cache_info = store.stats
         return wrapper
     return decorator
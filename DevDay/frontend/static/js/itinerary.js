@@ -1,5 +1,6 @@
 let map, markers = [], polyline = null;
 let itineraryData = null;
+let partialDays = [];
 
 /* =======================
    1. 초기 진입 & 데이터 검증
@@ -28,7 +29,8 @@ async function generateItinerary(tripData) {
   const content = document.getElementById('content');
 
   try {
-    const response = await fetch('/api/generate-itinerary', {
+    // 작업 등록은 바로 반환되고, 진행 상황/결과는 SSE(미지원 시 폴링)로 받는다
+    const response = await fetch('/api/jobs', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(tripData)
@@ -40,12 +42,13 @@ async function generateItinerary(tripData) {
       throw new Error(`일정 생성 실패: ${response.status} ${text}`);
     }
 
-    itineraryData = await response.json();
+    const job = await response.json();
+    itineraryData = await waitForJob(job);
 
     loading.style.display = 'none';
     content.style.display = 'grid';
 
-    initMap();
+    if (!map) initMap();
     renderTabs();
     renderSchedule('all');
     initButtons();
@@ -57,6 +60,62 @@ async function generateItinerary(tripData) {
   }
 }
 
+/* 작업 완료 대기: SSE 구독, 연결이 끊기면 폴링으로 전환 */
+function waitForJob(job) {
+  if (!window.EventSource) return pollJob(job.status_url);
+
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(job.events_url);
+
+    source.addEventListener('progress', e => showProgress(JSON.parse(e.data)));
+    source.addEventListener('day', e => showDay(JSON.parse(e.data).data));
+    source.addEventListener('done', e => {
+      source.close();
+      resolve(JSON.parse(e.data).result);
+    });
+    source.addEventListener('failed', e => {
+      source.close();
+      reject(new Error(JSON.parse(e.data).error || '일정 생성 실패'));
+    });
+    // 일시적 끊김은 브라우저가 Last-Event-ID로 자동 재연결, 완전히 닫히면 폴링
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        pollJob(job.status_url).then(resolve, reject);
+      }
+    };
+  });
+}
+
+async function pollJob(statusUrl) {
+  while (true) {
+    const response = await fetch(statusUrl);
+    if (!response.ok) {
+      const text = await response.text().catch(() => '');
+      throw new Error(`일정 생성 실패: ${response.status} ${text}`);
+    }
+    const job = await response.json();
+    if (job.events?.length) showProgress(job.events[job.events.length - 1]);
+    if (job.status === 'done') return job.result;
+    if (job.status === 'failed') throw new Error(job.error || '일정 생성 실패');
+    await new Promise(r => setTimeout(r, 1500));
+  }
+}
+
+/* 스트리밍으로 먼저 완성된 일차를 바로 보여준다 (최종 결과가 오면 전체로 교체) */
+function showDay({ day, plan }) {
+  partialDays[day - 1] = plan;
+  document.getElementById('loading').style.display = 'none';
+  document.getElementById('content').style.display = 'grid';
+  if (!map) initMap();
+  itineraryData = { itinerary: partialDays.filter(Boolean) };
+  renderSchedule('all');
+}
+
+function showProgress(event) {
+  const status = document.querySelector('#loading small');
+  if (status && event?.message) status.textContent = event.message;
+}
+
 /* =======================
    3. 지도 초기화
 ======================= */
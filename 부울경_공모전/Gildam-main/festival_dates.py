@@ -0,0 +1,170 @@
+"""
+축제 운영기간 자유 텍스트 → 날짜 구간 + 여행 일정과 겹치는 축제 선택
+(DevDay backend/data/festival_dates.py와 같은 파싱 규칙. 이 앱은 단독 배포되므로 자체 사본을 둔다)
+
+    '2025. 7. 5.(토) ~ 7. 13.(일)'          → 2025-07-05 ~ 2025-07-13
+    '2024년 5월~10월 중 예정'                → 2024-05-01 ~ 2024-10-31
+    '매년 12월~2월'                          → (매년) 12-01 ~ 02-29
+"""
+import calendar
+import datetime
+import re
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 매년 반복 구간을 놓는 기준 연도 (2/29 포함을 위해 윤년)
+ANNUAL_YEAR = 2000
+
+_DATE_RE = re.compile(
+    r"(?:(?P<y>(?:19|20)\d{2})\s*(?:년|\.|-|/)\s*)?"
+    r"(?P<m>\d{1,2})\s*(?:월|\.|-|/)\s*"
+    r"(?:(?P<d>\d{1,2})(?!\d)\s*(?:일|\.)?)?"
+)
+_RANGE_SEP_RE = re.compile(r"^[\s(),.\w]{0,8}?[~∼〜\-–]")
+_ANNUAL_RE = re.compile(r"매년")
+
+Period = Tuple[Union[datetime.date, None], Union[datetime.date, None], bool]
+_UNKNOWN: Period = (None, None, False)
+
+
+def _date_parts(text: str):
+    """(year|None, month, day|None, start, end) 목록 — 월/일 범위를 벗어난 숫자 조합은 버린다"""
+    parts = []
+    for m in _DATE_RE.finditer(text):
+        month = int(m.group("m"))
+        day = int(m.group("d")) if m.group("d") else None
+        if not 1 <= month <= 12 or (day is not None and not 1 <= day <= 31):
+            continue
+        year = int(m.group("y")) if m.group("y") else None
+        parts.append((year, month, day, m.start(), m.end()))
+    return parts
+
+
+def _make_date(year: int, month: int, day: Union[int, None], last: bool) -> datetime.date:
+    days_in_month = calendar.monthrange(year, month)[1]
+    if day is None:
+        day = days_in_month if last else 1
+    return datetime.date(year, month, min(day, days_in_month))
+
+
+def parse_period_text(text: str) -> Period:
+    """텍스트 한 칸 파싱 → (start, end, annual). 첫 날짜가 시작, 바로 뒤 '~'로 이어진 날짜가 종료"""
+    if not isinstance(text, str) or not text.strip():
+        return _UNKNOWN
+    annual = bool(_ANNUAL_RE.search(text))
+    parts = _date_parts(text)
+    if not parts:
+        return _UNKNOWN
+
+    y1, m1, d1, _, end1 = parts[0]
+    y2, m2, d2 = y1, m1, d1
+    if len(parts) > 1 and _RANGE_SEP_RE.match(text[end1:parts[1][3]]):
+        y2, m2, d2 = parts[1][0], parts[1][1], parts[1][2]
+
+    if y1 is None:
+        if not annual:
+            return _UNKNOWN
+        y1 = ANNUAL_YEAR
+    if y2 is None:
+        y2 = y1
+    start = _make_date(y1, m1, d1, last=False)
+    end = _make_date(y2, m2, d2, last=True)
+    if end < start:
+        end = _make_date(y2 + 1, m2, d2, last=True)
+    return start, end, annual
+
+
+def parse_period(texts: Iterable[str]) -> Period:
+    """
+    여러 칸(운영기간, 이용요일 및 시간 …)을 합쳐 하나의 구간으로.
+    연도가 명시된 구간을 우선 사용하고, 어느 칸에든 '매년'이 있으면 매년 반복으로 표시한다.
+    """
+    texts = [t for t in texts if isinstance(t, str) and t.strip()]
+    annual = any(_ANNUAL_RE.search(t) for t in texts)
+    fallback = _UNKNOWN
+    for t in texts:
+        start, end, _ = parse_period_text(t)
+        if start is None:
+            continue
+        if start.year != ANNUAL_YEAR:
+            return start, end, annual
+        if fallback[0] is None:
+            fallback = (start, end, True)
+    return fallback
+
+
+
+def _day(d) -> int:
+    return pd.Timestamp(d).date().toordinal()
+
+
+def _annual_day(d) -> int:
+    d = pd.Timestamp(d)
+    return datetime.date(ANNUAL_YEAR, d.month, d.day).toordinal()
+
+
+class _Intervals:
+    """시작일 정렬 배열 + 최장 구간 길이 → 겹침 질의는 searchsorted로 자른 구간만 확인"""
+
+    def __init__(self, spans):
+        spans = sorted(spans)
+        self.starts = np.array([s for s, _, _ in spans], dtype=np.int64)
+        self.ends = np.array([e for _, e, _ in spans], dtype=np.int64)
+        self.rows = np.array([r for _, _, r in spans], dtype=np.int64)
+        self.max_len = int((self.ends - self.starts).max()) if len(spans) else 0
+
+    def overlapping(self, lo: int, hi: int) -> np.ndarray:
+        a = np.searchsorted(self.starts, lo - self.max_len, side="left")
+        b = np.searchsorted(self.starts, hi, side="right")
+        return self.rows[a:b][self.ends[a:b] >= lo]
+
+
+class FestivalSeason:
+    """
+    축제 행(운영기간이 있는 행)의 기간 인덱스. 데이터 로드 시 1회 생성.
+    기간을 알 수 없는 축제는 어떤 일정에도 선택되지 않는다.
+    """
+
+    TEXT_COLUMNS = ["운영기간", "이용요일 및 시간"]
+    FESTIVAL_COLUMNS = ["운영기간", "이용요일 및 시간", "주요장소"]
+
+    def __init__(self, df: pd.DataFrame):
+        cols = [c for c in self.FESTIVAL_COLUMNS if c in df.columns]
+        self.is_festival = df[cols].notna().any(axis=1).to_numpy() if cols else np.zeros(len(df), bool)
+
+        texts = [c for c in self.TEXT_COLUMNS if c in df.columns]
+        year_first = datetime.date(ANNUAL_YEAR, 1, 1).toordinal()
+        year_last = datetime.date(ANNUAL_YEAR, 12, 31).toordinal()
+        fixed, annual = [], []
+        for r in np.flatnonzero(self.is_festival).tolist():
+            start, end, is_annual = parse_period([df[c].iloc[r] for c in texts])
+            if start is None:
+                continue
+            if not is_annual:
+                fixed.append((start.toordinal(), end.toordinal(), r))
+            elif (end - start).days >= 365:
+                annual.append((year_first, year_last, r))
+            elif _annual_day(end) >= _annual_day(start):
+                annual.append((_annual_day(start), _annual_day(end), r))
+            else:
+                annual += [(_annual_day(start), year_last, r), (year_first, _annual_day(end), r)]
+        self.fixed = _Intervals(fixed)
+        self.annual = _Intervals(annual)
+        self._year = (year_first, year_last)
+
+    def in_season_mask(self, start, end) -> np.ndarray:
+        """일정 [start, end]에 넣어도 되는 행 마스크 (축제가 아닌 행은 항상 True)"""
+        ok = ~self.is_festival
+        lo, hi = _day(start), _day(end)
+        ok[self.fixed.overlapping(lo, hi)] = True
+        a_lo, a_hi = _annual_day(start), _annual_day(end)
+        if hi - lo >= 365:
+            ok[self.annual.rows] = True
+        elif a_hi >= a_lo:
+            ok[self.annual.overlapping(a_lo, a_hi)] = True
+        else:
+            ok[self.annual.overlapping(a_lo, self._year[1])] = True
+            ok[self.annual.overlapping(self._year[0], a_hi)] = True
+        return ok
@@ -0,0 +1,142 @@
+"""
+모델 응답 텍스트 → 첫 JSON 값 (괄호 짝 맞추기 + 주석/trailing comma 정리 + 잘린 출력 복구)
+(DevDay backend/service/json_extract.py와 같은 규칙. 이 앱은 단독 배포되므로 자체 사본을 둔다)
+
+    '```json\n[{"place": "A"}]\n```'            → [{"place": "A"}]
+    '[{"place": "A"}, {"place": "B", "st'        → [{"place": "A"}]  (복구)
+"""
+import json
+from typing import Any, List, Tuple, Union
+
+_CLOSERS = {"{": "}", "[": "]"}
+# 앞쪽 설명문의 괄호를 값으로 잘못 잡았을 때 다음 여는 괄호에서 다시 시도하는 횟수
+MAX_STARTS = 3
+
+
+def _scan(text: str, start: int) -> Tuple[Union[int, None], Union[Tuple[int, str], None]]:
+    """
+    start의 여는 괄호부터 문자열/이스케이프를 고려해 괄호 짝을 맞춘다 (한 번 훑기).
+    반환: (값이 닫힌 위치 다음 인덱스 또는 None, 잘렸을 때 마지막 안전 절단점 (위치, 닫을 괄호들))
+    안전 절단점 = 배열이 막 열렸거나 컨테이너가 닫힌 직후 — 거기서 자르고 열린 괄호만 닫으면 유효한 JSON이 된다
+    (객체가 막 열린 직후는 빈 {} 원소가 남으므로 제외).
+    """
+    stack: List[str] = []
+    in_string = False
+    escape = False
+    cut: Union[Tuple[int, str], None] = None
+    i, n = start, len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "/" and text.startswith("//", i):
+            # 주석은 건너뜀 (문자열 밖에서만)
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        elif c == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        elif c in _CLOSERS:
+            stack.append(_CLOSERS[c])
+            if c == "[":
+                cut = (i + 1, "".join(reversed(stack)))
+        elif c == "}" or c == "]":
+            if not stack or stack[-1] != c:
+                return None, None  # 짝이 안 맞음 → 값이 아님
+            stack.pop()
+            if not stack:
+                return i + 1, None
+            cut = (i + 1, "".join(reversed(stack)))
+        i += 1
+    return None, cut
+
+
+def _clean(fragment: str) -> str:
+    """문자열 밖의 주석과 닫는 괄호 앞 쉼표(trailing comma) 제거"""
+    out: List[str] = []
+    in_string = False
+    escape = False
+    i, n = 0, len(fragment)
+    while i < n:
+        c = fragment[i]
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+            out.append(c)
+        elif fragment.startswith("//", i):
+            end = fragment.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        elif fragment.startswith("/*", i):
+            end = fragment.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        elif c == "}" or c == "]":
+            # 직전 공백을 건너뛰어 쉼표면 제거
+            j = len(out) - 1
+            while j >= 0 and out[j].isspace():
+                j -= 1
+            if j >= 0 and out[j] == ",":
+                del out[j]
+            out.append(c)
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _loads(fragment: str) -> Tuple[Any, bool]:
+    """(값, 성공 여부). 그대로 안 되면 주석/쉼표 정리 후 한 번 더"""
+    try:
+        return json.loads(fragment), True
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_clean(fragment)), True
+    except json.JSONDecodeError:
+        return None, False
+
+
+def extract_json(text: str, openers: str = "{[") -> Tuple[Any, bool]:
+    """
+    모델 응답 텍스트에서 첫 JSON 값(openers로 시작하는 객체/배열)을 꺼낸다 → (값, 복구 여부).
+    - 코드 블록 표시나 앞뒤 설명문은 무시 (괄호 짝 맞추기라 탐욕적 정규식처럼 뒤쪽 괄호까지 먹지 않음)
+    - 주석과 trailing comma는 정리
+    - 출력이 잘려 괄호가 안 닫혔으면 마지막 완성된 원소(일차/장소) 경계에서 자르고 괄호를 닫아 살린다 (복구 여부 True)
+    찾지 못하면 (None, False). 전체 길이에 선형.
+    """
+    if not text:
+        return None, False
+    pos = 0
+    for _ in range(MAX_STARTS):
+        starts = [p for p in (text.find(o, pos) for o in openers) if p >= 0]
+        if not starts:
+            break
+        start = min(starts)
+        end, cut = _scan(text, start)
+        if end is not None:
+            value, ok = _loads(text[start:end])
+            if ok:
+                return value, False
+        elif cut is not None:
+            value, ok = _loads(text[start:cut[0]] + cut[1])
+            if ok:
+                return value, True
+        pos = start + 1
+    return None, False
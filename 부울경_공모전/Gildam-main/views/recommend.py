@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-import json
-import re
 import folium
 from streamlit_folium import st_folium
 from gemini_api import ask_gemini
+from json_extract import extract_json
+from name_index import NameIndex
+from festival_dates import FestivalSeason
 from .common_style import set_logo, render_share_button
 
 set_logo()
@@ -77,6 +78,16 @@ if 'recommend_ready' not in st.session_state:
 def load_dataset():
     return pd.read_csv("data/부산_명소_축제_통합.csv", encoding='utf-8')
 
+@st.cache_resource
+def load_festival_season():
+    # 축제 운영기간은 앱 프로세스당 1회만 파싱
+    return FestivalSeason(load_dataset())
+
+@st.cache_resource
+def load_name_index():
+    # 장소명 정확/퍼지 인덱스도 앱 프로세스당 1회만 생성
+    return NameIndex(load_dataset()['콘텐츠명'].tolist())
+
 def build_prompt(emotion, purpose, schedule, theme, df):
     content_blocks = []
     for _, row in df.iterrows():
@@ -156,7 +167,9 @@ def render(go_to):
         schedule = st.session_state['schedule']
         theme = st.session_state['theme']
 
-        prompt = build_prompt(emotion, purpose, schedule, theme, df)
+        # 일정과 겹치지 않는 축제는 프롬프트에 넣지 않는다
+        in_season = load_festival_season().in_season_mask(schedule['start'], schedule['end'])
+        prompt = build_prompt(emotion, purpose, schedule, theme, df[in_season])
 
         with st.spinner("AI가 여행지를 추천중입니다..."):
             try:
@@ -170,19 +183,26 @@ def render(go_to):
 
     st.markdown("---")
     st.markdown("#### ✨ 추천 여행지 목록")
-    try:
-        raw = st.session_state['raw_response']
-        if raw.strip().startswith("```"):
-            raw = re.sub(r"^```(?:json)?", "", raw).strip()
-            raw = re.sub(r"```$", "", raw).strip()
-        response = json.loads(raw)
-    except json.JSONDecodeError:
+    # 코드 블록/설명문이 섞이거나 출력이 잘려도 완성된 항목까지는 살린다
+    response, _ = extract_json(st.session_state['raw_response'], openers="[")
+    if not isinstance(response, list):
         st.error("AI 응답을 파싱할 수 없습니다. 원문 응답을 확인합니다.")
         st.code(st.session_state['raw_response'], language='json')
         return
 
-    valid_places = df['콘텐츠명'].dropna().unique().tolist()
-    filtered_response = [item for item in response if item.get('place') in valid_places]
+    # 응답 장소명을 데이터셋 행에 붙인다 (정확 일치는 해시 조회, 오타·표기 차이는 퍼지 매칭).
+    # 붙지 않는 장소는 지어낸 것으로 보고 제외하고, 이름·주소·좌표는 데이터셋 값을 쓴다.
+    # 프롬프트에서 뺀 기간 외 축제를 모델이 다시 넣은 경우도 제외
+    schedule = st.session_state['schedule']
+    in_season = load_festival_season().in_season_mask(schedule['start'], schedule['end'])
+    name_index = load_name_index()
+    filtered_response = []
+    for item in response:
+        if not isinstance(item, dict):
+            continue
+        row, _ = name_index.match(item.get('place'))
+        if row is not None and in_season[row]:
+            filtered_response.append((item, df.iloc[row]))
 
     if not filtered_response:
         st.warning("추천 결과가 유효한 장소와 일치하지 않습니다.")
@@ -191,16 +211,15 @@ def render(go_to):
     col1, col2 = st.columns([1, 1])
     with col1:
         st.markdown(wide_card_style, unsafe_allow_html=True)
-        for item in filtered_response:
-            name = item.get("place", "장소명 없음")
-            match = df[df['콘텐츠명'] == name].iloc[0] if not df[df['콘텐츠명'] == name].empty else None
+        for item, match in filtered_response:
+            name = match['콘텐츠명']
             st.markdown(f"""
                 <div class="wide-card">
                     <h4>📍 {name}</h4>
                     <p><b>📖 {item.get('title', '제목 없음')}</b></p>
                     <p>{item.get('story', '스토리 없음')}</p>
                     <ul>
-                        <li><b>위치:</b> {match['주소'] if match is not None and '주소' in match else '정보 없음'}</li>
+                        <li><b>위치:</b> {match['주소'] if '주소' in match and pd.notna(match['주소']) else '정보 없음'}</li>
                         <li><b>방문 추천 시간:</b> {item.get('best_time', '정보 없음')}</li>
                         <li><b>추천 일차:</b> {item.get('day', 'N/A')}일차</li>
                     </ul>
@@ -212,19 +231,17 @@ def render(go_to):
         coords_by_day = {}
         day_colors = ['blue', 'green', 'purple', 'orange', 'red']
 
-        for item in filtered_response:
-            name = item.get("place")
+        for item, match in filtered_response:
+            name = match['콘텐츠명']
             day = int(item.get("day", 1))
-            row = df[df['콘텐츠명'] == name]
-            if not row.empty:
-                lat, lon = row.iloc[0]["위도"], row.iloc[0]["경도"]
-                if pd.notna(lat) and pd.notna(lon):
-                    folium.Marker(
-                        location=[lat, lon],
-                        popup=folium.Popup(f"<b>{name}</b><br>{item.get('reason', '')}", max_width=300),
-                        icon=folium.Icon(color=day_colors[(day - 1) % len(day_colors)])
-                    ).add_to(m)
-                    coords_by_day.setdefault(day, []).append((lat, lon))
+            lat, lon = match["위도"], match["경도"]
+            if pd.notna(lat) and pd.notna(lon):
+                folium.Marker(
+                    location=[lat, lon],
+                    popup=folium.Popup(f"<b>{name}</b><br>{item.get('reason', '')}", max_width=300),
+                    icon=folium.Icon(color=day_colors[(day - 1) % len(day_colors)])
+                ).add_to(m)
+                coords_by_day.setdefault(day, []).append((lat, lon))
 
         for day, coords in coords_by_day.items():
             if len(coords) >= 2: